@@ -0,0 +1,237 @@
+# backend/analytics.py
+"""
+Per-user aggregates behind the summary, forecast and insights endpoints.
+
+UserAnalytics holds a user's data as pandas frames, loaded with one query
+each and cached per (user_id, data_version), so every computation on it
+is a vectorized operation instead of a Python loop over SQL rows:
+
+    monthly       one row per (year_month, category) from the rollup table;
+                  totals, month-over-month deltas and rolling averages
+    transactions  raw (date, category, amount_minor), loaded only when
+                  per-transaction statistics such as percentiles are needed
+
+Both are in the user's default currency: the loading queries convert
+every amount through a join on fx_rates (see fx.py).
+
+pandas is imported lazily so app startup does not pay for it.
+"""
+from flask import current_app
+from sqlalchemy import Integer, cast, func, select
+
+from cache import LocalLRUCache, get_data_version
+from db import db
+from fx import converted_amount_sql, converted_totals, user_currency_sql
+from normalize import MINOR_UNITS
+from rollup import month_key
+
+DEFAULT_FRAME_CACHE_SIZE = 256
+DEFAULT_ROLLING_WINDOW = 3
+PERCENTILES = (0.5, 0.9, 0.99)
+
+
+def init_analytics(app) -> None:
+    # frames are process-local objects, so this is always an in-process LRU
+    # regardless of RESULT_CACHE_BACKEND
+    app.extensions["frame_cache"] = LocalLRUCache(
+        maxsize=int(app.config.get("ANALYTICS_FRAME_CACHE_SIZE", DEFAULT_FRAME_CACHE_SIZE)),
+        ttl=float(app.config.get("RESULT_CACHE_TTL", 300)),
+    )
+
+
+def monthly_select(user_id: int):
+    """(year_month, category, total_minor, count) rows of the monthly frame."""
+    rollup = converted_totals
+    return (
+        select(
+            rollup.c.year_month,
+            rollup.c.category,
+            cast(func.round(func.total(rollup.c.total)), Integer).label("total_minor"),
+            func.sum(rollup.c.count).label("count"),
+        )
+        .where(rollup.c.user_id == user_id)
+        .group_by(rollup.c.year_month, rollup.c.category)
+    )
+
+
+class UserAnalytics:
+    def __init__(self, user_id: int, monthly_rows=None):
+        """monthly_rows: monthly_select() rows the caller has already read."""
+        self.user_id = user_id
+        self._monthly = None
+        self._transactions = None
+        if monthly_rows is not None:
+            self._monthly = self._monthly_frame(monthly_rows)
+
+    # ---------- frames ----------
+    @staticmethod
+    def _monthly_frame(rows):
+        import pandas as pd
+
+        return pd.DataFrame(
+            rows, columns=["year_month", "category", "total_minor", "count"]
+        )
+
+    @property
+    def monthly(self):
+        if self._monthly is None:
+            rows = db.session.execute(monthly_select(self.user_id)).all()
+            self._monthly = self._monthly_frame(rows)
+        return self._monthly
+
+    @property
+    def transactions(self):
+        if self._transactions is None:
+            import pandas as pd
+
+            # straight off the DBAPI cursor: dates arrive as ISO strings and
+            # are parsed in one vectorized pass, with no per-row Row objects
+            amount = converted_amount_sql(
+                "t.amount_minor", "t.currency", "substr(t.date, 1, 7)", user_currency_sql("u")
+            )
+            cursor = db.session.connection().connection.cursor()
+            try:
+                cursor.execute(
+                    f"SELECT t.date, t.category, CAST(ROUND({amount}) AS INTEGER) "
+                    "FROM transactions t JOIN users u ON u.id = t.user_id "
+                    "WHERE t.user_id = ?",
+                    (self.user_id,),
+                )
+                frame = pd.DataFrame.from_records(
+                    cursor.fetchall(), columns=["date", "category", "amount_minor"]
+                )
+            finally:
+                cursor.close()
+            frame["date"] = pd.to_datetime(frame["date"], format="%Y-%m-%d")
+            frame["category"] = frame["category"].astype("category")
+            self._transactions = frame
+        return self._transactions
+
+    # ---------- aggregates ----------
+    def _monthly_between(self, start=None, end=None):
+        frame = self.monthly
+        if start is not None:
+            frame = frame[frame["year_month"] >= start]
+        if end is not None:
+            frame = frame[frame["year_month"] <= end]
+        return frame
+
+    def category_totals(self, start=None, end=None) -> dict:
+        """{category: total_amount} for months start..end inclusive."""
+        frame = self._monthly_between(start, end)
+        totals = frame.groupby("category", sort=True)["total_minor"].sum()
+        return {
+            category: int(total) / MINOR_UNITS for category, total in totals.items()
+        }
+
+    def month_matrix(self, start=None, end=None):
+        """
+        Months x categories matrix of net totals (major units), with every
+        calendar month in the range present (missing months are 0).
+        """
+        import pandas as pd
+
+        frame = self._monthly_between(start, end)
+        matrix = frame.set_index(["year_month", "category"])["total_minor"].unstack(
+            fill_value=0
+        )
+        if matrix.empty:
+            return matrix
+
+        months = pd.period_range(matrix.index.min(), matrix.index.max(), freq="M")
+        matrix = matrix.reindex(months.strftime("%Y-%m"), fill_value=0)
+        return matrix / MINOR_UNITS
+
+    def trends(self, start=None, end=None, window: int = DEFAULT_ROLLING_WINDOW):
+        """
+        Per (month, category): total, month-over-month delta and percent
+        change, and a trailing rolling average over `window` months.
+        """
+        import numpy as np
+
+        matrix = self.month_matrix(start, end)
+        if matrix.empty:
+            return []
+
+        delta = matrix.diff()
+        previous = matrix.shift(1).abs().replace(0, np.nan)
+        pct = delta / previous * 100
+        rolling = matrix.rolling(window, min_periods=1).mean()
+
+        stacked = (
+            matrix.stack()
+            .rename("total")
+            .to_frame()
+            .join(delta.stack().rename("mom_delta"))
+            .join(pct.stack().rename("mom_pct"))
+            .join(rolling.stack().rename("rolling_avg"))
+            .round(2)
+            .reset_index()
+        )
+        stacked.columns = [
+            "year_month", "category", "total", "mom_delta", "mom_pct", "rolling_avg",
+        ]
+        stacked = stacked.astype(object).where(stacked.notna(), None)
+        return stacked.to_dict(orient="records")
+
+    def percentiles(self, start=None, end=None, quantiles=PERCENTILES) -> dict:
+        """
+        Spend size percentiles per category (absolute amount of individual
+        expense transactions), e.g. {"Food & Dining": {"p50": ..., "p90": ...}}.
+        """
+        import pandas as pd
+
+        frame = self.transactions
+        if start is not None:
+            frame = frame[frame["date"] >= pd.Timestamp(f"{start}-01")]
+        if end is not None:
+            after_end = pd.Timestamp(f"{end}-01") + pd.offsets.MonthBegin(1)
+            frame = frame[frame["date"] < after_end]
+
+        expenses = frame[frame["amount_minor"] < 0]
+        if expenses.empty:
+            return {}
+
+        spend = expenses["amount_minor"].abs() / MINOR_UNITS
+        table = (
+            spend.groupby(expenses["category"], observed=True)
+            .quantile(list(quantiles))
+            .unstack()
+            .round(2)
+        )
+        table.columns = [f"p{int(q * 100)}" for q in table.columns]
+        return {
+            category: {k: float(v) for k, v in row.items()}
+            for category, row in table.iterrows()
+        }
+
+
+def get_user_analytics(user_id: int, version=None, monthly_rows=None) -> UserAnalytics:
+    """
+    UserAnalytics for the user's current data_version (cached). A new
+    entry takes its monthly frame from monthly_rows if given.
+    """
+    if version is None:
+        version = get_data_version(user_id)
+
+    cache = current_app.extensions["frame_cache"]
+    key = (user_id, version)
+    analytics = cache.get(key)
+    if analytics is None:
+        analytics = UserAnalytics(user_id, monthly_rows)
+        cache.set(key, analytics)
+    return analytics
+
+
+# -------------------------------------------------
+# Summary
+# -------------------------------------------------
+
+def get_category_totals_dict(user_id: int, month=None, year=None):
+    """
+    Returns a dict: {category: total_amount} for the given user.
+    Optional month/year filtering.
+    Negative = net expense, positive = net income.
+    """
+    key = month_key(month, year)
+    return get_user_analytics(user_id).category_totals(key, key)
@@ -1,29 +1,126 @@
-from flask import Flask, jsonify, request
+from flask import (
+    Blueprint,
+    Flask,
+    Response,
+    current_app,
+    jsonify,
+    request,
+    stream_with_context,
+)
 from flask_cors import CORS
-from sqlalchemy import func
-from dotenv import load_dotenv
 
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+import click
 import csv
+import hashlib
 import os
-import io
 import jwt
+import time
+
+import export
+import forecasting
+import passwords
+from db import db, engine_options, install_sqlite_pragmas
+from models import User, Transaction, Goal, ImportJob, UnparsedTransaction
+from analytics import (
+    get_category_totals_dict,
+    get_user_analytics,
+    init_analytics,
+)
+from budgets import delete_alerts, evaluate_alerts, goal_progress, month_alerts
+from cache import (
+    LocalLRUCache,
+    bump_data_version,
+    cached_result,
+    get_cache,
+    get_data_version,
+    init_cache,
+)
+from categorizer import categorize_transaction
+from chat import answer_question
+from config import BASE_DIR, load_config
+from dashboard import DashboardAggregates
+from fx import get_fx_rates, init_fx, load_rates, normalize_user_currencies
+from http_cache import compress_response, conditional
+from imports import get_import_runner, init_imports
+from ingest import ingest_csv
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from metrics import count_rows, init_metrics, metrics_enabled, render_metrics, timed
+from migrations import run_migrations
+from pagination import (
+    MAX_PAGE_SIZE,
+    InvalidCursor,
+    apply_keyset,
+    fetch_page,
+    parse_limit,
+)
+from passwords import PasswordHasherBusy
+from rollup import delete_user_rollups, month_key, rebuild_rollups
+from search import SORTS as SEARCH_SORTS, search_select, to_match
+from serialization import FastJSONProvider, encode
+
+CSV_PATH = os.path.join(BASE_DIR, "data", "sample_transactions.csv")
+
+bp = Blueprint("main", __name__, cli_group=None)
 
-from db import db
-from models import User, Transaction, Goal
 
 # -------------------------------------------------
-# Basic setup
+# Application factory
 # -------------------------------------------------
 
-load_dotenv()
+def create_app(config=None):
+    """
+    Builds the Flask app. Importing this module and calling create_app()
+    has no side effects on the database: schema setup and demo data are
+    the explicit `init-db` and `seed-demo` CLI commands.
+
+    `config` is an optional mapping applied over the environment settings.
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    app.config.update(load_config())
+    if config:
+        app.config.update(config)
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", engine_options(app.config))
+
+    CORS(
+        app,
+        resources={r"/*": {"origins": "*"}},
+        supports_credentials=False,  # we are using Authorization header, not cookies
+    )
+
+    db.init_app(app)
+    with app.app_context():
+        install_sqlite_pragmas(db.engine, app.config)  # no connection opened yet
+    init_cache(app)
+    init_analytics(app)
+    init_imports(app)
+    init_metrics(app)
+    init_fx(app)
+
+    app.extensions["token_cache"] = LocalLRUCache(
+        maxsize=int(app.config["TOKEN_CACHE_SIZE"]),
+        ttl=int(app.config["TOKEN_EXP_HOURS"]) * 3600,
+    )
+
+    passwords.configure(
+        app.config["PASSWORD_HASH_METHOD"],
+        int(app.config["PASSWORD_HASH_WORKERS"]),
+        int(app.config["PASSWORD_HASH_QUEUE"]),
+    )
+
+    app.register_blueprint(bp)
+    return app
 
-app = Flask(__name__)
 
-@app.before_request
+@bp.before_app_request
 def handle_options():
     if request.method == "OPTIONS":
-        response = app.make_default_options_response()
+        response = current_app.make_default_options_response()
         headers = response.headers
 
         headers["Access-Control-Allow-Origin"] = request.headers.get("Origin", "*")
@@ -34,56 +131,15 @@ def handle_options():
         return response
 
 
-from flask_cors import CORS
-
+@bp.after_app_request
+def compress(response):
+    return compress_response(response)
 
-CORS(
-    app,
-    resources={r"/*": {"origins": "*"}},
-    supports_credentials=False,  # we are using Authorization header, not cookies
-)
 
-
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-CSV_PATH = os.path.join(BASE_DIR, "data", "sample_transactions.csv")
-
-app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///" + os.path.join(
-    BASE_DIR, "finance.db"
-)
-app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-
-db.init_app(app)
-
-
-# -------------------------------------------------
-# Rule-based categorization
-# -------------------------------------------------
-
-def categorize_transaction(description: str, amount: float) -> str:
-    text = (description or "").lower()
-
-    if "salary" in text or "credit" in text:
-        return "Income"
-
-    if "zomato" in text or "swiggy" in text or "restaurant" in text:
-        return "Food & Dining"
-
-    if "uber" in text or "ola" in text or "cab" in text:
-        return "Transport"
-
-    if "amazon" in text or "flipkart" in text or "myntra" in text:
-        return "Shopping"
-
-    if "rent" in text or "maintenance" in text:
-        return "Housing"
-
-    if "electricity" in text or "water bill" in text or "internet" in text:
-        return "Utilities"
-
-    if amount > 0:
-        return "Income"
-
-    return "Other"
+@bp.before_app_request
+def resume_import_jobs():
+    # picks up imports orphaned by a previous process; no-op after the first request
+    get_import_runner().resume_once()
 
 
 # -------------------------------------------------
@@ -113,54 +169,180 @@ def ensure_demo_user():
     # Optional: preload sample CSV if it exists
     if os.path.exists(CSV_PATH):
         with open(CSV_PATH, newline="", encoding="utf-8") as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                try:
-                    amount = float(row["amount"])
-                except (KeyError, ValueError):
-                    continue
-
-                description = row.get("description", "")
-                category = categorize_transaction(description, amount)
-
-                tx = Transaction(
-                    date=row.get("date", ""),
-                    description=description,
-                    amount=amount,
-                    category=category,
-                    user_id=demo_user.id,
-                )
-                db.session.add(tx)
+            ingest_csv(csvfile, demo_user.id)
         db.session.commit()
 
     return demo_user
 
 
-with app.app_context():
+def init_db():
+    """Creates missing tables, then applies pending migrations."""
     db.create_all()
-    ensure_demo_user()
+    return run_migrations(db.engine)
+
+
+@bp.cli.command("init-db")
+def init_db_command():
+    """Create the schema and apply pending migrations."""
+    applied = init_db()
+    for version, description in applied:
+        print(f"Applied migration {version}: {description}")
+    print("Database initialised.")
+
+
+@bp.cli.command("seed-demo")
+def seed_demo_command():
+    """Create demo@example.com / demo123 with the sample transactions."""
+    user = ensure_demo_user()
+    print(f"Demo user ready (id={user.id}).")
+
+
+@bp.cli.command("migrate")
+def migrate_command():
+    """Apply pending schema migrations to the database."""
+    applied = run_migrations(db.engine)
+    if not applied:
+        print("Database is up to date.")
+    for version, description in applied:
+        print(f"Applied migration {version}: {description}")
+
+
+@bp.cli.command("unparsed-report")
+def unparsed_report_command():
+    """Print legacy rows that could not be normalized, as CSV."""
+    import sys
+
+    rows = UnparsedTransaction.query.order_by(UnparsedTransaction.id).all()
+    writer = csv.writer(sys.stdout)
+    writer.writerow(
+        ["original_id", "user_id", "raw_date", "raw_amount", "description", "reason"]
+    )
+    for row in rows:
+        writer.writerow(
+            [
+                row.original_id,
+                row.user_id,
+                row.raw_date,
+                row.raw_amount,
+                row.description,
+                row.reason,
+            ]
+        )
+    print(f"{len(rows)} unparsed row(s).", file=sys.stderr)
+
+
+@bp.cli.command("rebuild-rollups")
+@click.option("--user-id", type=int, default=None, help="Only rebuild this user.")
+def rebuild_rollups_command(user_id):
+    """Recompute monthly_category_totals from raw transactions."""
+    rebuild_rollups(db.session, user_id)
+    db.session.commit()
+    print("Rollups rebuilt.")
+
+
+@bp.cli.command("load-fx-rates")
+@click.option("--path", default=None, help="Rates CSV (default: FX_RATES_PATH).")
+def load_fx_rates_command(path):
+    """
+    Replace fx_rates with a date,currency,rate CSV. Users whose default
+    currency the file drops fall back to INR.
+    """
+    path = path or current_app.config["FX_RATES_PATH"]
+    try:
+        currencies = load_rates(db.session, path)
+    except (OSError, ValueError) as e:
+        raise click.ClickException(str(e))
+    normalize_user_currencies(db.session, currencies)
+    # converted totals moved; record any threshold they now cross
+    evaluate_alerts(db.session)
+    db.session.commit()
+    print(f"Loaded rates for {', '.join(sorted(currencies))}.")
+
+
+@bp.cli.command("resume-imports")
+def resume_imports_command():
+    """Finish imports left queued or orphaned, in this process."""
+    runner = get_import_runner()
+    job_ids = runner.orphaned_job_ids()
+    for job_id in job_ids:
+        runner.run(job_id)
+    print(f"Resumed {len(job_ids)} import(s).")
+
+
+@bp.cli.command("compute-forecasts")
+@click.option("--user-id", type=int, default=None, help="Only this user.")
+@click.option("--force", is_flag=True, help="Recompute even if up to date.")
+def compute_forecasts_command(user_id, force):
+    """Store next-month forecasts for every user with stale or no entry."""
+    computed = forecasting.compute_all_forecasts(user_id, force)
+    print(f"Forecasts computed for {computed} user(s).")
 
 
 # -------------------------------------------------
 # JWT config + auth helper
 # -------------------------------------------------
 
-JWT_SECRET = os.environ.get("JWT_SECRET", "dev_secret_change_me")
 JWT_ALGORITHM = "HS256"
-TOKEN_EXP_HOURS = 12
 
 
 def generate_token(user_id: int) -> str:
+    config = current_app.config
     payload = {
         "user_id": user_id,
-        "exp": datetime.utcnow() + timedelta(hours=TOKEN_EXP_HOURS),
+        "exp": datetime.utcnow() + timedelta(hours=config["TOKEN_EXP_HOURS"]),
     }
-    token = jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+    token = jwt.encode(payload, config["JWT_SECRET"], algorithm=JWT_ALGORITHM)
     if isinstance(token, bytes):
         token = token.decode("utf-8")
     return token
 
 
+# Already-verified tokens: sha256(token) -> (user_id, exp). Saves the HMAC
+# check and claim parsing on every request of a dashboard fan-out.
+def get_token_cache() -> LocalLRUCache:
+    return current_app.extensions["token_cache"]
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def revoke_token(token: str) -> None:
+    """Drops one token from the verified cache (e.g. on logout)."""
+    get_token_cache().delete(_token_key(token))
+
+
+def clear_token_cache() -> None:
+    """Drops every cached token (e.g. after rotating JWT_SECRET)."""
+    get_token_cache().clear()
+
+
+def verify_token(token: str) -> int:
+    """
+    Returns the token's user_id. Raises jwt.ExpiredSignatureError or
+    jwt.InvalidTokenError exactly like jwt.decode.
+    """
+    token_cache = get_token_cache()
+    key = _token_key(token)
+    cached = token_cache.get(key)
+    if cached is not None:
+        user_id, exp = cached
+        if exp is None or exp > time.time():
+            return user_id
+        token_cache.delete(key)
+
+    payload = jwt.decode(
+        token, current_app.config["JWT_SECRET"], algorithms=[JWT_ALGORITHM]
+    )
+    user_id = payload["user_id"]
+    exp = payload.get("exp")
+
+    # never outlive the token itself
+    ttl = None if exp is None else max(0.0, exp - time.time())
+    token_cache.set(key, (user_id, exp), ttl=ttl)
+    return user_id
+
+
 def require_auth(f):
     from functools import wraps
 
@@ -177,13 +359,14 @@ def require_auth(f):
 
         token = auth_header.split(" ", 1)[1]
         try:
-            payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+            with timed("auth"):
+                user_id = verify_token(token)
         except jwt.ExpiredSignatureError:
             return jsonify({"error": "Token expired"}), 401
         except jwt.InvalidTokenError:
             return jsonify({"error": "Invalid token"}), 401
 
-        request.user_id = payload["user_id"]
+        request.user_id = user_id
         return f(*args, **kwargs)
 
     return wrapper
@@ -193,16 +376,36 @@ def require_auth(f):
 # Health check
 # -------------------------------------------------
 
-@app.route("/health", methods=["GET"])
+@bp.route("/health", methods=["GET"])
 def health():
-    return jsonify({"status": "ok"})
+    return jsonify({"status": "ok", "cache": get_cache().stats()})
+
+
+@bp.route("/metrics", methods=["GET"])
+def prometheus_metrics():
+    if not metrics_enabled():
+        return jsonify({"error": "Metrics are disabled"}), 404
+
+    token = current_app.config.get("METRICS_TOKEN")
+    if token and request.headers.get("Authorization", "") != f"Bearer {token}":
+        return jsonify({"error": "Missing or invalid Authorization header"}), 401
+
+    return Response(render_metrics(), content_type=METRICS_CONTENT_TYPE)
 
 
 # -------------------------------------------------
 # Auth routes
 # -------------------------------------------------
 
-@app.route("/api/auth/signup", methods=["POST"])
+@bp.app_errorhandler(PasswordHasherBusy)
+def password_hasher_busy(_error):
+    response = jsonify({"error": "Too many login attempts in progress, retry shortly"})
+    response.status_code = 503
+    response.headers["Retry-After"] = "1"
+    return response
+
+
+@bp.route("/api/auth/signup", methods=["POST"])
 def signup():
     data = request.get_json() or {}
     email = (data.get("email") or "").strip().lower()
@@ -225,7 +428,7 @@ def signup():
     return jsonify({"message": "Signup successful", "token": token}), 201
 
 
-@app.route("/api/auth/login", methods=["POST"])
+@bp.route("/api/auth/login", methods=["POST"])
 def login():
     data = request.get_json() or {}
     email = (data.get("email") or "").strip().lower()
@@ -238,6 +441,14 @@ def login():
     if not user or not user.check_password(password):
         return jsonify({"error": "Invalid email or password"}), 401
 
+    # Transparently upgrade hashes made with outdated parameters.
+    if user.password_needs_rehash():
+        try:
+            user.set_password(password)
+            db.session.commit()
+        except PasswordHasherBusy:
+            db.session.rollback()
+
     token = generate_token(user.id)
     return jsonify({"message": "Login successful", "token": token}), 200
 
@@ -246,7 +457,7 @@ def login():
 # Profile routes (GET / PUT / OPTIONS)
 # -------------------------------------------------
 
-@app.route("/api/profile", methods=["GET", "PUT", "OPTIONS"])
+@bp.route("/api/profile", methods=["GET", "PUT", "OPTIONS"])
 @require_auth
 def profile():
     # OPTIONS is handled already in require_auth; this is just a safeguard.
@@ -275,12 +486,18 @@ def profile():
         return jsonify({"error": "Name is too long"}), 400
     if len(phone) > 50:
         return jsonify({"error": "Phone is too long"}), 400
-    if len(default_currency) > 10:
-        return jsonify({"error": "Currency code is too long"}), 400
+    if default_currency not in get_fx_rates(db.session).currencies:
+        return jsonify({"error": "Unsupported currency"}), 400
 
     user.full_name = full_name or None
     user.phone = phone or None
-    user.default_currency = default_currency
+    if default_currency != user.default_currency:
+        # every converted total changes, and with them the crossed thresholds
+        user.default_currency = default_currency
+        db.session.flush()
+        delete_alerts(db.session, user_id)
+        evaluate_alerts(db.session, user_id)
+        bump_data_version(user_id)
 
     db.session.commit()
 
@@ -318,13 +535,13 @@ def load_transactions_from_csv():
     return transactions
 
 
-@app.route("/csv-transactions", methods=["GET"])
+@bp.route("/csv-transactions", methods=["GET"])
 def get_csv_transactions():
     transactions = load_transactions_from_csv()
     return jsonify({"transactions": transactions})
 
 
-@app.route("/upload", methods=["GET"])
+@bp.route("/upload", methods=["GET"])
 def upload_form():
     return """
     <!DOCTYPE html>
@@ -345,7 +562,7 @@ def upload_form():
 # CSV upload → save to DB for THIS user
 # -------------------------------------------------
 
-@app.route("/upload-csv", methods=["POST"])
+@bp.route("/upload-csv", methods=["POST"])
 @require_auth
 def upload_csv():
     user_id = request.user_id
@@ -358,51 +575,37 @@ def upload_csv():
     if file.filename == "":
         return jsonify({"error": "No file selected"}), 400
 
-    try:
-        text_stream = io.StringIO(file.stream.read().decode("utf-8"))
-    except UnicodeDecodeError:
-        return jsonify({"error": "Could not decode file as UTF-8"}), 400
-
-    reader = csv.DictReader(text_stream)
-    saved_transactions = []
+    runner = get_import_runner()
+    job = runner.create_job(user_id, file)
+    runner.submit(job.id)
 
-    for row in reader:
-        date = row.get("date", "") or ""
-        description = row.get("description", "") or ""
-        try:
-            amount = float(row.get("amount", 0) or 0)
-        except ValueError:
-            continue
+    # inline imports (IMPORT_WORKERS=0) are already finished here
+    db.session.refresh(job)
+    if job.status == "failed":
+        return jsonify({"error": job.error, **job.to_dict()}), 400
+    if job.status == "done":
+        return jsonify({"saved": True, **job.to_dict()})
 
-        category = categorize_transaction(description, amount)
+    response = jsonify({"saved": False, **job.to_dict()})
+    response.status_code = 202
+    response.headers["Location"] = f"/api/imports/{job.id}"
+    return response
 
-        tx = Transaction(
-            date=date,
-            description=description,
-            amount=amount,
-            category=category,
-            user_id=user_id,
-        )
 
-        db.session.add(tx)
-        saved_transactions.append(
-            {
-                "date": date,
-                "description": description,
-                "amount": amount,
-                "category": category,
-            }
-        )
+@bp.route("/api/imports/<int:job_id>", methods=["GET"])
+@require_auth
+def get_import_job(job_id):
+    job = ImportJob.query.filter_by(id=job_id, user_id=request.user_id).first()
+    if job is None:
+        return jsonify({"error": "Import not found"}), 404
 
-    db.session.commit()
+    runner = get_import_runner()
+    if runner.is_stale(job):
+        # its worker died or hit a database error: resume from the last
+        # committed batch (inline when IMPORT_WORKERS is 0)
+        runner.submit(job.id)
 
-    return jsonify(
-        {
-            "saved": True,
-            "count": len(saved_transactions),
-            "transactions": saved_transactions,
-        }
-    )
+    return jsonify(job.to_dict())
 
 
 # -------------------------------------------------
@@ -411,7 +614,7 @@ def upload_csv():
 
 def apply_month_year_filter(query, month, year):
     """
-    Given a SQLAlchemy query on Transaction, optionally filter by month/year.
+    Given a query or select on Transaction, optionally filter by month/year.
     month, year are strings like "11", "2025" or None.
     """
     if not (month and year):
@@ -423,7 +626,10 @@ def apply_month_year_filter(query, month, year):
     except ValueError:
         return query
 
-    start = f"{year_i:04d}-{month_i:02d}-01"
+    if not 1 <= month_i <= 12:
+        return query
+
+    start = date(year_i, month_i, 1)
 
     end_month = month_i + 1
     end_year = year_i
@@ -431,221 +637,413 @@ def apply_month_year_filter(query, month, year):
         end_month = 1
         end_year += 1
 
-    end = f"{end_year:04d}-{end_month:02d}-01"
+    end = date(end_year, end_month, 1)
 
     return query.filter(Transaction.date >= start, Transaction.date < end)
 
 
-def get_category_totals_dict(user_id: int, month=None, year=None):
+# -------------------------------------------------
+# API: transactions, summary, forecast (per user)
+# -------------------------------------------------
+
+# Rows fetched per round trip when streaming transactions.
+STREAM_BATCH_SIZE = 500
+
+
+@bp.route("/api/transactions", methods=["GET"])
+@require_auth
+@conditional()
+def get_transactions_from_db():
     """
-    Returns a dict: {category: total_amount} for the given user.
-    Optional month/year filtering.
-    Negative = net expense, positive = net income.
+    Without paging params, returns the full list (ordered by date, id).
+    ?limit=N[&cursor=...] -> one keyset page plus `next_cursor`.
+    ?format=ndjson        -> streams every row, one JSON object per line.
     """
-    q = db.session.query(
-        Transaction.category,
-        func.sum(Transaction.amount).label("total_amount"),
-    ).filter(Transaction.user_id == user_id)
+    user_id = request.user_id
+    month = request.args.get("month")
+    year = request.args.get("year")
 
+    q = Transaction.api_select().where(Transaction.user_id == user_id)
     q = apply_month_year_filter(q, month, year)
 
-    rows = q.group_by(Transaction.category).all()
+    if request.args.get("format") == "ndjson":
+        return stream_transactions_ndjson(q)
 
-    totals = {}
-    for row in rows:
-        totals[row.category] = float(row.total_amount)
-    return totals
+    if "limit" in request.args or "cursor" in request.args:
+        try:
+            limit = parse_limit(request.args.get("limit"))
+        except ValueError:
+            return jsonify({"error": f"limit must be between 1 and {MAX_PAGE_SIZE}"}), 400
+
+        try:
+            page = transactions_page(q, request.args.get("cursor"), limit)
+        except InvalidCursor:
+            return jsonify({"error": "Invalid cursor"}), 400
+
+        return jsonify(page)
 
+    rows = db.session.execute(apply_keyset(q, None)).all()
+    count_rows(len(rows))
+    return jsonify({"transactions": [Transaction.row_to_dict(r) for r in rows]})
 
-def compute_forecast(user_id: int, month=None, year=None):
+
+def transactions_page(query, cursor, limit: int) -> dict:
+    """One keyset page of a Transaction.api_select() query."""
+    rows, next_cursor = fetch_page(query, cursor, limit)
+    count_rows(len(rows))
+    return {
+        "transactions": [Transaction.row_to_dict(r) for r in rows],
+        "next_cursor": next_cursor,
+    }
+
+
+def stream_transactions_ndjson(query):
     """
-    Very simple forecast for a single user, optionally filtered by month/year.
+    Streams rows in batches from the DB cursor, so the first bytes leave
+    immediately and memory stays flat however long the history is.
     """
-    q = db.session.query(
-        Transaction.category,
-        func.sum(Transaction.amount).label("total_amount"),
-    ).filter(Transaction.user_id == user_id)
 
-    q = apply_month_year_filter(q, month, year)
+    stmt = apply_keyset(query, None).execution_options(yield_per=STREAM_BATCH_SIZE)
 
-    rows = q.group_by(Transaction.category).all()
+    def generate():
+        for batch in db.session.execute(stmt).partitions():
+            count_rows(len(batch))
+            rows = [Transaction.row_to_dict(r) for r in batch]
+            with timed("json"):
+                chunk = b"".join([encode(row) + b"\n" for row in rows])
+            yield chunk
 
-    income_total = 0.0
-    expense_total = 0.0
-    category_forecast = []
+    return Response(
+        stream_with_context(generate()), mimetype="application/x-ndjson"
+    )
 
-    for row in rows:
-        total = float(row.total_amount)
 
-        if total >= 0:
-            income_total += total
-        else:
-            current_spend = abs(total)
-            forecast_spend = current_spend * 1.05
-            expense_total += current_spend
+@bp.route("/api/transactions/search", methods=["GET"])
+@require_auth
+@conditional()
+def search_transactions():
+    """
+    Full-text search over descriptions, newest match first.
+    ?q=       words, all required; "zom*" matches a prefix
+    ?sort=rank  best match first (bm25) instead
+    ?month=&year=, ?category=, ?limit= narrow the results.
+    """
+    user_id = request.user_id
+    query = request.args.get("q", "")
+    match = to_match(query)
+    if match is None:
+        return jsonify({"error": "q must contain at least one word"}), 400
 
-            category_forecast.append(
-                {
-                    "category": row.category,
-                    "current_spend": current_spend,
-                    "forecast_spend": forecast_spend,
-                }
-            )
+    try:
+        limit = parse_limit(request.args.get("limit"))
+    except ValueError:
+        return jsonify({"error": f"limit must be between 1 and {MAX_PAGE_SIZE}"}), 400
 
-    forecast_expense_total = expense_total * 1.05
-    current_saving = income_total - expense_total
-    forecast_saving = income_total - forecast_expense_total
+    sort = request.args.get("sort", "newest")
+    if sort not in SEARCH_SORTS:
+        return jsonify({"error": f"sort must be one of {', '.join(SEARCH_SORTS)}"}), 400
 
-    return {
-        "categories": category_forecast,
-        "totals": {
-            "income": income_total,
-            "expense": expense_total,
-            "forecast_expense": forecast_expense_total,
-            "current_saving": current_saving,
-            "forecast_saving": forecast_saving,
-        },
-    }
+    stmt = search_select(user_id, match, sort)
+    stmt = apply_month_year_filter(stmt, request.args.get("month"), request.args.get("year"))
+    category = request.args.get("category")
+    if category:
+        stmt = stmt.where(Transaction.category == category)
 
+    rows = db.session.execute(stmt.limit(limit)).all()
+    count_rows(len(rows))
+    return jsonify(
+        {"query": query, "transactions": [Transaction.row_to_dict(r) for r in rows]}
+    )
 
-# -------------------------------------------------
-# API: transactions, summary, forecast (per user)
-# -------------------------------------------------
 
-@app.route("/api/transactions", methods=["GET"])
+@bp.route("/api/export", methods=["GET"])
 @require_auth
-def get_transactions_from_db():
+def export_transactions():
+    """
+    Streams the user's transactions as a file, oldest first.
+    ?format=csv|ndjson|parquet (default csv)
+    ?start=&end=YYYY-MM-DD (inclusive), ?category= narrow the rows.
+    ?after=<id> resumes after the last row received; send the ETag of
+    the first part as If-Match to get 412 if the data changed since.
+    """
     user_id = request.user_id
-    month = request.args.get("month")
-    year = request.args.get("year")
+    fmt = request.args.get("format", "csv")
+    if fmt not in export.FORMATS:
+        return jsonify({"error": f"format must be one of {', '.join(export.FORMATS)}"}), 400
+    if fmt not in export.available_formats():
+        return jsonify({"error": f"{fmt} export is not available on this server"}), 501
 
-    q = Transaction.query.filter_by(user_id=user_id)
-    q = apply_month_year_filter(q, month, year)
+    try:
+        start = _optional_date(request.args.get("start"))
+        end = _optional_date(request.args.get("end"))
+    except ValueError:
+        return jsonify({"error": "start/end must be YYYY-MM-DD"}), 400
+
+    after = request.args.get("after")
+    if after not in (None, ""):
+        try:
+            after = int(after)
+        except ValueError:
+            return jsonify({"error": "after must be a transaction id"}), 400
+    else:
+        after = None
 
-    transactions = q.order_by(Transaction.date).all()
-    data = [t.to_dict() for t in transactions]
-    return jsonify({"transactions": data})
+    category = request.args.get("category") or None
+    etag = export.export_etag(
+        user_id, get_data_version(user_id), (fmt, start, end, category)
+    )
+    if request.if_match and not request.if_match.contains(etag):
+        return jsonify({"error": "Transactions changed since the export started"}), 412
 
+    try:
+        stmt = export.export_select(user_id, start, end, category, after)
+    except export.UnknownRow:
+        return jsonify({"error": "after must be a transaction id"}), 400
 
-@app.route("/api/summary/categories", methods=["GET"])
+    mimetype, extension = export.FORMATS[fmt]
+    response = Response(
+        stream_with_context(export.WRITERS[fmt](stmt)), mimetype=mimetype
+    )
+    response.headers["Content-Disposition"] = (
+        f'attachment; filename="transactions.{extension}"'
+    )
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-store"
+    return response
+
+
+def _optional_date(value):
+    return date.fromisoformat(value) if value else None
+
+
+@bp.route("/api/summary/categories", methods=["GET"])
 @require_auth
+@conditional()
 def get_category_summary():
     user_id = request.user_id
     month = request.args.get("month")
     year = request.args.get("year")
+    return jsonify({"summary": category_summary(user_id, month, year)})
 
-    totals = get_category_totals_dict(user_id, month, year)
 
+def category_summary(user_id: int, month, year) -> list:
+    return cached_result(
+        "summary",
+        user_id,
+        lambda: summary_rows(get_category_totals_dict(user_id, month, year)),
+        month,
+        year,
+    )
+
+
+def summary_rows(totals: dict) -> list:
     summary = []
     for idx, (category, total) in enumerate(totals.items(), start=1):
         summary.append({"id": idx, "category": category, "total": total})
+    return summary
 
-    return jsonify({"summary": summary})
 
-
-@app.route("/api/forecast", methods=["GET"])
+@bp.route("/api/forecast", methods=["GET"])
 @require_auth
+@conditional()
 def get_forecast():
     user_id = request.user_id
     month = request.args.get("month")
     year = request.args.get("year")
+    return jsonify(forecast_for(user_id, month, year))
 
-    forecast = compute_forecast(user_id, month, year)
-    return jsonify(forecast)
 
+def forecast_for(user_id: int, month, year) -> dict:
+    basis = month_key(month, year)
+    return cached_result(
+        "forecast", user_id, lambda: forecasting.get_forecast(user_id, basis), basis
+    )
 
-# -------------------------------------------------
-# API: chatbot (per user)
-# -------------------------------------------------
 
-@app.route("/api/chat", methods=["POST"])
+@bp.route("/api/insights", methods=["GET"])
 @require_auth
-def chat():
+@conditional()
+def get_insights():
+    """
+    Month-over-month trends, rolling averages and per-category spend
+    percentiles. Optional ?start=YYYY-MM&end=YYYY-MM bound the months.
+    """
     user_id = request.user_id
+    start = request.args.get("start") or None
+    end = request.args.get("end") or None
+    for value in (start, end):
+        if value is not None and not _is_year_month(value):
+            return jsonify({"error": "start/end must be YYYY-MM"}), 400
+
+    def compute():
+        analytics = get_user_analytics(user_id)
+        return {
+            "totals": analytics.category_totals(start, end),
+            "trends": analytics.trends(start, end),
+            "percentiles": analytics.percentiles(start, end),
+        }
+
+    return jsonify(cached_result("insights", user_id, compute, start, end))
+
+
+def _is_year_month(value: str) -> bool:
+    try:
+        datetime.strptime(value, "%Y-%m")
+    except ValueError:
+        return False
+    return len(value) == 7
 
-    data = request.get_json() or {}
-    question = (data.get("question") or "").strip()
-    if not question:
-        return jsonify({"answer": "Please type a question."}), 400
 
-    q = question.lower()
+# -------------------------------------------------
+# API: dashboard bundle (per user)
+# -------------------------------------------------
 
-    category_totals = get_category_totals_dict(user_id)
-    forecast_data = compute_forecast(user_id)
+DASHBOARD_SECTIONS = ("transactions", "summary", "goals", "forecast")
 
-    if "spend on" in q or "spent on" in q:
-        best_category = None
-        for category in category_totals.keys():
-            if category.lower() in q:
-                best_category = category
-                break
 
-        if best_category is None:
+@bp.route("/api/dashboard", methods=["GET"])
+@require_auth
+@conditional(vary_daily=True)
+def get_dashboard():
+    """
+    Everything the dashboard shows for ?month=&year=, in one response:
+    the first transactions page (?limit=), category summary, goal progress
+    and forecast. ?fields=summary,goals returns only those sections.
+
+    Sections share the per-endpoint result cache. Those that miss it are
+    computed from one shared query (see dashboard.py), so a load runs at
+    most the data_version lookup, the transactions page and that query.
+    """
+    user_id = request.user_id
+    month = request.args.get("month")
+    year = request.args.get("year")
+
+    fields = request.args.get("fields")
+    if fields:
+        sections = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = sorted(set(sections) - set(DASHBOARD_SECTIONS))
+        if unknown:
             return jsonify(
                 {
-                    "answer": "I couldn't detect the category. Try like: 'How much did I spend on Food & Dining?'"
+                    "error": f"Unknown fields: {', '.join(unknown)}",
+                    "fields": list(DASHBOARD_SECTIONS),
                 }
-            )
+            ), 400
+    else:
+        sections = DASHBOARD_SECTIONS
 
-        total = category_totals[best_category]
-        spent = abs(total) if total < 0 else 0
-        return jsonify(
-            {
-                "answer": f"You spent ₹{spent:.2f} on {best_category} in the current data."
-            }
-        )
+    bundle = {}
+    if "transactions" in sections:
+        try:
+            limit = parse_limit(request.args.get("limit"))
+        except ValueError:
+            return jsonify({"error": f"limit must be between 1 and {MAX_PAGE_SIZE}"}), 400
 
-    if "total income" in q or "how much did i earn" in q:
-        income = 0.0
-        for total in category_totals.values():
-            if total > 0:
-                income += total
-        return jsonify(
-            {"answer": f"Your total income in the current data is ₹{income:.2f}."}
-        )
+        q = Transaction.api_select().where(Transaction.user_id == user_id)
+        q = apply_month_year_filter(q, month, year)
+        bundle["transactions"] = transactions_page(q, None, limit)
 
-    if "total expense" in q or "how much did i spend in total" in q:
-        expense = 0.0
-        for total in category_totals.values():
-            if total < 0:
-                expense += abs(total)
-        return jsonify(
-            {"answer": f"Your total expense in the current data is ₹{expense:.2f}."}
+    key = month_key(month, year)
+    today = date.today()
+    goals_month = key or today.strftime("%Y-%m")
+    aggregates = DashboardAggregates(
+        user_id, goals_month, get_data_version(user_id), today, forecast_basis=key
+    )
+    if "summary" in sections:
+        bundle["summary"] = cached_result(
+            "summary",
+            user_id,
+            lambda: summary_rows(aggregates.analytics.category_totals(key, key)),
+            month,
+            year,
         )
-
-    if "saving" in q:
-        current_saving = forecast_data["totals"]["current_saving"]
-        forecast_saving = forecast_data["totals"]["forecast_saving"]
-        return jsonify(
-            {
-                "answer": (
-                    f"Your current saving is ₹{current_saving:.2f}. "
-                    f"Based on a simple forecast, next month saving is estimated at ₹{forecast_saving:.2f}."
-                )
-            }
+    if "goals" in sections:
+        # projections depend on the day, like the ETag
+        bundle["goals"] = cached_result(
+            "goals_progress",
+            user_id,
+            lambda: aggregates.goals_progress,
+            goals_month,
+            today.isoformat(),
+        )
+    if "forecast" in sections:
+        bundle["forecast"] = cached_result(
+            "forecast",
+            user_id,
+            lambda: aggregates.forecast,
+            key,
         )
 
-    return jsonify(
-        {
-            "answer": "I can answer things like: 'How much did I spend on Food & Dining?', "
-            "'What is my total income?', 'What is my total expense?', or 'What are my savings?'."
-        }
-    )
+    return jsonify(bundle)
+
+
+# -------------------------------------------------
+# API: chatbot (per user)
+# -------------------------------------------------
+
+@bp.route("/api/chat", methods=["POST"])
+@require_auth
+def chat():
+    user_id = request.user_id
+
+    data = request.get_json() or {}
+    question = (data.get("question") or "").strip()
+    if not question:
+        return jsonify({"answer": "Please type a question."}), 400
+
+    return jsonify({"answer": answer_question(user_id, question)})
 
 
 # -------------------------------------------------
 # API: goals (per user)
 # -------------------------------------------------
 
-@app.route("/api/goals", methods=["GET"])
+@bp.route("/api/goals", methods=["GET"])
 @require_auth
+@conditional()
 def get_goals():
     user_id = request.user_id
-    goals = Goal.query.filter_by(user_id=user_id).order_by(Goal.category).all()
-    return jsonify({"goals": [g.to_dict() for g in goals]})
+
+    def compute():
+        stmt = Goal.api_select().where(Goal.user_id == user_id).order_by(Goal.category)
+        rows = db.session.execute(stmt).all()
+        count_rows(len(rows))
+        return [Goal.row_to_dict(r) for r in rows]
+
+    return jsonify({"goals": cached_result("goals", user_id, compute)})
+
+
+@bp.route("/api/goals/progress", methods=["GET"])
+@require_auth
+@conditional(vary_daily=True)
+def get_goals_progress():
+    """
+    Spent / remaining / percent used / projected month-end overrun per
+    goal for ?month=&year= (default: the current month), plus the budget
+    alerts recorded for that month.
+    """
+    user_id = request.user_id
+    month = request.args.get("month")
+    year = request.args.get("year")
+    return jsonify(goals_progress_for(user_id, month, year))
+
+
+def goals_progress_for(user_id: int, month, year) -> dict:
+    today = date.today()
+    year_month = month_key(month, year) or today.strftime("%Y-%m")
+
+    def compute():
+        return {
+            "month": year_month,
+            "goals": goal_progress(db.session, user_id, year_month, today),
+            "alerts": month_alerts(db.session, user_id, year_month),
+        }
+
+    # projections depend on the day, like the ETag
+    return cached_result("goals_progress", user_id, compute, year_month, today.isoformat())
 
 
-@app.route("/api/goals", methods=["POST"])
+@bp.route("/api/goals", methods=["POST"])
 @require_auth
 def create_or_update_goal():
     user_id = request.user_id
@@ -672,6 +1070,11 @@ def create_or_update_goal():
         goal = Goal(category=category, monthly_limit=monthly_limit, user_id=user_id)
         db.session.add(goal)
 
+    # a changed limit re-bases this goal's alerts
+    db.session.flush()
+    delete_alerts(db.session, user_id, category)
+    evaluate_alerts(db.session, user_id, category=category)
+    bump_data_version(user_id)
     db.session.commit()
 
     return jsonify({"goal": goal.to_dict()}), 201
@@ -681,11 +1084,14 @@ def create_or_update_goal():
 # API: reset transactions (per user)
 # -------------------------------------------------
 
-@app.route("/api/reset", methods=["POST"])
+@bp.route("/api/reset", methods=["POST"])
 @require_auth
 def reset_transactions():
     user_id = request.user_id
     deleted = db.session.query(Transaction).filter_by(user_id=user_id).delete()
+    delete_user_rollups(db.session, user_id)
+    delete_alerts(db.session, user_id)
+    bump_data_version(user_id)
     db.session.commit()
     return jsonify({"success": True, "deleted": deleted})
 
@@ -696,4 +1102,4 @@ def reset_transactions():
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
-    app.run(host="0.0.0.0", port=port, debug=True)
+    create_app().run(host="0.0.0.0", port=port, debug=True)
@@ -0,0 +1,85 @@
+"""
+Benchmark for the pandas analytics engine (analytics.UserAnalytics).
+
+Usage (from backend/):
+    python benchmarks/bench_analytics.py --sizes 10000 100000 1000000
+
+For each size, seeds one user through /upload-csv on a throwaway SQLite
+file and times totals, trends and percentiles with a cold frame cache
+(frames loaded from SQLite) and a warm one (frames reused), plus
+/api/insights end to end with the result cache cleared.
+"""
+import argparse
+import io
+import time
+
+from bench_upload import build_csv
+from harness import auth_headers, make_app
+
+REPEATS = 5
+
+
+def timed(fn, repeats=REPEATS):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(rows: int):
+    app = make_app()
+    client = app.test_client()
+    headers = auth_headers(app)
+    res = client.post(
+        "/upload-csv",
+        data={"file": (io.BytesIO(build_csv(rows)), "bench.csv")},
+        headers=headers,
+        content_type="multipart/form-data",
+    )
+    assert res.status_code == 200, res.get_data(as_text=True)
+
+    from analytics import get_user_analytics
+    from cache import get_cache
+
+    results = {}
+    with app.app_context():
+        frames = app.extensions["frame_cache"]
+
+        for name, call in (
+            ("totals", lambda a: a.category_totals()),
+            ("trends", lambda a: a.trends()),
+            ("percentiles", lambda a: a.percentiles()),
+        ):
+            def cold():
+                frames.clear()
+                call(get_user_analytics(1))
+
+            results[f"{name} cold"] = timed(cold)
+            results[f"{name} warm"] = timed(lambda: call(get_user_analytics(1)))
+
+    def insights():
+        with app.app_context():
+            get_cache().clear()
+        res = client.get("/api/insights", headers=headers)
+        assert res.status_code == 200, res.get_data(as_text=True)
+
+    results["/api/insights"] = timed(insights)
+
+    print(f"rows {rows:,}")
+    for label, ms in results.items():
+        print(f"  {label:<18} {ms:9.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    for rows in args.sizes:
+        run(rows)
+
+
+if __name__ == "__main__":
+    main()
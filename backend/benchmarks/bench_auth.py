@@ -0,0 +1,47 @@
+"""
+Auth overhead per request, with and without the verified-token cache.
+
+Usage (from backend/):
+    python benchmarks/bench_auth.py --requests 20000
+"""
+import argparse
+import time
+
+from harness import make_app
+
+
+def run(verify_token, token, requests):
+    start = time.perf_counter()
+    for _ in range(requests):
+        verify_token(token)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    from app import generate_token, get_token_cache, verify_token
+
+    app = make_app()
+    with app.app_context():
+        token = generate_token(1)
+        cache = get_token_cache()
+
+        maxsize = cache.maxsize
+        cache.maxsize = 0
+        cache.clear()
+        uncached = run(verify_token, token, args.requests)
+
+        cache.maxsize = maxsize
+        verify_token(token)  # warm
+        cached = run(verify_token, token, args.requests)
+
+    print(f"jwt.decode every request   {uncached:8.2f} us/request")
+    print(f"verified-token cache       {cached:8.2f} us/request")
+    print(f"speedup                    {uncached / cached:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
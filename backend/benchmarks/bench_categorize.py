@@ -0,0 +1,102 @@
+"""
+Micro-benchmark: compiled CategoryRules vs the original if-chain.
+
+Usage (from backend/):
+    python benchmarks/bench_categorize.py --rows 200000
+"""
+import argparse
+import random
+import time
+
+import harness  # noqa: F401  (puts backend/ on sys.path)
+from categorizer import CategoryRules
+
+MERCHANTS = [
+    "ZOMATO ORDER #{n}",
+    "Swiggy Instamart {n}",
+    "UBER *TRIP {n}",
+    "Ola cab booking",
+    "Amazon Pay India",
+    "FLIPKART INTERNET PVT LTD",
+    "Monthly rent transfer",
+    "Society maintenance",
+    "BESCOM electricity bill",
+    "Water bill",
+    "Salary credit",
+    "UPI/STARBUCKS COFFEE/{n}",
+    "ATM withdrawal",
+    "Cinema tickets",
+]
+
+
+def legacy_categorize(description: str, amount: float) -> str:
+    text = (description or "").lower()
+
+    if "salary" in text or "credit" in text:
+        return "Income"
+    if "zomato" in text or "swiggy" in text or "restaurant" in text:
+        return "Food & Dining"
+    if "uber" in text or "ola" in text or "cab" in text:
+        return "Transport"
+    if "amazon" in text or "flipkart" in text or "myntra" in text:
+        return "Shopping"
+    if "rent" in text or "maintenance" in text:
+        return "Housing"
+    if "electricity" in text or "water bill" in text or "internet" in text:
+        return "Utilities"
+    if amount > 0:
+        return "Income"
+    return "Other"
+
+
+def build_rows(rows: int, seed: int = 7):
+    rng = random.Random(seed)
+    descriptions = []
+    amounts = []
+    for _ in range(rows):
+        template = rng.choice(MERCHANTS)
+        descriptions.append(template.format(n=rng.randint(1, 50)))
+        amounts.append(rng.choice([-1, 1]) * rng.uniform(10, 5000))
+    return descriptions, amounts
+
+
+def timed(label, fn, rows):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed * 1000:8.1f} ms  {rows / elapsed:12,.0f} rows/sec")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+
+    descriptions, amounts = build_rows(args.rows)
+    rules = CategoryRules.from_file()
+
+    expected = timed(
+        "legacy if-chain",
+        lambda: [legacy_categorize(d, a) for d, a in zip(descriptions, amounts)],
+        args.rows,
+    )
+    cold = CategoryRules.from_file()
+    got_single = timed(
+        "compiled, per row",
+        lambda: [cold.categorize(d, a) for d, a in zip(descriptions, amounts)],
+        args.rows,
+    )
+    got_batch = timed(
+        "compiled, batch",
+        lambda: rules.categorize_many(descriptions, amounts),
+        args.rows,
+    )
+
+    assert got_single == expected, "per-row result differs from legacy"
+    assert got_batch == expected, "batch result differs from legacy"
+    print("results identical to legacy categorize_transaction")
+
+
+if __name__ == "__main__":
+    main()
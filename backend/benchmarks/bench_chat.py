@@ -0,0 +1,84 @@
+"""
+Latency benchmark for /api/chat.
+
+Usage (from backend/):
+    python benchmarks/bench_chat.py --rows 100000 --requests 200
+
+Seeds one user through /upload-csv on a throwaway SQLite file, then asks
+a mix of questions and reports latency percentiles and SQL statements
+per turn.
+"""
+import argparse
+import io
+import statistics
+import time
+
+from sqlalchemy import event
+
+from bench_upload import build_csv
+from harness import auth_headers, make_app
+
+QUESTIONS = [
+    "How much did I spend on Food & Dining?",
+    "How much did I spend on food in October 2025?",
+    "How much did I spend on transport from March to June 2025?",
+    "What is my total income?",
+    "What is my total expense?",
+    "What are my savings?",
+]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    app = make_app()
+    from db import db
+
+    client = app.test_client()
+    headers = auth_headers(app)
+    client.post(
+        "/upload-csv",
+        data={"file": (io.BytesIO(build_csv(args.rows)), "bench.csv")},
+        headers=headers,
+        content_type="multipart/form-data",
+    )
+
+    statements = []
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    latencies = []
+    per_turn = []
+    for i in range(args.requests):
+        question = QUESTIONS[i % len(QUESTIONS)]
+        before = len(statements)
+        start = time.perf_counter()
+        res = client.post("/api/chat", json={"question": question}, headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        per_turn.append(len(statements) - before)
+        assert res.status_code == 200, res.get_data(as_text=True)
+
+    print(f"rows          {args.rows}")
+    print(f"requests      {args.requests}")
+    print(f"mean          {statistics.mean(latencies):.2f} ms")
+    print(f"p50           {percentile(latencies, 50):.2f} ms")
+    print(f"p95           {percentile(latencies, 95):.2f} ms")
+    print(f"p99           {percentile(latencies, 99):.2f} ms")
+    print(f"sql/turn max  {max(per_turn)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Bytes on the wire and server time for a repeated dashboard load.
+
+Usage (from backend/):
+    python benchmarks/bench_conditional.py --rows 50000
+
+Seeds one user, then loads the dashboard's read endpoints three ways:
+uncompressed without validators, compressed without validators, and
+compressed revalidating with the ETags from the previous load (what a
+browser does on refresh). Exits non-zero if the revalidation does not
+come back 304 everywhere or compression does not shrink the load.
+"""
+import argparse
+import io
+import sys
+import time
+
+from bench_upload import build_csv
+from harness import auth_headers, make_app
+
+DASHBOARD = [
+    "/api/transactions?limit=200",
+    "/api/summary/categories",
+    "/api/goals/progress?month=11&year=2025",
+    "/api/forecast",
+    "/api/insights",
+]
+REPEATS = 20
+
+
+def load(client, headers, etags=None):
+    """One dashboard load. Returns (body bytes, seconds, statuses, etags)."""
+    total_bytes = 0
+    statuses = []
+    new_etags = {}
+    start = time.perf_counter()
+    for url in DASHBOARD:
+        request_headers = dict(headers)
+        if etags and url in etags:
+            request_headers["If-None-Match"] = etags[url]
+        res = client.get(url, headers=request_headers)
+        total_bytes += len(res.get_data())
+        statuses.append(res.status_code)
+        new_etags[url] = res.headers.get("ETag")
+    return total_bytes, time.perf_counter() - start, statuses, new_etags
+
+
+def measure(client, headers, etags=None):
+    best = None
+    for _ in range(REPEATS):
+        result = load(client, headers, etags)
+        if best is None or result[1] < best[1]:
+            best = result
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000)
+    args = parser.parse_args()
+
+    app = make_app()
+    client = app.test_client()
+    headers = auth_headers(app)
+    client.post(
+        "/upload-csv",
+        data={"file": (io.BytesIO(build_csv(args.rows)), "bench.csv")},
+        headers=headers,
+        content_type="multipart/form-data",
+    )
+    client.post(
+        "/api/goals",
+        json={"category": "Food & Dining", "monthly_limit": 20000},
+        headers=headers,
+    )
+
+    identity = dict(headers, **{"Accept-Encoding": "identity"})
+    compressed = dict(headers, **{"Accept-Encoding": "gzip, br"})
+
+    plain_bytes, plain_time, _, _ = measure(client, identity)
+    full_bytes, full_time, _, etags = measure(client, compressed)
+    cond_bytes, cond_time, statuses, _ = measure(client, compressed, etags)
+
+    print(f"rows                    {args.rows}")
+    print(f"uncompressed            {plain_bytes:>9,} B  {plain_time * 1000:7.2f} ms")
+    print(f"compressed              {full_bytes:>9,} B  {full_time * 1000:7.2f} ms")
+    print(f"revalidated (304)       {cond_bytes:>9,} B  {cond_time * 1000:7.2f} ms")
+    print(f"bytes saved vs plain    {1 - cond_bytes / plain_bytes:9.1%}")
+    print(f"time saved vs full      {1 - cond_time / full_time:9.1%}")
+
+    ok = all(status == 304 for status in statuses) and full_bytes < plain_bytes
+    if not ok:
+        print(f"FAIL: statuses {statuses}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
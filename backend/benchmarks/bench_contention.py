@@ -0,0 +1,144 @@
+"""
+Multi-process SQLite contention benchmark: concurrent uploads against
+concurrent dashboard reads on one database file, like several gunicorn
+workers would produce.
+
+Usage (from backend/):
+    python benchmarks/bench_contention.py --profile tuned
+    python benchmarks/bench_contention.py --profile baseline
+
+"tuned" is the default engine profile (WAL, busy_timeout,
+synchronous=NORMAL, mmap, larger cache). "baseline" approximates the
+old plain sqlite:/// settings (rollback journal, synchronous=FULL).
+
+Every upload is a new statement (its own seed and year), so each one
+inserts all of its rows rather than being skipped as duplicates.
+"""
+import argparse
+import io
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+
+from bench_upload import build_csv
+from harness import add_bench_users, auth_headers, make_app
+
+PROFILES = {
+    "tuned": {},
+    "baseline": {
+        "SQLITE_JOURNAL_MODE": "DELETE",
+        "SQLITE_SYNCHRONOUS": "FULL",
+        "SQLITE_MMAP_SIZE": None,
+        "SQLITE_CACHE_SIZE": None,
+    },
+}
+
+
+def _settings(db_uri, profile):
+    settings = {
+        "SQLALCHEMY_DATABASE_URI": db_uri,
+        "RESULT_CACHE_SIZE": 0,  # measure the database, not the cache
+    }
+    settings.update(PROFILES[profile])
+    return settings
+
+
+def writer(db_uri, profile, user_id, rows, seconds):
+    app = make_app(setup=False, **_settings(db_uri, profile))
+    client = app.test_client()
+    headers = auth_headers(app, user_id)
+
+    latencies, errors, iteration = [], 0, 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        payload = build_csv(rows, seed=user_id * 100003 + iteration, year=2000 + iteration)
+        iteration += 1
+        start = time.perf_counter()
+        try:
+            res = client.post(
+                "/upload-csv",
+                data={"file": (io.BytesIO(payload), "bench.csv")},
+                headers=headers,
+                content_type="multipart/form-data",
+            )
+            ok = res.status_code == 200 and res.get_json()["duplicates"] == 0
+        except Exception:
+            ok = False
+        latencies.append((time.perf_counter() - start) * 1000)
+        errors += not ok
+    return "upload", latencies, errors
+
+
+def reader(db_uri, profile, user_id, seconds):
+    app = make_app(setup=False, **_settings(db_uri, profile))
+    client = app.test_client()
+    headers = auth_headers(app, user_id)
+    paths = ["/api/summary/categories", "/api/forecast", "/api/transactions?limit=100"]
+
+    latencies, errors, i = [], 0, 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        try:
+            ok = client.get(paths[i % len(paths)], headers=headers).status_code == 200
+        except Exception:
+            ok = False
+        latencies.append((time.perf_counter() - start) * 1000)
+        errors += not ok
+        i += 1
+    return "read", latencies, errors
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="tuned")
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--upload-rows", type=int, default=20000)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    db_uri = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "contention.db")
+    app = make_app(**_settings(db_uri, args.profile))  # create schema once
+    with app.app_context():
+        add_bench_users(max(args.writers, args.readers))
+
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(args.writers + args.readers) as pool:
+        jobs = [
+            pool.apply_async(
+                writer, (db_uri, args.profile, w + 1, args.upload_rows, args.seconds)
+            )
+            for w in range(args.writers)
+        ]
+        jobs += [
+            pool.apply_async(reader, (db_uri, args.profile, r + 1, args.seconds))
+            for r in range(args.readers)
+        ]
+        results = [job.get() for job in jobs]
+
+    print(f"profile {args.profile}: {args.writers} writers x {args.upload_rows} rows, "
+          f"{args.readers} readers, {args.seconds:.0f}s")
+    for role in ("upload", "read"):
+        latencies = [l for r, ls, _ in results if r == role for l in ls]
+        errors = sum(e for r, _, e in results if r == role)
+        if not latencies:
+            continue
+        print(
+            f"{role:<7} n={len(latencies):<6} errors={errors:<4} "
+            f"p50={percentile(latencies, 50):8.1f} ms  "
+            f"p99={percentile(latencies, 99):8.1f} ms  "
+            f"mean={statistics.mean(latencies):8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Cost of converting summaries to the user's currency inside SQL.
+
+Usage (from backend/):
+    python benchmarks/bench_currency.py --rows 200000
+
+Loads the same synthetic statement (benchmarks/synth.py) for two users,
+then moves every third transaction of the second one into USD, EUR or
+GBP (amount divided by that month's rate, so totals stay comparable) and
+rebuilds its rollup. For both users, times the aggregate queries behind
+the summary, insights, forecast and chat: category totals over all
+history and one month, converted (monthly_totals_converted) and as a
+plain sum over the rollup for reference, and the monthly and
+per-transaction analytics frames.
+
+The multi-currency user has up to four rollup rows per month and
+category instead of one, and each foreign-currency row costs two rate
+lookups; a single-currency user's rows need none.
+
+Also checks the SQL conversion against converting every transaction in
+Python with FxRates. Exits non-zero if any category total differs by
+more than a paisa, or if converting costs a single-currency user more
+than --max-ratio times the plain rollup sum.
+"""
+import argparse
+import statistics
+import sys
+import time
+
+from harness import make_app
+from synth import seed_database
+
+FOREIGN = ("USD", "EUR", "GBP")
+
+
+def timed(run, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200000, help="rows per user")
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--max-ratio", type=float, default=1.5)
+    args = parser.parse_args()
+
+    app = make_app(SLOW_QUERY_MS=None)
+
+    from sqlalchemy import func, select, text
+
+    from analytics import UserAnalytics
+    from db import db
+    from fx import get_fx_rates
+    from models import MonthlyCategoryTotal, Transaction, User
+    from rollup import category_totals_between, rebuild_rollups
+
+    with app.app_context():
+        start = time.perf_counter()
+        single, multi = seed_database(2, args.rows)
+        print(f"loaded {args.rows} rows for 2 users in {time.perf_counter() - start:.1f}s")
+
+        rates = get_fx_rates(db.session)
+        rows = db.session.execute(
+            select(Transaction.id, Transaction.date, Transaction.amount_minor).where(
+                Transaction.user_id == multi, Transaction.id % 3 == 0
+            )
+        ).all()
+        updates = []
+        for tx_id, day, amount_minor in rows:
+            currency = FOREIGN[tx_id // 3 % len(FOREIGN)]
+            amount = round(amount_minor / rates.rate(currency, day)) or -1
+            updates.append({"id": tx_id, "currency": currency, "amount_minor": amount})
+        db.session.execute(
+            text(
+                "UPDATE transactions SET currency = :currency, "
+                "amount_minor = :amount_minor WHERE id = :id"
+            ),
+            updates,
+        )
+        rebuild_rollups(db.session, multi)
+        db.session.commit()
+        print(f"user {multi}: {len(updates)} transactions in {', '.join(FOREIGN)}")
+
+        # expected totals, converting transaction by transaction
+        expected = {}
+        for category, day, amount_minor, currency in db.session.execute(
+            select(
+                Transaction.category,
+                Transaction.date,
+                Transaction.amount_minor,
+                Transaction.currency,
+            ).where(Transaction.user_id == multi)
+        ):
+            converted = rates.convert(amount_minor, currency, "INR", day)
+            expected[category] = expected.get(category, 0.0) + converted
+        actual = category_totals_between(db.session, multi)
+        wrong = [
+            category
+            for category, total in expected.items()
+            if abs(actual.get(category, 0.0) - round(total) / 100) > 0.011
+        ]
+        for category in wrong:
+            print(
+                f"FAIL: {category}: SQL {actual.get(category)} "
+                f"vs Python {expected[category] / 100:.2f}"
+            )
+
+        month = db.session.execute(
+            select(Transaction.date).where(Transaction.user_id == multi).limit(1)
+        ).scalar()
+        month = f"{month.year:04d}-{month.month:02d}"
+
+        def plain_totals(user_id, start=None):
+            rollup = MonthlyCategoryTotal
+            q = select(rollup.category, func.sum(rollup.total_minor)).where(
+                rollup.user_id == user_id
+            )
+            if start is not None:
+                q = q.where(rollup.year_month == start)
+            return db.session.execute(q.group_by(rollup.category)).all()
+
+        # label: (converted, plain rollup sum or None)
+        queries = {
+            "totals (all)": (
+                lambda user_id: category_totals_between(db.session, user_id),
+                lambda user_id: plain_totals(user_id),
+            ),
+            "totals (month)": (
+                lambda user_id: category_totals_between(db.session, user_id, month, month),
+                lambda user_id: plain_totals(user_id, month),
+            ),
+            "monthly frame": (lambda user_id: UserAnalytics(user_id).monthly, None),
+            "transaction frame": (
+                lambda user_id: UserAnalytics(user_id).transactions,
+                None,
+            ),
+        }
+
+        currency = db.session.get(User, multi).default_currency
+        print(f"amounts in {currency}; plain = unconverted rollup sum")
+        print(
+            f"{'':18} {'single ms':>10} {'plain ms':>9} "
+            f"{'multi ms':>10} {'plain ms':>9}"
+        )
+        slower = 0
+        for label, (run, plain) in queries.items():
+            cells = []
+            for user_id in (single, multi):
+                converted = timed(lambda: run(user_id), args.repeats)
+                cells.append(f"{converted * 1000:10.2f}")
+                if plain is None:
+                    cells.append(f"{'-':>9}")
+                    continue
+                reference = timed(lambda: plain(user_id), args.repeats)
+                cells.append(f"{reference * 1000:9.2f}")
+                if user_id == single:
+                    slower += converted > reference * args.max_ratio
+            print(f"{label:18} {' '.join(cells)}")
+
+    sys.exit(1 if wrong or slower else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+One dashboard load as four requests vs one /api/dashboard bundle.
+
+Usage (from backend/):
+    python benchmarks/bench_dashboard.py --rows 20000
+
+Seeds one user, then times the dashboard's data load both ways, warm
+(result cache populated) and cold (data_version bumped before every
+load, as after an upload), and counts the SQL statements each load runs.
+"""
+import argparse
+import io
+import time
+
+from sqlalchemy import event
+
+from bench_upload import build_csv
+from harness import auth_headers, make_app
+
+QUERY = "month=11&year=2025"
+SEPARATE = [
+    f"/api/transactions?limit=200&{QUERY}",
+    f"/api/summary/categories?{QUERY}",
+    f"/api/goals/progress?{QUERY}",
+    f"/api/forecast?{QUERY}",
+]
+BUNDLE = [f"/api/dashboard?limit=200&{QUERY}"]
+# the same without the transactions page, which dominates both
+SEPARATE_AGGREGATES = SEPARATE[1:]
+BUNDLE_AGGREGATES = [f"/api/dashboard?fields=summary,goals,forecast&{QUERY}"]
+REPEATS = 50
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    app = make_app()
+    client = app.test_client()
+    headers = auth_headers(app)
+    client.post(
+        "/upload-csv",
+        data={"file": (io.BytesIO(build_csv(args.rows)), "bench.csv")},
+        headers=headers,
+        content_type="multipart/form-data",
+    )
+    client.post(
+        "/api/goals",
+        json={"category": "Food & Dining", "monthly_limit": 20000},
+        headers=headers,
+    )
+
+    from cache import bump_data_version
+    from db import db
+
+    statements = [0]
+    with app.app_context():
+        event.listen(
+            db.engine, "before_cursor_execute",
+            lambda *a: statements.__setitem__(0, statements[0] + 1),
+        )
+
+    def invalidate():
+        with app.app_context():
+            bump_data_version(1)
+            db.session.commit()
+
+    def load(urls, cold):
+        best = None
+        for _ in range(REPEATS):
+            if cold:
+                invalidate()
+            statements[0] = 0
+            start = time.perf_counter()
+            for url in urls:
+                res = client.get(url, headers=headers)
+                assert res.status_code == 200, (url, res.status_code)
+            elapsed = time.perf_counter() - start
+            if best is None or elapsed < best[0]:
+                best = (elapsed, statements[0])
+        return best
+
+    print(f"rows {args.rows}, best of {REPEATS}")
+    print(f"{'':28} {'requests':>8} {'ms':>9} {'statements':>11}")
+    for label, cold in (("warm", False), ("cold", True)):
+        for name, urls in (
+            ("separate", SEPARATE),
+            ("bundle", BUNDLE),
+            ("separate, no page", SEPARATE_AGGREGATES),
+            ("bundle, no page", BUNDLE_AGGREGATES),
+        ):
+            elapsed, count = load(urls, cold)
+            print(f"{label + ' ' + name:28} {len(urls):>8} {elapsed * 1000:9.2f} {count:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Cost of duplicate detection as a user's history grows.
+
+Usage (from backend/):
+    python benchmarks/bench_dedup.py --history 0 100000 500000 --rows 20000
+
+For each history size, seeds one user with that many distinct
+transactions, then uploads the same statement twice: the first upload
+is all new rows, the second all duplicates skipped by the unique
+fingerprint index. Per-row cost should stay roughly flat as history grows.
+"""
+import argparse
+import io
+import time
+
+from bench_upload import build_csv
+from harness import auth_headers, make_app
+
+HISTORY_SEED_BASE = 1000
+
+
+def upload(client, headers, payload):
+    start = time.perf_counter()
+    res = client.post(
+        "/upload-csv",
+        data={"file": (io.BytesIO(payload), "bench.csv")},
+        headers=headers,
+        content_type="multipart/form-data",
+    )
+    elapsed = time.perf_counter() - start
+    assert res.status_code == 200, res.get_data(as_text=True)
+    return elapsed, res.get_json()
+
+
+def run(history: int, rows: int):
+    app = make_app()
+    client = app.test_client()
+    headers = auth_headers(app)
+
+    # history in 100k-row statements with distinct seeds (distinct amounts)
+    seeded = 0
+    seed = HISTORY_SEED_BASE
+    while seeded < history:
+        size = min(100000, history - seeded)
+        upload(client, headers, build_csv(size, seed=seed))
+        seeded += size
+        seed += 1
+
+    statement = build_csv(rows, seed=1)
+    first, first_body = upload(client, headers, statement)
+    again, again_body = upload(client, headers, statement)
+
+    print(
+        f"history {history:>9,}  "
+        f"new {first_body['count']:>7,} in {first * 1e6 / rows:6.1f} us/row  "
+        f"dup {again_body['duplicates']:>7,} in {again * 1e6 / rows:6.1f} us/row"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--history", type=int, nargs="+", default=[0, 100000, 300000])
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    for history in args.history:
+        run(history, args.rows)
+
+
+if __name__ == "__main__":
+    main()
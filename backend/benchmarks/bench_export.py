@@ -0,0 +1,133 @@
+"""
+/api/export streaming vs the buffered /api/transactions list.
+
+Usage (from backend/):
+    python benchmarks/bench_export.py --rows 200000
+
+Loads synthetic statements (benchmarks/synth.py) for one user, then
+downloads the whole history each way and reports time to first chunk,
+total time, body size and peak traced memory. An export's peak should
+stay flat as --rows grows; the list's grows with it. Exits non-zero if
+an export does not hold the same rows as the list, or if a download
+resumed halfway with ?after= does not add up to the whole.
+"""
+import argparse
+import csv
+import io
+import json
+import sys
+import time
+import tracemalloc
+
+from harness import auth_headers, make_app
+from synth import seed_database
+
+
+def measure(client, url, headers):
+    """(first chunk s, total s, body bytes, peak bytes), discarding the body."""
+
+    def read():
+        start = time.perf_counter()
+        response = client.get(url, headers=headers, buffered=False)
+        first = None
+        size = 0
+        for chunk in response.response:
+            if first is None:
+                first = time.perf_counter() - start
+            size += len(chunk)
+        response.close()
+        total = time.perf_counter() - start
+        return first or total, total, size
+
+    first, total, size = read()
+    # a second pass for memory: tracing slows every allocation
+    tracemalloc.start()
+    read()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return first, total, size, peak
+
+
+def fetch(client, url, headers) -> bytes:
+    return client.get(url, headers=headers).get_data()
+
+
+def decode(fmt, body):
+    if fmt == "csv":
+        return [
+            [
+                int(r["id"]),
+                r["date"],
+                r["description"],
+                float(r["amount"]),
+                r["currency"],
+                r["category"],
+            ]
+            for r in csv.DictReader(io.StringIO(body.decode("utf-8")))
+        ]
+    if fmt == "ndjson":
+        rows = [json.loads(line) for line in body.splitlines()]
+    elif fmt == "parquet":
+        import pandas as pd
+
+        frame = pd.read_parquet(io.BytesIO(body))
+        frame["date"] = frame["date"].astype(str)
+        rows = frame.to_dict("records")
+    else:
+        rows = json.loads(body)["transactions"]
+    return [
+        [r["id"], r["date"], r["description"], r["amount"], r["currency"], r["category"]]
+        for r in rows
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+
+    app = make_app(SLOW_QUERY_MS=None)
+    with app.app_context():
+        (user_id,) = seed_database(1, args.rows)
+    client = app.test_client()
+    headers = auth_headers(app, user_id)
+
+    import export
+
+    formats = export.available_formats()
+    if "parquet" not in formats:
+        print("parquet: skipped (pyarrow not installed)")
+
+    print(f"rows {args.rows}")
+    print(f"{'':16} {'first ms':>9} {'total ms':>9} {'body MiB':>9} {'peak MiB':>9}")
+    expected = None
+    failures = 0
+    variants = [("list (json)", "/api/transactions", None)]
+    variants += [(f"export {f}", f"/api/export?format={f}", f) for f in formats]
+    for name, url, fmt in variants:
+        first, total, size, peak = measure(client, url, headers)
+        print(
+            f"{name:16} {first * 1000:9.1f} {total * 1000:9.1f} "
+            f"{size / 2**20:9.1f} {peak / 2**20:9.1f}"
+        )
+        rows = decode(fmt, fetch(client, url, headers))
+        if expected is None:
+            expected = rows
+            continue
+        if rows != expected:
+            print(f"FAIL: {name} rows differ from the list")
+            failures += 1
+            continue
+
+        # resume halfway, as after a dropped connection
+        middle = rows[len(rows) // 2 - 1][0]
+        rest = decode(fmt, fetch(client, f"{url}&after={middle}", headers))
+        if rows[: len(rows) // 2] + rest != expected:
+            print(f"FAIL: {name} resumed download differs")
+            failures += 1
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
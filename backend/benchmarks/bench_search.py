@@ -0,0 +1,119 @@
+"""
+FTS5 search vs a LIKE scan over transaction descriptions.
+
+Usage (from backend/):
+    python benchmarks/bench_search.py --rows 1000000 --users 1
+    python benchmarks/bench_search.py --rows 1000000 --users 100
+
+Loads synthetic statements (benchmarks/synth.py), then runs the same
+searches for one user both ways: the /api/transactions/search select,
+and `description LIKE '%term%'` over the user's rows. Each is timed for
+the first page (ordered, LIMIT 100) and for counting every match.
+
+Both pages are newest first, so both can stop after LIMIT matches;
+LIKE still reads every non-matching row on the way, while FTS walks only
+the matching postings. Counting all matches (and any search with few or
+no matches) makes LIKE scan the whole history. Reports the median of
+--repeats runs and exits non-zero if, for any search, FTS is slower than
+LIKE at counting matches or takes more than --max-ratio times as long
+for the first page.
+"""
+import argparse
+import statistics
+import sys
+import time
+
+from harness import make_app
+from synth import seed_database
+
+# (label, FTS query, LIKE pattern)
+SEARCHES = [
+    ("common word", "zomato", "%zomato%"),
+    ("rare word", "bookmyshow", "%bookmyshow%"),
+    ("two words", "swiggy bangalore", "%swiggy%bangalore%"),
+    ("prefix", "pharm*", "%pharm%"),
+    ("no match", "lottery", "%lottery%"),
+]
+LIMIT = 100
+
+
+def timed(run, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        rows = run()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000000, help="rows in total")
+    parser.add_argument("--users", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--max-ratio", type=float, default=1.5)
+    args = parser.parse_args()
+
+    # LIKE scans are slow on purpose; keep them out of the slow-query log
+    app = make_app(SLOW_QUERY_MS=None)
+
+    from sqlalchemy import func, select
+
+    from db import db
+    from models import Transaction
+    from search import search_select, to_match
+
+    with app.app_context():
+        start = time.perf_counter()
+        user_ids = seed_database(args.users, args.rows // args.users)
+        print(
+            f"loaded {args.rows} rows for {args.users} user(s) "
+            f"in {time.perf_counter() - start:.1f}s"
+        )
+        user_id = user_ids[0]
+
+        def fts(query):
+            stmt = search_select(user_id, to_match(query)).limit(LIMIT)
+            return lambda: db.session.execute(stmt).all()
+
+        def like_select(pattern):
+            return Transaction.api_select().where(
+                Transaction.user_id == user_id,
+                func.lower(Transaction.description).like(pattern),
+            )
+
+        def like(pattern):
+            stmt = like_select(pattern).order_by(
+                Transaction.date.desc(), Transaction.id.desc()
+            ).limit(LIMIT)
+            return lambda: db.session.execute(stmt).all()
+
+        def count(stmt):
+            stmt = select(func.count()).select_from(stmt.order_by(None).subquery())
+            return lambda: [db.session.execute(stmt).scalar()]
+
+        slower = 0
+        print(
+            f"{'':14} {'page FTS':>9} {'LIKE ms':>9} {'speedup':>8} "
+            f"{'count FTS':>10} {'LIKE ms':>9} {'speedup':>8} {'matches':>8}"
+        )
+        for label, query, pattern in SEARCHES:
+            page_fts, _ = timed(fts(query), args.repeats)
+            page_like, _ = timed(like(pattern), args.repeats)
+            all_fts, _ = timed(
+                count(search_select(user_id, to_match(query))), args.repeats
+            )
+            all_like, _ = timed(count(like_select(pattern)), args.repeats)
+            matches = count(search_select(user_id, to_match(query)))()[0]
+            slower += page_fts > page_like * args.max_ratio or all_fts > all_like
+            print(
+                f"{label:14} {page_fts * 1000:9.2f} {page_like * 1000:9.2f} "
+                f"{page_like / page_fts:7.1f}x {all_fts * 1000:10.2f} "
+                f"{all_like * 1000:9.2f} {all_like / all_fts:7.1f}x {matches:>8}"
+            )
+
+    sys.exit(1 if slower else 0)
+
+
+if __name__ == "__main__":
+    main()
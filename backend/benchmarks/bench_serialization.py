@@ -0,0 +1,108 @@
+"""
+Serializing a transaction list: ORM instances + stdlib json vs Core row
+tuples + the app's encoder (orjson when installed).
+
+Usage (from backend/):
+    python benchmarks/bench_serialization.py --rows 100000
+
+Seeds one user, then turns their whole history into a JSON body each way
+(query, dict building and encoding, as /api/transactions does) and
+reports CPU time (best of --repeats) and peak traced memory. Exits
+non-zero if the two bodies do not decode to the same data.
+"""
+import argparse
+import io
+import json
+import sys
+import time
+import tracemalloc
+
+from bench_upload import build_csv
+from harness import auth_headers, make_app
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    app = make_app()
+    client = app.test_client()
+    client.post(
+        "/upload-csv",
+        data={"file": (io.BytesIO(build_csv(args.rows)), "bench.csv")},
+        headers=auth_headers(app),
+        content_type="multipart/form-data",
+    )
+
+    from flask.json.provider import DefaultJSONProvider
+
+    import serialization
+    from db import db
+    from models import Transaction
+    from pagination import apply_keyset
+
+    stdlib = DefaultJSONProvider(app)
+
+    def orm_stdlib():
+        # the previous read path
+        rows = apply_keyset(Transaction.query.filter_by(user_id=1), None).all()
+        data = [t.to_dict() for t in rows]
+        return stdlib.dumps({"transactions": data}, separators=(",", ":")).encode("utf-8")
+
+    def core(encoder):
+        def run():
+            stmt = apply_keyset(
+                Transaction.api_select().where(Transaction.user_id == 1), None
+            )
+            data = [Transaction.row_to_dict(r) for r in db.session.execute(stmt)]
+            return encoder({"transactions": data})
+
+        return run
+
+    variants = [("ORM + to_dict + json", orm_stdlib)]
+    if serialization.orjson is not None:
+        variants.append(
+            ("Core rows + orjson", core(lambda obj: serialization.encode(obj, True)))
+        )
+    variants.append(
+        (
+            "Core rows + json",
+            core(lambda obj: stdlib.dumps(obj, separators=(",", ":")).encode("utf-8")),
+        )
+    )
+
+    bodies = {}
+    print(f"rows {args.rows}")
+    print(f"{'':24} {'cpu ms':>9} {'peak MiB':>9} {'body KiB':>9}")
+    with app.app_context():
+        for name, run in variants:
+            best = None
+            for _ in range(args.repeats):
+                db.session.remove()  # an empty identity map for every run
+                start = time.process_time()
+                body = run()
+                elapsed = time.process_time() - start
+                best = elapsed if best is None else min(best, elapsed)
+
+            db.session.remove()
+            tracemalloc.start()
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            bodies[name] = body
+            print(
+                f"{name:24} {best * 1000:9.1f} {peak / 2**20:9.1f} {len(body) / 1024:9.0f}"
+            )
+
+    decoded = [json.loads(body) for body in bodies.values()]
+    same = all(d == decoded[0] for d in decoded)
+    if not same:
+        print("FAIL: bodies differ")
+    sys.exit(0 if same else 1)
+
+
+if __name__ == "__main__":
+    main()
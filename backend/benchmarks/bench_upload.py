@@ -0,0 +1,69 @@
+"""
+Throughput benchmark for /upload-csv.
+
+Usage (from backend/):
+    python benchmarks/bench_upload.py --rows 200000
+
+Runs against a throwaway SQLite file, never the real finance.db.
+"""
+import argparse
+import io
+import random
+import time
+
+from harness import auth_headers, make_app
+
+DESCRIPTIONS = [
+    "Zomato order",
+    "Swiggy order",
+    "Uber ride",
+    "Ola cab",
+    "Amazon purchase",
+    "Flipkart order",
+    "Rent",
+    "Electricity bill",
+    "Salary",
+    "Coffee shop",
+]
+
+
+def build_csv(rows: int, seed: int = 42, year: int = 2025) -> bytes:
+    rng = random.Random(seed)
+    out = io.StringIO()
+    out.write("date,description,amount\n")
+    for i in range(rows):
+        day = 1 + i % 28
+        month = 1 + (i // 28) % 12
+        desc = rng.choice(DESCRIPTIONS)
+        amount = 50000 if desc == "Salary" else -round(rng.uniform(50, 5000), 2)
+        out.write(f"{year}-{month:02d}-{day:02d},{desc},{amount}\n")
+    return out.getvalue().encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    app = make_app()
+    payload = build_csv(args.rows)
+    client = app.test_client()
+
+    start = time.perf_counter()
+    res = client.post(
+        "/upload-csv",
+        data={"file": (io.BytesIO(payload), "bench.csv")},
+        headers=auth_headers(app),
+        content_type="multipart/form-data",
+    )
+    elapsed = time.perf_counter() - start
+
+    body = res.get_json()
+    print(f"status      {res.status_code}")
+    print(f"rows        {body.get('count')}")
+    print(f"elapsed     {elapsed:.2f}s")
+    print(f"throughput  {args.rows / elapsed:,.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    main()
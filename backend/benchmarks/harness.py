@@ -0,0 +1,66 @@
+"""
+Shared setup for the benchmark scripts: a throwaway SQLite database,
+an initialised app and auth headers. Never touches the real finance.db.
+"""
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def make_app(setup: bool = True, **config):
+    """
+    App on a throwaway database, with the schema and bench user 1 created.
+    setup=False attaches to an existing database as is (worker processes
+    sharing one created by the parent).
+    """
+    from app import create_app, init_db
+
+    tmpdir = tempfile.mkdtemp()
+    settings = {
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///" + os.path.join(tmpdir, "bench.db"),
+        "PASSWORD_HASH_WORKERS": 0,
+        "IMPORT_WORKERS": 0,
+        "IMPORT_SPOOL_DIR": os.path.join(tmpdir, "spool"),
+        # big seeding uploads would trip the slow-request log
+        "SLOW_REQUEST_MS": None,
+    }
+    settings.update(config)
+
+    app = create_app(settings)
+    if setup:
+        with app.app_context():
+            init_db()
+            add_bench_users(1)
+    return app
+
+
+def add_bench_users(count: int) -> None:
+    """
+    Users 1..count (bench@example.com, then bench-user{id}@example.com), so
+    per-user rows (data_version, forecasts) behave as in prod. Existing
+    ids are left alone.
+    """
+    from db import db
+    from models import User
+
+    existing = {user_id for (user_id,) in db.session.query(User.id)}
+    for user_id in range(1, count + 1):
+        if user_id in existing:
+            continue
+        email = f"bench-user{user_id}@example.com"
+        user = User(id=user_id, email="bench@example.com" if user_id == 1 else email)
+        user.set_password("bench")
+        db.session.add(user)
+    db.session.commit()
+
+
+def auth_headers(app, user_id: int = 1) -> dict:
+    from app import generate_token
+
+    with app.app_context():
+        token = generate_token(user_id)
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,432 @@
+"""
+Endpoint benchmark suite.
+
+Usage (from backend/):
+    python benchmarks/suite.py --target client --users 200 --rows 1000
+    python benchmarks/suite.py --target gunicorn --workers 4 --concurrency 16 \\
+        --output results.json --compare previous.json
+
+Seeds a throwaway SQLite database with benchmarks/synth.py, then hits
+every endpoint, rotating through the users so caches behave as with
+real traffic. --target client drives the Flask test client in-process;
+--target gunicorn starts `gunicorn wsgi:app` on the same database and
+sends real HTTP requests from --concurrency threads.
+
+Results (requests, errors, throughput, mean/p50/p95/p99 latency per
+endpoint, plus run metadata) are written as JSON to --output. With
+--compare, p50/p99 and throughput changes against an earlier file are
+printed.
+"""
+import argparse
+import http.client
+import io
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from harness import BACKEND_DIR, make_app
+from synth import seed_database, to_csv, user_rows
+
+JWT_SECRET = "bench-secret-of-at-least-thirty-two-bytes"
+PASSWORD = "bench"
+
+CHAT_QUESTIONS = [
+    "How much did I spend on Food & Dining?",
+    "How much did I spend on transport from March to June 2024?",
+    "What is my total income?",
+    "What are my savings?",
+]
+SEARCH_TERMS = ["zomato", "uber", "swiggy bangalore", "pharm*", "lottery"]
+
+
+def scenarios(user_ids):
+    """(name, method, path, body) factories; i picks the user."""
+
+    def user(i):
+        return user_ids[i % len(user_ids)]
+
+    return [
+        ("health", lambda i: ("GET", "/health", None, None)),
+        ("login", lambda i: (
+            "POST", "/api/auth/login",
+            {"email": f"bench{i % len(user_ids)}@example.com", "password": PASSWORD}, None,
+        )),
+        ("profile", lambda i: ("GET", "/api/profile", None, user(i))),
+        ("transactions page", lambda i: ("GET", "/api/transactions?limit=200", None, user(i))),
+        ("transactions month", lambda i: (
+            "GET", f"/api/transactions?limit=200&month={i % 12 + 1}&year=2024", None, user(i),
+        )),
+        ("transactions ndjson", lambda i: (
+            "GET", "/api/transactions?format=ndjson", None, user(i),
+        )),
+        ("search", lambda i: (
+            "GET", f"/api/transactions/search?q={SEARCH_TERMS[i % len(SEARCH_TERMS)]}",
+            None, user(i),
+        )),
+        ("export csv", lambda i: ("GET", "/api/export?format=csv", None, user(i))),
+        ("summary", lambda i: ("GET", "/api/summary/categories", None, user(i))),
+        ("summary month", lambda i: (
+            "GET", f"/api/summary/categories?month={i % 12 + 1}&year=2024", None, user(i),
+        )),
+        ("forecast", lambda i: ("GET", "/api/forecast", None, user(i))),
+        ("insights", lambda i: ("GET", "/api/insights", None, user(i))),
+        ("goals", lambda i: ("GET", "/api/goals", None, user(i))),
+        ("dashboard", lambda i: (
+            "GET", f"/api/dashboard?limit=200&month={i % 12 + 1}&year=2024", None, user(i),
+        )),
+        ("goals progress", lambda i: (
+            "GET", f"/api/goals/progress?month={i % 12 + 1}&year=2024", None, user(i),
+        )),
+        ("chat", lambda i: (
+            "POST", "/api/chat", {"question": CHAT_QUESTIONS[i % len(CHAT_QUESTIONS)]},
+            user(i),
+        )),
+        ("goal update", lambda i: (
+            "POST", "/api/goals", {"category": "Shopping", "monthly_limit": 10000 + i},
+            user(i),
+        )),
+    ]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(latencies, errors, elapsed):
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "mean_ms": round(statistics.mean(latencies), 3),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+    }
+
+
+# -------------------------------------------------
+# Targets
+# -------------------------------------------------
+
+class ClientTarget:
+    """Flask test client, in-process and sequential."""
+
+    concurrency = 1
+
+    def __init__(self, app, tokens):
+        self.client = app.test_client()
+        self.tokens = tokens
+
+    def request(self, method, path, body, user_id):
+        headers = {}
+        if user_id is not None:
+            headers["Authorization"] = f"Bearer {self.tokens[user_id]}"
+        res = self.client.open(path, method=method, json=body, headers=headers)
+        res.get_data()
+        return res.status_code
+
+    def upload(self, payload, user_id):
+        res = self.client.post(
+            "/upload-csv",
+            data={"file": (io.BytesIO(payload), "bench.csv")},
+            headers={"Authorization": f"Bearer {self.tokens[user_id]}"},
+            content_type="multipart/form-data",
+        )
+        return res.status_code, (res.get_json() or {}).get("id")
+
+    def close(self):
+        pass
+
+
+class GunicornTarget:
+    """A live `gunicorn wsgi:app` on a free local port."""
+
+    def __init__(self, database_uri, tokens, workers, concurrency):
+        self.tokens = tokens
+        self.concurrency = concurrency
+        self.port = self._free_port()
+
+        env = dict(
+            os.environ,
+            DATABASE_URL=database_uri,
+            JWT_SECRET=JWT_SECRET,
+            IMPORT_WORKERS="0",
+        )
+        self.process = subprocess.Popen(
+            [
+                sys.executable, "-m", "gunicorn",
+                "-w", str(workers),
+                "--threads", "2",
+                "-b", f"127.0.0.1:{self.port}",
+                "--log-level", "warning",
+                "wsgi:app",
+            ],
+            cwd=BACKEND_DIR,
+            env=env,
+        )
+        self._wait_ready()
+
+    @staticmethod
+    def _free_port():
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            return s.getsockname()[1]
+
+    def _wait_ready(self, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError("gunicorn exited during startup")
+            try:
+                if self.request("GET", "/health", None, None) == 200:
+                    return
+            except OSError:
+                time.sleep(0.2)
+        raise RuntimeError("gunicorn did not become ready")
+
+    def _send(self, method, path, payload, headers):
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=60)
+        try:
+            conn.request(method, path, body=payload, headers=headers)
+            res = conn.getresponse()
+            return res.status, res.read()
+        finally:
+            conn.close()
+
+    def request(self, method, path, body, user_id):
+        headers = {"Accept-Encoding": "gzip"}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        if user_id is not None:
+            headers["Authorization"] = f"Bearer {self.tokens[user_id]}"
+        return self._send(method, path, payload, headers)[0]
+
+    def upload(self, payload, user_id):
+        boundary = "benchboundary"
+        body = (
+            f"--{boundary}\r\n"
+            'Content-Disposition: form-data; name="file"; filename="bench.csv"\r\n'
+            "Content-Type: text/csv\r\n\r\n"
+        ).encode() + payload + f"\r\n--{boundary}--\r\n".encode()
+        headers = {
+            "Authorization": f"Bearer {self.tokens[user_id]}",
+            "Content-Type": f"multipart/form-data; boundary={boundary}",
+        }
+        status, data = self._send("POST", "/upload-csv", body, headers)
+        return status, json.loads(data).get("id")
+
+    def close(self):
+        self.process.terminate()
+        self.process.wait(timeout=30)
+
+
+# -------------------------------------------------
+# Runner
+# -------------------------------------------------
+
+def run_scenario(target, make_request, requests):
+    def one(i):
+        method, path, body, user_id = make_request(i)
+        start = time.perf_counter()
+        status = target.request(method, path, body, user_id)
+        return (time.perf_counter() - start) * 1000, status >= 400
+
+    start = time.perf_counter()
+    if target.concurrency > 1:
+        with ThreadPoolExecutor(max_workers=target.concurrency) as pool:
+            results = list(pool.map(one, range(requests)))
+    else:
+        results = [one(i) for i in range(requests)]
+    elapsed = time.perf_counter() - start
+
+    latencies = [ms for ms, _ in results]
+    errors = sum(failed for _, failed in results)
+    return summarize(latencies, errors, elapsed)
+
+
+def run_upload(target, user_ids, uploads, rows):
+    """
+    Uploads fresh statements (new rows, not duplicates), sequentially.
+    Returns (summary, [(user_id, job_id)]).
+    """
+    latencies = []
+    errors = 0
+    jobs = []
+    start = time.perf_counter()
+    for i in range(uploads):
+        user_id = user_ids[i % len(user_ids)]
+        payload = to_csv(user_rows(10_000 + i, rows, seed=7))
+        t0 = time.perf_counter()
+        status, job_id = target.upload(payload, user_id)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        errors += status >= 400
+        if job_id is not None:
+            jobs.append((user_id, job_id))
+    elapsed = time.perf_counter() - start
+
+    result = summarize(latencies, errors, elapsed)
+    result["rows_per_upload"] = rows
+    return result, jobs
+
+
+def import_status_scenario(jobs):
+    def make_request(i):
+        user_id, job_id = jobs[i % len(jobs)]
+        return "GET", f"/api/imports/{job_id}", None, user_id
+
+    return make_request
+
+
+def run_reset(target, user_ids, requests):
+    """Resets the last few users; run last since it empties their data."""
+    victims = user_ids[-max(1, len(user_ids) // 10):]
+    return run_scenario(
+        target, lambda i: ("POST", "/api/reset", None, victims[i % len(victims)]), requests
+    )
+
+
+def compare(meta, current, previous_path):
+    with open(previous_path) as f:
+        previous_report = json.load(f)
+    previous = previous_report["results"]
+
+    keys = ("target", "workers", "concurrency", "users", "rows_per_user", "seed")
+    differing = [k for k in keys if previous_report["meta"].get(k) != meta.get(k)]
+    if differing:
+        print(f"\nnote: runs differ in {', '.join(differing)}; deltas are not like for like")
+
+    print(f"\n{'endpoint':<22} {'p50 ms':>16} {'p99 ms':>16} {'rps':>16}")
+    for name, now in current.items():
+        before = previous.get(name)
+        if not before:
+            continue
+
+        def delta(key):
+            if not before.get(key) or now.get(key) is None:
+                return "n/a"
+            return f"{now[key]:.1f} ({(now[key] / before[key] - 1):+.0%})"
+
+        print(
+            f"{name:<22} {delta('p50_ms'):>16} {delta('p99_ms'):>16} "
+            f"{delta('throughput_rps'):>16}"
+        )
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--target", choices=["client", "gunicorn"], default="client")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=1000, help="rows per user")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--requests", type=int, default=300, help="per endpoint")
+    parser.add_argument("--uploads", type=int, default=10)
+    parser.add_argument("--upload-rows", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn workers")
+    parser.add_argument("--concurrency", type=int, default=8, help="gunicorn clients")
+    parser.add_argument("--only", nargs="*", help="run only these scenarios")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="earlier results file")
+    args = parser.parse_args()
+
+    app = make_app(JWT_SECRET=JWT_SECRET, IMPORT_WORKERS=0)
+    from app import generate_token
+    from db import db
+
+    started = time.perf_counter()
+    with app.app_context():
+        # the harness's own user 1 stays empty; bench users follow it
+        user_ids = seed_database(args.users, args.rows, args.seed, PASSWORD)
+        tokens = {uid: generate_token(uid) for uid in user_ids}
+        db.engine.dispose()
+    seed_seconds = time.perf_counter() - started
+    print(f"seeded {args.users} users x {args.rows} rows in {seed_seconds:.1f}s")
+
+    if args.target == "gunicorn":
+        target = GunicornTarget(
+            app.config["SQLALCHEMY_DATABASE_URI"], tokens, args.workers, args.concurrency
+        )
+    else:
+        target = ClientTarget(app, tokens)
+
+    results = {}
+
+    def wanted(name):
+        return not args.only or name in args.only
+
+    def record(name, result):
+        results[name] = result
+        print(
+            f"{name:<22} {result['throughput_rps']:>9} rps  p50 {result['p50_ms']:8.2f}  "
+            f"p95 {result['p95_ms']:8.2f}  p99 {result['p99_ms']:8.2f} ms  "
+            f"errors {result['errors']}"
+        )
+
+    try:
+        for name, make_request in scenarios(user_ids):
+            if wanted(name):
+                # logins are password hashes; a few are enough
+                requests = min(args.requests, 50) if name == "login" else args.requests
+                record(name, run_scenario(target, make_request, requests))
+
+        if wanted("upload") or wanted("import status"):
+            result, jobs = run_upload(target, user_ids, args.uploads, args.upload_rows)
+            if wanted("upload"):
+                record("upload", result)
+            if wanted("import status") and jobs:
+                record(
+                    "import status",
+                    run_scenario(target, import_status_scenario(jobs), args.requests),
+                )
+
+        if wanted("reset"):
+            record("reset", run_reset(target, user_ids, min(args.requests, 50)))
+    finally:
+        target.close()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "target": args.target,
+            "workers": args.workers if args.target == "gunicorn" else None,
+            "concurrency": target.concurrency,
+            "users": args.users,
+            "rows_per_user": args.rows,
+            "seed": args.seed,
+            "requests_per_endpoint": args.requests,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nwrote {args.output}")
+
+    if args.compare:
+        compare(report["meta"], results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Seeded synthetic bank statements for benchmarks.
+
+Usage (from backend/):
+    python benchmarks/synth.py --users 1000 --rows 2000 --out /tmp/statements
+    python benchmarks/synth.py --users 2000 --rows 1000 --database sqlite:////tmp/bench.db
+
+Each user gets a plausible Indian bank statement: a monthly salary and
+rent, monthly utility bills, and day-to-day spending at a weighted mix of
+merchants, in the description formats banks export (UPI, POS, NEFT,
+NACH). The same seed always produces the same rows.
+
+With --out, writes one CSV per user. With --database, creates the schema
+and loads users, goals and transactions straight through ingest_csv.
+"""
+import argparse
+import io
+import os
+import random
+from datetime import date, timedelta
+
+# (merchant, weight, min amount, max amount, description formats)
+MERCHANTS = [
+    ("ZOMATO", 12, 120, 1200, ["UPI/{m}/{ref}/{bank}", "POS {card} {m} ONLINE"]),
+    ("SWIGGY", 12, 100, 1100, ["UPI/{m}/{ref}/{bank}", "POS {card} {m} BANGALORE"]),
+    ("Cafe Coffee Day", 5, 90, 600, ["POS {card} {m} {city}"]),
+    ("Local restaurant", 4, 250, 3000, ["POS {card} {m} {city}"]),
+    ("UBER", 8, 80, 900, ["UPI/{m}/{ref}/{bank}", "{m} *TRIP {ref}"]),
+    ("OLA", 6, 70, 800, ["UPI/{m}/{ref}/{bank}", "{m} CABS {ref}"]),
+    ("AMAZON", 7, 199, 8000, ["POS {card} {m} PAY INDIA", "UPI/{m}/{ref}/{bank}"]),
+    ("FLIPKART", 5, 249, 9000, ["POS {card} {m} INTERNET"]),
+    ("MYNTRA", 3, 399, 5000, ["POS {card} {m} DESIGNS"]),
+    ("BIGBASKET", 6, 300, 4000, ["UPI/{m}/{ref}/{bank}"]),
+    ("DMART", 5, 200, 6000, ["POS {card} {m} {city}"]),
+    ("APOLLO PHARMACY", 3, 80, 2500, ["POS {card} {m} {city}"]),
+    ("BOOKMYSHOW", 2, 150, 1500, ["UPI/{m}/{ref}/{bank}"]),
+    ("HP PETROL PUMP", 4, 500, 4000, ["POS {card} {m} {city}"]),
+    ("ATM WDL", 3, 500, 10000, ["{m} {card} {city}"]),
+]
+
+MONTHLY = [
+    # (description format, day of month, min amount, max amount, sign)
+    ("NEFT CR-{employer}-SALARY {month}", 1, 45000, 180000, 1),
+    ("IMPS-RENT-{landlord}", 3, 9000, 45000, -1),
+    ("NACH DR ELECTRICITY BILL {ref}", 8, 600, 4500, -1),
+    ("UPI/AIRTEL/INTERNET {ref}", 10, 499, 1499, -1),
+    ("NACH DR WATER BILL {ref}", 12, 150, 600, -1),
+    ("SOCIETY MAINTENANCE {month}", 5, 1500, 6000, -1),
+]
+
+BANKS = ["okicici", "ybl", "okhdfcbank", "paytm", "okaxis"]
+CITIES = ["BANGALORE", "MUMBAI", "PUNE", "DELHI", "HYDERABAD", "CHENNAI"]
+EMPLOYERS = ["ACME TECH", "INFOSYS", "TCS", "WIPRO", "FLIPKART INTERNET", "ZOHO"]
+LANDLORDS = ["R SHARMA", "K IYER", "P MEHTA", "S REDDY", "A KHAN"]
+
+GOALS = [("Food & Dining", 15000), ("Transport", 5000), ("Shopping", 12000)]
+
+START = date(2024, 1, 1)
+
+
+def user_rows(user_index: int, rows: int, seed: int = 42):
+    """
+    (date, description, amount) tuples for one user, in date order.
+    Monthly items are included in the row count.
+    """
+    rng = random.Random(seed * 1_000_003 + user_index)
+    employer = rng.choice(EMPLOYERS)
+    landlord = rng.choice(LANDLORDS)
+    card = f"{rng.randint(1000, 9999)}"
+    city = rng.choice(CITIES)
+    monthly_amounts = [round(rng.uniform(lo, hi), -1) for _, _, lo, hi, _ in MONTHLY]
+
+    weights = [w for _, w, _, _, _ in MERCHANTS]
+
+    # about 60 rows a month, so history length scales with rows
+    out = []
+    month = 0
+    while len(out) < rows:
+        first = date(START.year + (START.month - 1 + month) // 12,
+                     (START.month - 1 + month) % 12 + 1, 1)
+        label = first.strftime("%b%Y").upper()
+
+        for (fmt, dom, _, _, sign), amount in zip(MONTHLY, monthly_amounts):
+            description = fmt.format(
+                employer=employer,
+                landlord=landlord,
+                month=label,
+                ref=rng.randint(100000, 999999),
+            )
+            out.append((first.replace(day=dom), description, sign * amount))
+
+        for offset in range(28):
+            day = first + timedelta(days=offset)
+            for _ in range(rng.randint(0, 4)):
+                merchant, _, lo, hi, formats = rng.choices(MERCHANTS, weights)[0]
+                description = rng.choice(formats).format(
+                    m=merchant,
+                    ref=rng.randint(100000000, 999999999),
+                    bank=rng.choice(BANKS),
+                    card=card,
+                    city=city,
+                )
+                out.append((day, description, -round(rng.uniform(lo, hi), 2)))
+        month += 1
+
+    out.sort(key=lambda row: row[0])
+    return out[:rows]
+
+
+def to_csv(rows) -> bytes:
+    buffer = io.StringIO()
+    buffer.write("date,description,amount\n")
+    for day, description, amount in rows:
+        buffer.write(f"{day.isoformat()},{description},{amount}\n")
+    return buffer.getvalue().encode("utf-8")
+
+
+def seed_database(users: int, rows: int, seed: int = 42, password: str = "bench"):
+    """
+    Loads users (bench{i}@example.com / password), goals and transactions
+    into the app's database. Needs an app context. Returns the user ids.
+    """
+    from werkzeug.security import generate_password_hash
+
+    from cache import bump_data_version
+    from db import db
+    from ingest import ingest_csv
+    from models import Goal, User
+
+    # one hash for everyone: hashing thousands of passwords is not the point
+    password_hash = generate_password_hash(password)
+
+    user_ids = []
+    for i in range(users):
+        user = User(email=f"bench{i}@example.com", password_hash=password_hash)
+        db.session.add(user)
+        db.session.flush()
+        for category, limit in GOALS:
+            db.session.add(Goal(user_id=user.id, category=category, monthly_limit=limit))
+
+        text = io.StringIO(to_csv(user_rows(i, rows, seed)).decode("utf-8"))
+        ingest_csv(text, user.id)
+        bump_data_version(user.id)
+        db.session.commit()
+        user_ids.append(user.id)
+    return user_ids
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--rows", type=int, default=1000, help="rows per user")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="directory for one CSV per user")
+    parser.add_argument("--database", help="SQLAlchemy URL to create and load")
+    args = parser.parse_args()
+
+    if not (args.out or args.database):
+        parser.error("pass --out and/or --database")
+
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+        for i in range(args.users):
+            path = os.path.join(args.out, f"user{i:05d}.csv")
+            with open(path, "wb") as f:
+                f.write(to_csv(user_rows(i, args.rows, args.seed)))
+        print(f"Wrote {args.users} statements to {args.out}")
+
+    if args.database:
+        from harness import BACKEND_DIR  # noqa: F401  (puts backend/ on sys.path)
+        from app import create_app, init_db
+
+        app = create_app(
+            {"SQLALCHEMY_DATABASE_URI": args.database, "PASSWORD_HASH_WORKERS": 0}
+        )
+        with app.app_context():
+            init_db()
+            seed_database(args.users, args.rows, args.seed)
+        print(f"Loaded {args.users} users x {args.rows} rows into {args.database}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# backend/budgets.py
+"""
+Goal progress and budget alerts, computed from the monthly rollup.
+
+goal_progress() answers /api/goals/progress with one query: the user's
+goals LEFT JOINed to their month's rollup totals, with spent, remaining,
+percent used and the projected month-end spend computed in SQL.
+Totals are converted to the user's default currency (see fx.py), the
+currency goal limits are set in.
+
+evaluate_alerts() runs after each imported chunk (and on goal changes)
+and records every goal/month/threshold newly crossed, as one
+INSERT ... SELECT that ignores alerts already recorded.
+
+Every function takes whatever executes SQL (db.session or a Connection)
+so it runs inside the caller's transaction.
+"""
+import calendar
+from datetime import date
+
+from sqlalchemy import bindparam, case, delete, func, literal, select, text
+
+from fx import CONVERTED_VIEW, converted_totals
+from metrics import count_rows
+from models import BudgetAlert, Goal
+from normalize import MINOR_UNITS
+from rollup import year_month_of
+
+# Percent of monthly_limit at which an alert is recorded.
+ALERT_THRESHOLDS = (50, 80, 100)
+
+
+def projection_factor(year_month: str, today: date) -> float:
+    """
+    Month-end / to-date spend ratio for a straight-line projection:
+    days in month / days elapsed for the current month, 1 otherwise
+    (past months are complete, future months have no spend yet).
+    """
+    if year_month != year_month_of(today):
+        return 1.0
+    days = calendar.monthrange(today.year, today.month)[1]
+    return days / today.day
+
+
+def goal_progress_query(user_id: int, year_month: str, factor: float = 1.0):
+    """The goals x rollup join behind goal_progress()."""
+    view = converted_totals
+    rollup = (
+        select(view.c.category, func.round(func.total(view.c.total)).label("total_minor"))
+        .where(view.c.user_id == user_id, view.c.year_month == year_month)
+        .group_by(view.c.category)
+        .subquery("rollup")
+    )
+    total = func.coalesce(rollup.c.total_minor, 0)
+    spent_minor = case((total < 0, -total), else_=0)
+    spent = spent_minor / float(MINOR_UNITS)
+    limit = Goal.monthly_limit
+    projected = spent * literal(factor)
+
+    return (
+        select(
+            Goal.id,
+            Goal.category,
+            limit.label("monthly_limit"),
+            func.round(spent, 2).label("spent"),
+            func.round(limit - spent, 2).label("remaining"),
+            func.round(spent * 100 / limit, 1).label("percent_used"),
+            func.round(projected, 2).label("projected_spend"),
+            func.round(
+                case((projected > limit, projected - limit), else_=0), 2
+            ).label("projected_overrun"),
+            case(
+                (spent > limit, "Over limit"),
+                (projected > limit, "At risk"),
+                else_="OK",
+            ).label("status"),
+        )
+        .outerjoin(rollup, rollup.c.category == Goal.category)
+        .where(Goal.user_id == user_id)
+        .order_by(Goal.category)
+    )
+
+
+def goal_progress(executor, user_id: int, year_month: str, today: date = None) -> list:
+    factor = projection_factor(year_month, today or date.today())
+    stmt = goal_progress_query(user_id, year_month, factor)
+    return [dict(row._mapping) for row in executor.execute(stmt)]
+
+
+def month_alerts_query(user_id: int, year_month: str):
+    return (
+        BudgetAlert.api_select()
+        .where(BudgetAlert.user_id == user_id, BudgetAlert.year_month == year_month)
+        .order_by(BudgetAlert.category, BudgetAlert.threshold)
+    )
+
+
+def month_alerts(executor, user_id: int, year_month: str) -> list:
+    rows = executor.execute(month_alerts_query(user_id, year_month)).all()
+    count_rows(len(rows))
+    return [BudgetAlert.row_to_dict(row) for row in rows]
+
+
+def evaluate_alerts(executor, user_id=None, year_months=None, category=None) -> int:
+    """
+    Records thresholds crossed by the rollup, for one user or everyone,
+    optionally only for some months or one category. Returns the number
+    of new alerts.
+    """
+    thresholds = " UNION ALL ".join(
+        f"SELECT {int(t)} AS threshold" for t in ALERT_THRESHOLDS
+    )
+
+    where = ["g.monthly_limit > 0", "-r.total_minor >= g.monthly_limit * t.threshold"]
+    # filters on the converted totals, applied before they are summed
+    rollup_where = []
+    params = {}
+    if user_id is not None:
+        where.append("g.user_id = :user_id")
+        rollup_where.append("user_id = :user_id")
+        params["user_id"] = user_id
+    if category is not None:
+        where.append("g.category = :category")
+        rollup_where.append("category = :category")
+        params["category"] = category
+    if year_months is not None:
+        rollup_where.append("year_month IN :year_months")
+        params["year_months"] = list(year_months)
+    rollup_filter = f"WHERE {' AND '.join(rollup_where)}" if rollup_where else ""
+
+    # spent (minor) >= limit * threshold / 100 (major)  <=>  -total >= limit * threshold
+    stmt = text(
+        f"""
+        INSERT INTO budget_alerts
+            (user_id, year_month, category, threshold, spent_minor, monthly_limit)
+        SELECT g.user_id, r.year_month, g.category, t.threshold,
+               -r.total_minor, g.monthly_limit
+        FROM goals g
+        JOIN (
+            SELECT user_id, year_month, category,
+                   CAST(ROUND(total(total)) AS INTEGER) AS total_minor
+            FROM {CONVERTED_VIEW}
+            {rollup_filter}
+            GROUP BY user_id, year_month, category
+        ) r
+          ON r.user_id = g.user_id AND r.category = g.category
+        JOIN ({thresholds}) t
+        WHERE {" AND ".join(where)}
+        ON CONFLICT DO NOTHING
+        """
+    )
+    if year_months is not None:
+        stmt = stmt.bindparams(bindparam("year_months", expanding=True))
+
+    return executor.execute(stmt, params).rowcount
+
+
+def delete_alerts(executor, user_id: int, category=None) -> None:
+    stmt = delete(BudgetAlert).where(BudgetAlert.user_id == user_id)
+    if category is not None:
+        stmt = stmt.where(BudgetAlert.category == category)
+    executor.execute(stmt)
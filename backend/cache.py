@@ -0,0 +1,155 @@
+# backend/cache.py
+"""
+Per-user result cache for the read endpoints (summary, forecast, goals).
+
+Keys include the user's data_version (a counter on the users row bumped
+by every write: upload, reset, goal update), so a write makes all of the
+user's old entries unreachable and invalidation is exact. TTL and the
+size bound only limit memory.
+
+The default backend is an in-process LRU. Set RESULT_CACHE_BACKEND to a
+dotted path of a factory taking the app to share a cache across gunicorn
+workers; a backend needs get(key), set(key, value), delete(key), clear()
+and stats().
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, g, has_request_context
+from sqlalchemy import select, update
+from werkzeug.utils import import_string
+
+from db import db
+from models import User
+
+DEFAULT_CACHE_SIZE = 2048
+DEFAULT_CACHE_TTL = 300  # seconds
+
+
+class LocalLRUCache:
+    """Thread-safe LRU with per-entry TTL. get() returns None on a miss."""
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE, ttl: float = DEFAULT_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = item
+            if expires_at <= now:
+                del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None) -> None:
+        if self.maxsize <= 0:
+            return
+
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+
+def init_cache(app) -> None:
+    app.config.setdefault("RESULT_CACHE_BACKEND", None)
+    app.config.setdefault("RESULT_CACHE_SIZE", DEFAULT_CACHE_SIZE)
+    app.config.setdefault("RESULT_CACHE_TTL", DEFAULT_CACHE_TTL)
+
+    backend = app.config["RESULT_CACHE_BACKEND"]
+    if backend:
+        cache = import_string(backend)(app)
+    else:
+        cache = LocalLRUCache(
+            maxsize=int(app.config["RESULT_CACHE_SIZE"]),
+            ttl=float(app.config["RESULT_CACHE_TTL"]),
+        )
+
+    app.extensions["result_cache"] = cache
+
+
+def get_cache():
+    return current_app.extensions["result_cache"]
+
+
+# -------------------------------------------------
+# Per-user data version
+# -------------------------------------------------
+
+def get_data_version(user_id: int) -> int:
+    """
+    The user's current data_version. Read once per request: the ETag
+    check, the result cache and the analytics frames share the lookup.
+    """
+    versions = g.setdefault("data_versions", {}) if has_request_context() else {}
+    version = versions.get(user_id)
+    if version is None:
+        version = db.session.execute(
+            select(User.data_version).where(User.id == user_id)
+        ).scalar() or 0
+        versions[user_id] = version
+    return version
+
+
+def bump_data_version(user_id: int) -> None:
+    """
+    Call inside the writing transaction, before commit, so the new
+    version becomes visible together with the new data.
+    """
+    if has_request_context():
+        g.setdefault("data_versions", {}).pop(user_id, None)
+    db.session.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(data_version=User.data_version + 1)
+    )
+
+
+def cached_result(endpoint: str, user_id: int, compute, month=None, year=None):
+    """
+    Returns compute() for (user, endpoint, month, year), reusing the
+    cached value while the user's data_version is unchanged.
+    """
+    version = get_data_version(user_id)
+    key = f"{user_id}:{endpoint}:{month or ''}:{year or ''}:{version}"
+
+    cache = get_cache()
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value)
+    return value
@@ -0,0 +1,116 @@
+# backend/categorizer.py
+import json
+import os
+import re
+from functools import lru_cache
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RULES_PATH = os.path.join(BASE_DIR, "data", "category_rules.json")
+
+# Distinct descriptions remembered per rule set. Real statements repeat
+# the same few hundred merchant strings over and over.
+MEMO_SIZE = 8192
+
+
+class CategoryRules:
+    """
+    Keyword -> category table compiled into a single regex.
+
+    Rules are checked in order and the first rule with a keyword anywhere
+    in the (lowercased) description wins, exactly like the old if-chain.
+    Keywords are tried as lookaheads at every position, ordered by rule,
+    so one scan finds the best rule even when keywords overlap.
+    """
+
+    def __init__(self, rules, positive_default="Income", default="Other"):
+        self.positive_default = positive_default
+        self.default = default
+
+        self._categories = []
+        self._rank_by_keyword = {}
+        for rank, rule in enumerate(rules):
+            self._categories.append(rule["category"])
+            for keyword in rule["keywords"]:
+                self._rank_by_keyword.setdefault(keyword.lower(), rank)
+
+        keywords = sorted(self._rank_by_keyword, key=self._rank_by_keyword.get)
+        if keywords:
+            alternation = "|".join(re.escape(k) for k in keywords)
+            self._pattern = re.compile(f"(?=({alternation}))")
+        else:
+            self._pattern = None
+
+        self._match = lru_cache(maxsize=MEMO_SIZE)(self._match_uncached)
+
+    @property
+    def categories(self) -> list:
+        """Every category this rule set can produce, in precedence order."""
+        names = list(dict.fromkeys(self._categories))
+        for name in (self.positive_default, self.default):
+            if name not in names:
+                names.append(name)
+        return names
+
+    @classmethod
+    def from_file(cls, path: str = RULES_PATH) -> "CategoryRules":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(
+            data.get("rules", []),
+            positive_default=data.get("positive_default", "Income"),
+            default=data.get("default", "Other"),
+        )
+
+    def _match_uncached(self, description: str):
+        """Category from keywords alone, or None when nothing matches."""
+        if self._pattern is None:
+            return None
+
+        best = None
+        for m in self._pattern.finditer(description.lower()):
+            rank = self._rank_by_keyword[m.group(1)]
+            if best is None or rank < best:
+                best = rank
+                if rank == 0:
+                    break
+
+        return None if best is None else self._categories[best]
+
+    def categorize(self, description: str, amount: float) -> str:
+        category = self._match(description or "")
+        if category is not None:
+            return category
+        return self.positive_default if amount > 0 else self.default
+
+    def categorize_many(self, descriptions, amounts) -> list:
+        """Categorizes a whole column of descriptions in one call."""
+        match = self._match
+        positive_default = self.positive_default
+        default = self.default
+
+        result = []
+        for description, amount in zip(descriptions, amounts):
+            category = match(description or "")
+            if category is None:
+                category = positive_default if amount > 0 else default
+            result.append(category)
+        return result
+
+
+_default_rules = None
+
+
+def get_rules() -> CategoryRules:
+    """Rule set loaded from data/category_rules.json (once per process)."""
+    global _default_rules
+    if _default_rules is None:
+        _default_rules = CategoryRules.from_file()
+    return _default_rules
+
+
+def categorize_transaction(description: str, amount: float) -> str:
+    return get_rules().categorize(description, amount)
+
+
+def categorize_many(descriptions, amounts) -> list:
+    return get_rules().categorize_many(descriptions, amounts)
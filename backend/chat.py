@@ -0,0 +1,276 @@
+# backend/chat.py
+"""
+Rule-based finance assistant behind /api/chat.
+
+A question is parsed up front (intent, category, optional month or
+month range) without touching the database. Then a single aggregate
+query, restricted to the requested period, feeds every intent; the
+saving intent also reads the next-month forecast. Amounts are in the
+user's default currency, converted inside that query (see fx.py), which
+also returns the currency itself.
+"""
+import re
+from datetime import date
+from functools import lru_cache
+
+from sqlalchemy import select, true
+
+from categorizer import get_rules
+from db import db
+from forecasting import get_forecast
+from models import User
+from normalize import DEFAULT_CURRENCY, minor_to_amount
+from rollup import category_totals_select
+
+# Checked in this order; the first intent found anywhere in the question wins.
+INTENTS = [
+    ("spend", r"spen(?:d|t|ding) on"),
+    ("income", r"total income|how much did i earn"),
+    ("expense", r"total expense|how much did i spend in total"),
+    ("saving", r"saving"),
+]
+
+_INTENT_RE = re.compile(
+    "(?=" + "|".join(f"(?P<{name}>{pattern})" for name, pattern in INTENTS) + ")"
+)
+_INTENT_RANK = {name: rank for rank, (name, _) in enumerate(INTENTS)}
+
+MONTH_NAMES = [
+    "january", "february", "march", "april", "may", "june",
+    "july", "august", "september", "october", "november", "december",
+]
+_MONTH_BY_PREFIX = {name[:3]: i for i, name in enumerate(MONTH_NAMES, start=1)}
+
+# A month name needs a leading preposition so "may I ..." is not read as May.
+_PERIOD_RE = re.compile(
+    r"\b(?P<rel>this|last|previous)\s+month\b"
+    r"|\b(?:in|for|during|of|from|to|since|until|till|between|and)\s+"
+    r"(?:"
+    r"(?P<iso_y>\d{4})-(?P<iso_m>\d{1,2})\b"
+    r"|(?P<mon>jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)"
+    r"(?:uary|ruary|ch|il|e|y|ust|t|tember|ober|ember)?\b\.?"
+    r"(?:\s+(?P<year>\d{4}))?"
+    r")"
+)
+
+_STOP_WORDS = {"and", "the", "for", "other"}
+
+# Other currencies are written as their code, "AED 12.50".
+CURRENCY_SYMBOLS = {"INR": "₹", "USD": "$", "EUR": "€", "GBP": "£"}
+
+
+def format_amount(amount: float, currency: str) -> str:
+    symbol = CURRENCY_SYMBOLS.get(currency)
+    if symbol is None:
+        return f"{currency} {amount:.2f}"
+    return f"{symbol}{amount:.2f}"
+
+
+def detect_intent(q: str):
+    best = None
+    for m in _INTENT_RE.finditer(q):
+        name = m.lastgroup
+        if best is None or _INTENT_RANK[name] < _INTENT_RANK[best]:
+            best = name
+    return best
+
+
+def _shift_month(year: int, month: int, delta: int):
+    index = year * 12 + (month - 1) + delta
+    return index // 12, index % 12 + 1
+
+
+def parse_period(q: str, today: date = None):
+    """
+    Returns (start, end) as "YYYY-MM" strings, or None for all history.
+    One month mention -> that month; two or more -> the span between them.
+    A month without a year takes the year of a later mention, otherwise
+    its most recent occurrence.
+    """
+    today = today or date.today()
+
+    mentions = []  # [month, year or None]
+    for m in _PERIOD_RE.finditer(q):
+        if m.group("iso_y"):
+            month = int(m.group("iso_m"))
+            if 1 <= month <= 12:
+                mentions.append([month, int(m.group("iso_y"))])
+        elif m.group("rel"):
+            delta = 0 if m.group("rel") == "this" else -1
+            year, month = _shift_month(today.year, today.month, delta)
+            mentions.append([month, year])
+        else:
+            year = m.group("year")
+            mentions.append([_MONTH_BY_PREFIX[m.group("mon")], int(year) if year else None])
+
+    if not mentions:
+        return None
+
+    next_year = None
+    for mention in reversed(mentions):
+        if mention[1] is None:
+            mention[1] = next_year
+        else:
+            next_year = mention[1]
+
+    for mention in mentions:
+        if mention[1] is None:
+            mention[1] = today.year if mention[0] <= today.month else today.year - 1
+
+    first, last = mentions[0], mentions[-1]
+    if len(mentions) > 1 and (first[1], first[0]) > (last[1], last[0]):
+        first[1] -= 1
+
+    start = f"{first[1]:04d}-{first[0]:02d}"
+    end = f"{last[1]:04d}-{last[0]:02d}"
+    return (start, end) if start <= end else (end, start)
+
+
+def period_label(period) -> str:
+    if period is None:
+        return "in the current data"
+
+    def label(key):
+        year, month = key.split("-")
+        return f"{MONTH_NAMES[int(month) - 1].capitalize()} {year}"
+
+    start, end = period
+    if start == end:
+        return f"in {label(start)}"
+    return f"from {label(start)} to {label(end)}"
+
+
+@lru_cache(maxsize=256)
+def _category_matcher(categories: tuple):
+    """
+    Regex over category names plus their individual words ("food" ->
+    Food & Dining). Full names are tried before single words.
+    """
+    aliases = {}
+    for category in categories:
+        name = category.lower()
+        aliases.setdefault(name, category)
+        for word in re.findall(r"[a-z]+", name):
+            if len(word) >= 3 and word not in _STOP_WORDS:
+                aliases.setdefault(word, category)
+
+    if not aliases:
+        return None, aliases
+
+    ordered = sorted(aliases, key=len, reverse=True)
+    pattern = re.compile(r"\b(?:" + "|".join(re.escape(a) for a in ordered) + r")\b")
+    return pattern, aliases
+
+
+def detect_category(q: str, categories):
+    pattern, aliases = _category_matcher(tuple(categories))
+    if pattern is None:
+        return None
+
+    m = pattern.search(q)
+    return aliases[m.group(0)] if m else None
+
+
+class AggregateSnapshot:
+    """
+    Category totals for one chat turn, with the user's currency. The
+    aggregate query runs lazily and at most once, and every intent reads
+    from the same result.
+    """
+
+    def __init__(self, user_id: int, period=None):
+        self.user_id = user_id
+        self.period = period
+        self._totals = None
+        self._currency = None
+
+    def _load(self) -> None:
+        start, end = self.period or (None, None)
+        totals = category_totals_select(self.user_id, start, end).subquery()
+        # outer join so a user without data still gets one row
+        rows = db.session.execute(
+            select(User.default_currency, totals.c.category, totals.c.total_minor)
+            .outerjoin(totals, true())
+            .where(User.id == self.user_id)
+        ).all()
+        self._currency = (rows[0].default_currency if rows else None) or DEFAULT_CURRENCY
+        self._totals = {
+            row.category: minor_to_amount(row.total_minor)
+            for row in rows
+            if row.category is not None
+        }
+
+    @property
+    def currency(self) -> str:
+        """The user's default currency, which every total is in."""
+        if self._currency is None:
+            self._load()
+        return self._currency
+
+    @property
+    def totals(self) -> dict:
+        if self._totals is None:
+            self._load()
+        return self._totals
+
+    @property
+    def income(self) -> float:
+        return sum(t for t in self.totals.values() if t > 0)
+
+    @property
+    def expense(self) -> float:
+        return sum(abs(t) for t in self.totals.values() if t < 0)
+
+    @property
+    def saving(self) -> float:
+        return round(self.income - self.expense, 2)
+
+
+def answer_question(user_id: int, question: str, today: date = None) -> str:
+    q = question.lower()
+
+    intent = detect_intent(q)
+    period = parse_period(q, today)
+    snapshot = AggregateSnapshot(user_id, period)
+    when = period_label(period)
+
+    def money(amount: float) -> str:
+        return format_amount(amount, snapshot.currency)
+
+    if intent == "spend":
+        vocabulary = list(get_rules().categories)
+        vocabulary += [c for c in snapshot.totals if c not in vocabulary]
+        category = detect_category(q, vocabulary)
+
+        if category is None:
+            return (
+                "I couldn't detect the category. "
+                "Try like: 'How much did I spend on Food & Dining?'"
+            )
+
+        total = snapshot.totals.get(category, 0.0)
+        spent = abs(total) if total < 0 else 0
+        return f"You spent {money(spent)} on {category} {when}."
+
+    if intent == "income":
+        return f"Your total income {when} is {money(snapshot.income)}."
+
+    if intent == "expense":
+        return f"Your total expense {when} is {money(snapshot.expense)}."
+
+    if intent == "saving":
+        current_saving = snapshot.saving
+        basis = period[1] if period else None
+        forecast_saving = get_forecast(user_id, basis)["totals"]["forecast_saving"]
+        saving_label = "current saving" if period is None else f"saving {when}"
+        return (
+            f"Your {saving_label} is {money(current_saving)}. "
+            "Based on your monthly history, next month saving is estimated at "
+            f"{money(forecast_saving)}."
+        )
+
+    return (
+        "I can answer things like: 'How much did I spend on Food & Dining?', "
+        "'What is my total income?', 'What is my total expense?', "
+        "'What are my savings?', or 'How much did I spend on food in October?'."
+    )
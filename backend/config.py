@@ -0,0 +1,80 @@
+# backend/config.py
+import os
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _optional_float(value):
+    """A number, or None for an empty / "off" setting."""
+    if value is None or value.strip().lower() in ("", "off", "none"):
+        return None
+    return float(value)
+
+
+def load_config() -> dict:
+    """
+    App settings from the environment. Called by create_app() after .env
+    has been loaded, never at import time.
+    """
+    password_hash_workers = int(
+        os.environ.get("PASSWORD_HASH_WORKERS", max(1, (os.cpu_count() or 2) // 2))
+    )
+
+    return {
+        "SQLALCHEMY_DATABASE_URI": os.environ.get(
+            "DATABASE_URL", "sqlite:///" + os.path.join(BASE_DIR, "finance.db")
+        ),
+        "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+        # connection pool (see db.engine_options)
+        "DB_POOL_SIZE": int(os.environ.get("DB_POOL_SIZE", 5)),
+        "DB_MAX_OVERFLOW": int(os.environ.get("DB_MAX_OVERFLOW", 10)),
+        "DB_POOL_TIMEOUT": float(os.environ.get("DB_POOL_TIMEOUT", 30)),
+        "DB_POOL_RECYCLE": int(os.environ.get("DB_POOL_RECYCLE", 3600)),
+        # SQLite concurrency profile (see db.install_sqlite_pragmas)
+        "SQLITE_JOURNAL_MODE": os.environ.get("SQLITE_JOURNAL_MODE", "WAL"),
+        "SQLITE_BUSY_TIMEOUT_MS": int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", 5000)),
+        "SQLITE_SYNCHRONOUS": os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+        "SQLITE_MMAP_SIZE": int(os.environ.get("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)),
+        # negative = KiB, so -65536 is a 64 MiB page cache per connection
+        "SQLITE_CACHE_SIZE": int(os.environ.get("SQLITE_CACHE_SIZE", -65536)),
+        # auth
+        "JWT_SECRET": os.environ.get("JWT_SECRET", "dev_secret_change_me"),
+        "TOKEN_EXP_HOURS": int(os.environ.get("TOKEN_EXP_HOURS", 12)),
+        "TOKEN_CACHE_SIZE": int(os.environ.get("TOKEN_CACHE_SIZE", 4096)),
+        # password hashing (see passwords.py)
+        "PASSWORD_HASH_METHOD": os.environ.get(
+            "PASSWORD_HASH_METHOD", "scrypt:32768:8:1"
+        ),
+        "PASSWORD_HASH_WORKERS": password_hash_workers,
+        "PASSWORD_HASH_QUEUE": int(
+            os.environ.get("PASSWORD_HASH_QUEUE", password_hash_workers * 4)
+        ),
+        # per-user result cache (see cache.py)
+        "RESULT_CACHE_BACKEND": os.environ.get("RESULT_CACHE_BACKEND"),
+        "RESULT_CACHE_SIZE": int(os.environ.get("RESULT_CACHE_SIZE", 2048)),
+        "RESULT_CACHE_TTL": float(os.environ.get("RESULT_CACHE_TTL", 300)),
+        # background CSV imports (see imports.py)
+        "IMPORT_WORKERS": int(os.environ.get("IMPORT_WORKERS", 2)),
+        "IMPORT_SPOOL_DIR": os.environ.get(
+            "IMPORT_SPOOL_DIR", os.path.join(BASE_DIR, "import_spool")
+        ),
+        "IMPORT_STALE_SECONDS": float(os.environ.get("IMPORT_STALE_SECONDS", 60)),
+        "IMPORT_MAX_ATTEMPTS": int(os.environ.get("IMPORT_MAX_ATTEMPTS", 5)),
+        # response compression (see http_cache.py)
+        "COMPRESS_MIN_SIZE": int(os.environ.get("COMPRESS_MIN_SIZE", 1024)),
+        "COMPRESS_LEVEL": int(os.environ.get("COMPRESS_LEVEL", 6)),
+        "COMPRESS_BR_QUALITY": int(os.environ.get("COMPRESS_BR_QUALITY", 4)),
+        # per-user pandas frames (see analytics.py)
+        "ANALYTICS_FRAME_CACHE_SIZE": int(
+            os.environ.get("ANALYTICS_FRAME_CACHE_SIZE", 256)
+        ),
+        # exchange rates (see fx.py)
+        "FX_RATES_PATH": os.environ.get(
+            "FX_RATES_PATH", os.path.join(BASE_DIR, "data", "fx_rates.csv")
+        ),
+        # /metrics and the slow-query log (see metrics.py)
+        "METRICS_ENABLED": os.environ.get("METRICS_ENABLED", "1") != "0",
+        "METRICS_TOKEN": os.environ.get("METRICS_TOKEN") or None,
+        "SLOW_QUERY_MS": _optional_float(os.environ.get("SLOW_QUERY_MS", "200")),
+        "SLOW_REQUEST_MS": _optional_float(os.environ.get("SLOW_REQUEST_MS", "1000")),
+    }
@@ -0,0 +1,130 @@
+# backend/dashboard.py
+"""
+The aggregates behind /api/dashboard, read with one statement.
+
+The summary, goals and forecast sections all derive from the user's
+converted monthly totals, so a cold dashboard load reads them once:
+
+    monthly   analytics.monthly_select(), the whole history by month and
+              category; the summary (and the forecast, if none is
+              stored) is computed from it in memory, and it seeds the
+              frame cache for later requests
+    goals     budgets.goal_progress_query() for the goals month
+    alerts    budgets.month_alerts_query() for the goals month
+    forecast  forecasting.stored_forecast_query() for the forecast basis
+
+Each part is folded into a JSON array by json_group_array(), so the
+four come back as one row of a single SELECT. Together with the
+transactions page that is two queries per load, whichever sections miss
+the result cache.
+"""
+import json
+from datetime import date
+from types import SimpleNamespace
+
+from sqlalchemy import func, select
+
+import forecasting
+from analytics import get_user_analytics, monthly_select
+from budgets import goal_progress_query, month_alerts_query, projection_factor
+from db import db
+from metrics import count_rows
+from models import BudgetAlert, Forecast
+
+
+def _json_rows(query):
+    """Scalar subquery: the query's rows as a JSON array of arrays."""
+    rows = query.subquery()
+    return select(func.json_group_array(func.json_array(*rows.c))).scalar_subquery()
+
+
+def _stored_forecast_query(user_id: int, forecast_basis):
+    return forecasting.stored_forecast_query(
+        user_id, forecast_basis or forecasting.LATEST
+    ).where(Forecast.category.is_not(None))
+
+
+def dashboard_select(
+    user_id: int, goals_month: str, factor: float = 1.0, forecast_basis=None
+):
+    """One row: monthly, goals, alerts and forecast as JSON arrays of rows."""
+    return select(
+        _json_rows(monthly_select(user_id)).label("monthly"),
+        _json_rows(goal_progress_query(user_id, goals_month, factor)).label("goals"),
+        _json_rows(month_alerts_query(user_id, goals_month)).label("alerts"),
+        _json_rows(_stored_forecast_query(user_id, forecast_basis)).label("forecast"),
+    )
+
+
+class DashboardAggregates:
+    """
+    Data for the dashboard's aggregate sections. The query runs lazily
+    and at most once, so sections served from the result cache cost
+    nothing.
+    """
+
+    def __init__(
+        self,
+        user_id: int,
+        goals_month: str,
+        version: int,
+        today: date = None,
+        forecast_basis: str = None,
+    ):
+        self.user_id = user_id
+        self.goals_month = goals_month
+        self.version = version
+        self.today = today or date.today()
+        self.forecast_basis = forecast_basis
+        self._loaded = None
+
+    def _load(self):
+        if self._loaded is None:
+            factor = projection_factor(self.goals_month, self.today)
+            row = db.session.execute(
+                dashboard_select(
+                    self.user_id, self.goals_month, factor, self.forecast_basis
+                )
+            ).one()
+
+            keys = goal_progress_query(self.user_id, self.goals_month).selected_columns.keys()
+            goals = [dict(zip(keys, values)) for values in json.loads(row.goals)]
+            alerts = [BudgetAlert.row_to_dict(values) for values in json.loads(row.alerts)]
+            count_rows(len(alerts))
+            # the order of json_group_array's input is not guaranteed
+            goals.sort(key=lambda goal: goal["category"])
+            alerts.sort(key=lambda alert: (alert["category"], alert["threshold"]))
+
+            keys = _stored_forecast_query(self.user_id, None).selected_columns.keys()
+            stored = forecasting.stored_payload(
+                SimpleNamespace(**dict(zip(keys, values)))
+                for values in json.loads(row.forecast)
+            )
+
+            analytics = get_user_analytics(
+                self.user_id, self.version, json.loads(row.monthly)
+            )
+            self._loaded = (analytics, goals, alerts, stored)
+        return self._loaded
+
+    @property
+    def analytics(self):
+        """The user's UserAnalytics, with the monthly frame already loaded."""
+        return self._load()[0]
+
+    @property
+    def goals_progress(self) -> dict:
+        """/api/goals/progress's response for goals_month."""
+        _analytics, goals, alerts, _stored = self._load()
+        return {"month": self.goals_month, "goals": goals, "alerts": alerts}
+
+    @property
+    def forecast(self) -> dict:
+        """
+        /api/forecast's response for forecast_basis: the stored forecast,
+        else one computed in memory from the monthly totals (not stored).
+        """
+        analytics, _goals, _alerts, stored = self._load()
+        if stored is not None:
+            return stored
+        return forecasting.compute_forecast(analytics, self.forecast_basis)
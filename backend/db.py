@@ -1,4 +1,66 @@
 # backend/db.py
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
 
 db = SQLAlchemy()
+
+
+def _is_sqlite(uri: str) -> bool:
+    return uri.startswith("sqlite")
+
+
+def _is_memory_sqlite(uri: str) -> bool:
+    return uri in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in uri
+
+
+def engine_options(config) -> dict:
+    """
+    SQLALCHEMY_ENGINE_OPTIONS for the configured database: explicit pool
+    sizing, plus the driver-level lock timeout for SQLite files.
+    """
+    uri = config["SQLALCHEMY_DATABASE_URI"]
+    if _is_memory_sqlite(uri):
+        return {}
+
+    options = {
+        "pool_size": int(config["DB_POOL_SIZE"]),
+        "max_overflow": int(config["DB_MAX_OVERFLOW"]),
+        "pool_timeout": float(config["DB_POOL_TIMEOUT"]),
+        "pool_recycle": int(config["DB_POOL_RECYCLE"]),
+    }
+    if _is_sqlite(uri):
+        options["connect_args"] = {
+            "timeout": int(config["SQLITE_BUSY_TIMEOUT_MS"]) / 1000,
+        }
+    return options
+
+
+def install_sqlite_pragmas(engine, config) -> None:
+    """
+    Sets the SQLite concurrency profile on every new pooled connection:
+    WAL lets dashboard reads proceed during a long upload commit,
+    busy_timeout makes writers wait instead of failing with
+    "database is locked". A setting of None leaves SQLite's default.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    pragmas = [
+        ("journal_mode", config.get("SQLITE_JOURNAL_MODE")),
+        ("busy_timeout", config.get("SQLITE_BUSY_TIMEOUT_MS")),
+        ("synchronous", config.get("SQLITE_SYNCHRONOUS")),
+        ("mmap_size", config.get("SQLITE_MMAP_SIZE")),
+        ("cache_size", config.get("SQLITE_CACHE_SIZE")),
+    ]
+    pragmas = [(name, value) for name, value in pragmas if value is not None]
+    if _is_memory_sqlite(str(engine.url)):
+        pragmas = [(n, v) for n, v in pragmas if n != "journal_mode"]
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
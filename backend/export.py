@@ -0,0 +1,196 @@
+# backend/export.py
+"""
+Bulk export of a user's transactions as CSV, NDJSON or Parquet.
+
+Rows stream from the DB cursor in (date, id) order, a batch at a time,
+so memory stays flat and the first bytes leave immediately however long
+the history is. Every format carries the same columns as
+/api/transactions: id, date, description, amount, currency, category.
+
+Resuming: an interrupted download continues with ?after=<id of the last
+complete row>, which returns the rows strictly after it in (date, id)
+order as a complete file of its own (CSV header and Parquet schema
+included). The ETag names the user's data_version and the filters;
+sending it back as If-Match on the resumed request gets 412 if the data
+changed in between, so the client starts over instead of stitching two
+different snapshots together.
+
+Parquet needs pyarrow (optional; pandas alone cannot write it), imported
+on the first Parquet export so app startup does not load it. Each
+row group of PARQUET_ROW_GROUP_SIZE rows is sent as soon as it is
+written; the footer follows the last one.
+"""
+import csv
+import hashlib
+import importlib.util
+import io
+
+from sqlalchemy import select, tuple_
+
+from db import db
+from metrics import count_rows, timed
+from models import Transaction
+from normalize import minor_to_amount
+from serialization import encode
+
+# Rows fetched per round trip (CSV, NDJSON).
+EXPORT_BATCH_SIZE = 1000
+# Rows per Parquet row group; also the fetch size for Parquet.
+PARQUET_ROW_GROUP_SIZE = 10000
+
+COLUMNS = ("id", "date", "description", "amount", "currency", "category")
+
+FORMATS = {
+    # format: (mimetype, file extension)
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+class UnknownRow(ValueError):
+    pass
+
+
+def available_formats() -> list:
+    has_pyarrow = importlib.util.find_spec("pyarrow") is not None
+    return [f for f in FORMATS if f != "parquet" or has_pyarrow]
+
+
+def export_select(user_id: int, start=None, end=None, category=None, after=None):
+    """
+    The user's rows in (date, id) order, start/end inclusive dates.
+    after: a transaction id of the user; only rows past it are kept.
+    Raises UnknownRow if the user has no transaction with that id.
+    """
+    stmt = Transaction.api_select().where(Transaction.user_id == user_id)
+    if start is not None:
+        stmt = stmt.where(Transaction.date >= start)
+    if end is not None:
+        stmt = stmt.where(Transaction.date <= end)
+    if category:
+        stmt = stmt.where(Transaction.category == category)
+
+    if after is not None:
+        day = db.session.execute(
+            select(Transaction.date).where(
+                Transaction.id == after, Transaction.user_id == user_id
+            )
+        ).scalar()
+        if day is None:
+            raise UnknownRow(after)
+        stmt = stmt.where(tuple_(Transaction.date, Transaction.id) > (day, after))
+
+    return stmt.order_by(Transaction.date, Transaction.id)
+
+
+def export_etag(user_id: int, version: int, filters) -> str:
+    """Same for every resumed part of one export of one data_version."""
+    raw = f"export:{user_id}:{version}:{filters!r}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+def _batches(stmt, size: int):
+    # Core execution: plain rows without the ORM result layer (~1/3 faster)
+    connection = db.session.connection()
+    for batch in connection.execute(stmt.execution_options(yield_per=size)).partitions():
+        count_rows(len(batch))
+        yield batch
+
+
+def iter_csv(stmt):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(COLUMNS)
+    for batch in _batches(stmt, EXPORT_BATCH_SIZE):
+        writer.writerows(
+            (
+                tx_id,
+                day.isoformat(),
+                description,
+                minor_to_amount(amount_minor),
+                currency,
+                category,
+            )
+            for tx_id, day, description, amount_minor, currency, category in batch
+        )
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    # header only, for an empty export
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def iter_ndjson(stmt):
+    for batch in _batches(stmt, EXPORT_BATCH_SIZE):
+        rows = [Transaction.row_to_dict(r) for r in batch]
+        with timed("json"):
+            chunk = b"".join([encode(row) + b"\n" for row in rows])
+        yield chunk
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands its bytes out in chunks via drain()."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_parquet(stmt):
+    import pyarrow
+    import pyarrow.parquet
+
+    schema = pyarrow.schema(
+        [
+            ("id", pyarrow.int64()),
+            ("date", pyarrow.date32()),
+            ("description", pyarrow.string()),
+            ("amount", pyarrow.float64()),
+            ("currency", pyarrow.string()),
+            ("category", pyarrow.string()),
+        ]
+    )
+    sink = _ChunkSink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema, compression="snappy")
+    try:
+        for batch in _batches(stmt, PARQUET_ROW_GROUP_SIZE):
+            ids, days, descriptions, amounts, currencies, categories = zip(*batch)
+            writer.write_table(
+                pyarrow.table(
+                    [
+                        ids,
+                        days,
+                        descriptions,
+                        [minor_to_amount(a) for a in amounts],
+                        currencies,
+                        categories,
+                    ],
+                    schema=schema,
+                )
+            )
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+WRITERS = {"csv": iter_csv, "ndjson": iter_ndjson, "parquet": iter_parquet}
@@ -0,0 +1,278 @@
+# backend/forecasting.py
+"""
+Next-month forecasts from each user's monthly history.
+
+The model is Holt's linear exponential smoothing with a damped trend,
+fitted to the months x categories matrix from analytics.UserAnalytics.
+The recursion runs once per month over numpy vectors, so every category
+of a user is fitted in the same pass.
+
+Results are stored in the forecasts table, keyed by (user, basis month)
+and tagged with the user's data_version. `flask compute-forecasts`
+fills it for all users, for the latest month and for each of the last
+STORED_BASIS_MONTHS months with history (the months the dashboard's
+filter asks for); /api/forecast, the dashboard and chat read it with
+one indexed lookup and, on a miss, compute the forecast in memory.
+Requests never write forecasts.
+"""
+from sqlalchemy import and_, delete, select
+
+from analytics import get_user_analytics
+from db import db
+from models import Forecast, User
+from normalize import MINOR_UNITS
+
+MODEL_NAME = "holt_damped"
+LATEST = "latest"  # basis_month for the unfiltered view: last month with data
+
+# Smoothing for level / trend, and trend damping per step ahead.
+ALPHA = 0.5
+BETA = 0.2
+PHI = 0.9
+
+# Months of history fed to the model.
+HISTORY_MONTHS = 24
+
+# Fewer months than this forecast the mean instead of fitting a trend.
+MIN_TREND_MONTHS = 3
+
+# Basis months stored per user besides LATEST by the batch job.
+STORED_BASIS_MONTHS = 12
+
+
+def holt_damped(values, alpha=ALPHA, beta=BETA, phi=PHI):
+    """
+    One-step-ahead forecast for each column of a (months, series) array.
+    The trend starts flat and is learned from the data; with fewer than
+    MIN_TREND_MONTHS months there is too little to fit and the forecast is
+    the column mean.
+    """
+    import numpy as np
+
+    values = np.asarray(values, dtype=float)
+    if len(values) < MIN_TREND_MONTHS:
+        return values.mean(axis=0)
+
+    level = values[0].copy()
+    trend = np.zeros_like(level)
+
+    for observed in values[1:]:
+        previous = level
+        level = alpha * observed + (1 - alpha) * (previous + phi * trend)
+        trend = beta * (level - previous) + (1 - beta) * phi * trend
+
+    return level + phi * trend
+
+
+def _next_month(year_month: str) -> str:
+    year, month = int(year_month[:4]), int(year_month[5:])
+    year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return f"{year:04d}-{month:02d}"
+
+
+def build_forecast(analytics, basis=None):
+    """
+    Fits the model on a UserAnalytics' history up to `basis` ("YYYY-MM",
+    or None for all of it). Returns (basis_month, target_month, rows)
+    where rows are (category, current_minor, forecast_minor), or None
+    when the user has no history.
+    """
+    import pandas as pd
+
+    matrix = analytics.month_matrix(end=basis)
+    if matrix.empty:
+        return None
+
+    basis_month = basis or matrix.index[-1]
+    if matrix.index[-1] < basis_month:
+        # nothing booked in the basis month itself: it counts as zero
+        months = pd.period_range(matrix.index[0], basis_month, freq="M")
+        matrix = matrix.reindex(months.strftime("%Y-%m"), fill_value=0)
+
+    minor = (matrix.tail(HISTORY_MONTHS) * MINOR_UNITS).round()
+    predicted = holt_damped(minor.to_numpy())
+
+    # a category keeps its side: income never forecasts below 0, spending
+    # never above it
+    income = minor.sum().to_numpy() > 0
+    predicted = predicted.clip(min=0) * income + predicted.clip(max=0) * ~income
+
+    current = minor.iloc[-1].to_numpy()
+    rows = [
+        (category, int(current[i]), int(round(predicted[i])))
+        for i, category in enumerate(minor.columns)
+    ]
+    return basis_month, _next_month(basis_month), rows
+
+
+def save_forecast(user_id: int, basis_key: str, version: int, built) -> None:
+    """Replaces the user's stored forecast for basis_key. Does not commit."""
+    db.session.execute(
+        delete(Forecast).where(
+            Forecast.user_id == user_id, Forecast.basis_month == basis_key
+        )
+    )
+
+    _basis_month, target_month, rows = built
+    db.session.execute(
+        Forecast.__table__.insert(),
+        [
+            {
+                "user_id": user_id,
+                "basis_month": basis_key,
+                "category": category,
+                "data_version": version,
+                "target_month": target_month,
+                "model": MODEL_NAME,
+                "current_minor": current_minor,
+                "forecast_minor": forecast_minor,
+            }
+            for category, current_minor, forecast_minor in rows
+        ],
+    )
+
+
+def forecast_payload(target_month, rows) -> dict:
+    """
+    /api/forecast response from (category, current_minor, forecast_minor)
+    rows: expense categories with current and forecast spend, plus
+    income / expense / saving totals for now and next month.
+    """
+    income = expense = forecast_income = forecast_expense = 0
+    categories = []
+
+    for category, current_minor, forecast_minor in sorted(rows):
+        income += max(current_minor, 0)
+        expense += max(-current_minor, 0)
+        forecast_income += max(forecast_minor, 0)
+        forecast_expense += max(-forecast_minor, 0)
+
+        if forecast_minor < 0 or (forecast_minor == 0 and current_minor < 0):
+            categories.append(
+                {
+                    "category": category,
+                    "current_spend": max(-current_minor, 0) / MINOR_UNITS,
+                    "forecast_spend": -forecast_minor / MINOR_UNITS,
+                }
+            )
+
+    return {
+        "model": MODEL_NAME,
+        "target_month": target_month,
+        "categories": categories,
+        "totals": {
+            "income": income / MINOR_UNITS,
+            "expense": expense / MINOR_UNITS,
+            "forecast_income": forecast_income / MINOR_UNITS,
+            "forecast_expense": forecast_expense / MINOR_UNITS,
+            "current_saving": (income - expense) / MINOR_UNITS,
+            "forecast_saving": (forecast_income - forecast_expense) / MINOR_UNITS,
+        },
+    }
+
+
+def stored_forecast_query(user_id: int, basis_key: str):
+    """
+    The user's data_version with the stored forecast rows for basis_key
+    that are still current (one row with NULL forecast columns if none).
+    """
+    return (
+        select(
+            User.data_version,
+            Forecast.target_month,
+            Forecast.category,
+            Forecast.current_minor,
+            Forecast.forecast_minor,
+        )
+        .outerjoin(
+            Forecast,
+            and_(
+                Forecast.user_id == User.id,
+                Forecast.basis_month == basis_key,
+                Forecast.data_version == User.data_version,
+            ),
+        )
+        .where(User.id == user_id)
+    )
+
+
+def stored_payload(stored) -> dict:
+    """
+    forecast_payload() of stored_forecast_query() rows, or None if they
+    hold no current forecast.
+    """
+    stored = [r for r in stored if r.category is not None]
+    if not stored:
+        return None
+    rows = [(r.category, r.current_minor, r.forecast_minor) for r in stored]
+    return forecast_payload(stored[0].target_month, rows)
+
+
+def get_forecast(user_id: int, basis=None) -> dict:
+    """
+    Stored forecast for the user's current data, or one computed in
+    memory (not stored) if there is none. Read-only.
+    """
+    # one lookup on the users and forecasts primary keys
+    found = db.session.execute(stored_forecast_query(user_id, basis or LATEST)).all()
+    payload = stored_payload(found)
+    if payload is not None:
+        return payload
+
+    version = found[0].data_version if found else 0
+    return compute_forecast(get_user_analytics(user_id, version), basis)
+
+
+def compute_forecast(analytics, basis=None) -> dict:
+    """get_forecast()'s response fitted on a UserAnalytics, not stored."""
+    built = build_forecast(analytics, basis)
+    if built is None:
+        return forecast_payload(None, [])
+    return forecast_payload(built[1], built[2])
+
+
+def compute_all_forecasts(user_id=None, force: bool = False) -> int:
+    """
+    Batch job: stores the forecasts of every user (or one), for LATEST
+    and for each of their last STORED_BASIS_MONTHS months with history,
+    skipping users whose stored forecast is still current unless force.
+    Commits per user. Returns how many users were (re)computed.
+    """
+    stmt = select(User.id, User.data_version)
+    if user_id is not None:
+        stmt = stmt.where(User.id == user_id)
+
+    fresh = set()
+    if not force:
+        fresh = set(
+            db.session.execute(
+                select(Forecast.user_id)
+                .join(User, User.id == Forecast.user_id)
+                .where(
+                    Forecast.basis_month == LATEST,
+                    Forecast.data_version == User.data_version,
+                )
+                .distinct()
+            ).scalars()
+        )
+
+    computed = 0
+    for uid, version in db.session.execute(stmt).all():
+        if uid in fresh:
+            continue
+
+        analytics = get_user_analytics(uid, version)
+        built = build_forecast(analytics)
+        if built is None:
+            continue
+
+        # bases of older data would never be read again
+        db.session.execute(delete(Forecast).where(Forecast.user_id == uid))
+        save_forecast(uid, LATEST, version, built)
+        months = analytics.monthly["year_month"].unique()
+        for basis in sorted(months)[-STORED_BASIS_MONTHS:]:
+            save_forecast(uid, basis, version, build_forecast(analytics, basis))
+        db.session.commit()
+        computed += 1
+
+    return computed
@@ -0,0 +1,229 @@
+# backend/fx.py
+"""
+Exchange rates and conversion into each user's default currency.
+
+Rates come from a local CSV (FX_RATES_PATH, loaded by `flask
+load-fx-rates` and by migration 10; never fetched over the network) with
+columns date, currency, rate: the value of one unit of `currency` in
+DEFAULT_CURRENCY on that date. fx_rates keeps their monthly averages.
+A month without a rate uses the latest earlier one, and months before a
+currency's first rate use that first rate.
+
+Monthly granularity matches the rollup: every aggregate reads the
+monthly_totals_converted view, which looks up the rates of each rollup
+row's month and converts it to the user's currency inside the query:
+
+    total = total_minor * rate(currency) / rate(default_currency)
+
+Rows already in the user's currency skip the lookups, so a
+single-currency user pays no more than for the bare rollup. Callers sum
+`total` (a float, minor units) and round once per group. A user without
+a default currency is read as DEFAULT_CURRENCY, as everywhere else.
+
+FxRates is the same table in memory, cached per process for
+RESULT_CACHE_TTL, for the supported-currency checks on ingest and on
+the profile and for converting single values in Python.
+"""
+import csv
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import date
+
+from flask import current_app
+from sqlalchemy import column, delete, insert, select, table, text, update
+
+from cache import LocalLRUCache
+from models import FxRate, Transaction, User
+from normalize import DEFAULT_CURRENCY, parse_date
+
+CONVERTED_VIEW = "monthly_totals_converted"
+
+converted_totals = table(
+    CONVERTED_VIEW,
+    column("user_id"),
+    column("year_month"),
+    column("category"),
+    column("currency"),
+    column("total"),
+    column("count"),
+)
+
+# DEFAULT_CURRENCY per unit of {currency} in {month}: the month's rate,
+# else the latest earlier one, else the first. Each is one index seek;
+# a clamp against min/max(year_month) would rescan them for every row.
+_RATE_SQL = (
+    "coalesce("
+    "(SELECT rate FROM fx_rates WHERE currency = {currency} AND year_month <= {month} "
+    "ORDER BY year_month DESC LIMIT 1), "
+    "(SELECT rate FROM fx_rates WHERE currency = {currency} ORDER BY year_month LIMIT 1))"
+)
+
+
+def converted_amount_sql(amount: str, currency: str, month: str, to_currency: str) -> str:
+    """
+    SQL expression converting `amount` of `currency` in `month` ("YYYY-MM")
+    to `to_currency`; the arguments are SQL over the caller's own aliases.
+    NULL if either currency has no rates.
+    """
+    source = _RATE_SQL.format(currency=currency, month=month)
+    target = _RATE_SQL.format(currency=to_currency, month=month)
+    return (
+        f"CASE WHEN {currency} = {to_currency} THEN {amount} "
+        f"ELSE {amount} * {source} / {target} END"
+    )
+
+
+def user_currency_sql(alias: str) -> str:
+    """SQL for the default currency of the users row aliased `alias`."""
+    return f"coalesce({alias}.default_currency, '{DEFAULT_CURRENCY}')"
+
+
+def create_converted_view(conn) -> None:
+    expression = converted_amount_sql(
+        "r.total_minor", "r.currency", "r.year_month", user_currency_sql("u")
+    )
+    conn.execute(text(f"DROP VIEW IF EXISTS {CONVERTED_VIEW}"))
+    conn.execute(
+        text(
+            f"""
+            CREATE VIEW {CONVERTED_VIEW} AS
+            SELECT r.user_id, r.year_month, r.category, r.currency,
+                   {expression} AS total, r.count
+            FROM monthly_category_totals r
+            JOIN users u ON u.id = r.user_id
+            """
+        )
+    )
+
+
+# -------------------------------------------------
+# Loading
+# -------------------------------------------------
+
+def read_rates_file(path: str) -> dict:
+    """
+    {currency: {year_month: average rate}} from a date, currency, rate CSV.
+    Raises ValueError naming the first bad row.
+    """
+    sums = defaultdict(lambda: defaultdict(lambda: [0.0, 0]))
+    with open(path, newline="", encoding="utf-8") as f:
+        for row_number, row in enumerate(csv.DictReader(f), start=2):
+            try:
+                day = parse_date(row.get("date"))
+                currency = (row.get("currency") or "").strip().upper()
+                rate = float(row.get("rate") or "")
+                if len(currency) != 3 or not rate > 0:
+                    raise ValueError
+            except ValueError:
+                raise ValueError(f"{path}: invalid rate in row {row_number}")
+            entry = sums[currency][f"{day.year:04d}-{day.month:02d}"]
+            entry[0] += rate
+            entry[1] += 1
+
+    return {
+        currency: {month: total / count for month, (total, count) in months.items()}
+        for currency, months in sums.items()
+    }
+
+
+def rate_rows(monthly: dict) -> list:
+    """fx_rates rows, plus DEFAULT_CURRENCY at 1.0 for every month loaded."""
+    rows = [
+        {"currency": currency, "year_month": month, "rate": rate}
+        for currency, months in monthly.items()
+        if currency != DEFAULT_CURRENCY
+        for month, rate in sorted(months.items())
+    ]
+    months = sorted({row["year_month"] for row in rows})
+    rows += [
+        {"currency": DEFAULT_CURRENCY, "year_month": month, "rate": 1.0}
+        for month in months
+    ]
+    return rows
+
+
+def load_rates(executor, path: str) -> set:
+    """
+    Replaces fx_rates with the file's rates and returns the currencies now
+    supported. Every user's data_version is bumped since converted totals
+    may have changed; default currencies are left as they are.
+    Raises ValueError if transactions use a currency the file lacks.
+    """
+    rows = rate_rows(read_rates_file(path))
+    currencies = {row["currency"] for row in rows} | {DEFAULT_CURRENCY}
+    used = set(executor.execute(select(Transaction.currency).distinct()).scalars())
+    if used - currencies:
+        raise ValueError(
+            f"{path}: no rates for {', '.join(sorted(used - currencies))}"
+        )
+
+    executor.execute(delete(FxRate))
+    if rows:
+        executor.execute(insert(FxRate), rows)
+    executor.execute(update(User).values(data_version=User.data_version + 1))
+    return currencies
+
+
+def normalize_user_currencies(executor, currencies) -> None:
+    """Sets DEFAULT_CURRENCY where a user's currency is unset or unsupported."""
+    executor.execute(
+        update(User)
+        .where(
+            (User.default_currency.is_(None))
+            | (User.default_currency.not_in(sorted(currencies)))
+        )
+        .values(default_currency=DEFAULT_CURRENCY)
+    )
+
+
+# -------------------------------------------------
+# In-memory rates
+# -------------------------------------------------
+
+class FxRates:
+    """The fx_rates table in memory, with the same lookup as the SQL."""
+
+    def __init__(self, rows):
+        by_currency = defaultdict(list)
+        for currency, year_month, rate in sorted(rows):
+            by_currency[currency].append((year_month, rate))
+        self._months = {c: [m for m, _ in r] for c, r in by_currency.items()}
+        self._rates = {c: [rate for _, rate in r] for c, r in by_currency.items()}
+        self.currencies = frozenset(by_currency) | {DEFAULT_CURRENCY}
+
+    def rate(self, currency: str, day: date):
+        """DEFAULT_CURRENCY per unit of `currency` on `day`, or None if unknown."""
+        months = self._months.get(currency)
+        if months is None:
+            return 1.0 if currency == DEFAULT_CURRENCY else None
+        i = bisect_right(months, f"{day.year:04d}-{day.month:02d}")
+        return self._rates[currency][max(i - 1, 0)]
+
+    def convert(self, amount_minor: int, currency: str, to_currency: str, day: date):
+        """amount_minor of `currency` on `day` in minor units of `to_currency`."""
+        if currency == to_currency:
+            return float(amount_minor)
+        source = self.rate(currency, day)
+        target = self.rate(to_currency, day)
+        if source is None or target is None:
+            return None
+        return amount_minor * source / target
+
+
+def init_fx(app) -> None:
+    app.extensions["fx_rates"] = LocalLRUCache(
+        maxsize=1, ttl=float(app.config.get("RESULT_CACHE_TTL", 300))
+    )
+
+
+def get_fx_rates(executor) -> FxRates:
+    """This process's FxRates, reloaded from fx_rates after RESULT_CACHE_TTL."""
+    cache = current_app.extensions["fx_rates"]
+    rates = cache.get("rates")
+    if rates is None:
+        rows = executor.execute(
+            select(FxRate.currency, FxRate.year_month, FxRate.rate)
+        ).all()
+        rates = FxRates(rows)
+        cache.set("rates", rates)
+    return rates
@@ -0,0 +1,128 @@
+# backend/http_cache.py
+"""
+Conditional GET and response compression for the read endpoints.
+
+@conditional gives a response a strong ETag derived from the user, their
+data_version, the path and the query string. A request whose
+If-None-Match still matches gets 304 right after the data_version
+lookup, before the view runs any query.
+
+compress_response() (an after_request hook) gzip- or brotli-encodes JSON
+bodies of at least COMPRESS_MIN_SIZE bytes. brotli is used only when the
+package is installed. A compressed response gets the encoding appended
+to its ETag, since a strong validator must differ per representation.
+
+Settings (app config):
+    COMPRESS_MIN_SIZE     smallest body (bytes) worth compressing
+    COMPRESS_LEVEL        gzip level 1-9
+    COMPRESS_BR_QUALITY   brotli quality 0-11
+"""
+import gzip
+import hashlib
+from datetime import date
+from functools import wraps
+
+from flask import current_app, request
+
+from cache import get_data_version
+
+DEFAULT_MIN_SIZE = 1024
+DEFAULT_GZIP_LEVEL = 6
+DEFAULT_BR_QUALITY = 4
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson")
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+
+def make_etag(user_id: int, version: int, extra: str = "") -> str:
+    args = "&".join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)))
+    raw = f"{user_id}:{version}:{request.path}?{args}:{extra}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+def _matches(etag: str) -> bool:
+    for candidate in request.if_none_match:
+        # "<etag>" or "<etag>-gzip" / "<etag>-br" as sent by us compressed
+        if candidate == "*" or candidate.split("-", 1)[0] == etag:
+            return True
+    return False
+
+
+def conditional(vary_daily: bool = False):
+    """
+    ETag / If-None-Match for a per-user read view (inside @require_auth).
+    vary_daily: the body also depends on today's date (projections).
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            user_id = request.user_id
+            extra = date.today().isoformat() if vary_daily else ""
+            etag = make_etag(user_id, get_data_version(user_id), extra)
+
+            if _matches(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = current_app.make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            # the browser may keep it but must revalidate every time
+            response.headers["Cache-Control"] = "private, no-cache"
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def _pick_encoding():
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+
+def compress_response(response):
+    if (
+        response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE_TYPES
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+
+    config = current_app.config
+    body = response.get_data()
+    if len(body) < int(config.get("COMPRESS_MIN_SIZE", DEFAULT_MIN_SIZE)):
+        return response
+
+    encoding = _pick_encoding()
+    if encoding is None:
+        return response
+
+    if encoding == "br":
+        quality = int(config.get("COMPRESS_BR_QUALITY", DEFAULT_BR_QUALITY))
+        body = brotli.compress(body, quality=quality)
+    else:
+        level = int(config.get("COMPRESS_LEVEL", DEFAULT_GZIP_LEVEL))
+        body = gzip.compress(body, compresslevel=level, mtime=0)
+
+    response.set_data(body)
+    response.headers["Content-Encoding"] = encoding
+
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f"{etag}-{encoding}", weak=weak)
+    return response
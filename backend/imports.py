@@ -0,0 +1,287 @@
+# backend/imports.py
+"""
+Background CSV imports.
+
+/upload-csv only spools the file to disk and records an ImportJob; a
+thread pool in the web process then ingests it batch by batch. Each
+batch (transactions, rollup deltas, job progress, data_version bump)
+is one commit, so a worker that dies mid-import loses at most the batch
+in flight, and whoever picks the job up next skips the rows already
+committed.
+
+Jobs left behind by a dead worker are picked up again on the first
+request a (re)started process serves, and whenever a client polls a job
+whose heartbeat has gone stale. Claiming a job is a single conditional
+UPDATE, so two processes never run the same job.
+
+A transient database error ("database is locked") puts the job back in
+the queue instead of failing it: the batch in flight is rolled back and
+the next attempt, once the heartbeat is stale, resumes after the last
+committed batch. After IMPORT_MAX_ATTEMPTS attempts the job fails.
+
+Settings (app config):
+    IMPORT_WORKERS        threads per web process; 0 runs imports inline
+                          inside the upload request (CLI, benchmarks)
+    IMPORT_SPOOL_DIR      where uploads are spooled until imported
+    IMPORT_STALE_SECONDS  heartbeat age after which a running job is
+                          considered orphaned
+    IMPORT_MAX_ATTEMPTS   attempts before a job that keeps hitting
+                          database errors is marked failed
+"""
+import csv
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+from sqlalchemy import or_, select, update
+from sqlalchemy.exc import OperationalError
+
+from cache import bump_data_version
+from db import db
+from ingest import CHUNK_SIZE, MAX_REPORTED_REJECTS, iter_ingest, open_text_stream
+from models import ImportJob
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+DEFAULT_IMPORT_WORKERS = 2
+DEFAULT_STALE_SECONDS = 60
+DEFAULT_MAX_ATTEMPTS = 5
+
+SPOOL_CHUNK_BYTES = 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+class ImportRunner:
+    def __init__(self, app):
+        self.app = app
+        self.workers = int(app.config.get("IMPORT_WORKERS", DEFAULT_IMPORT_WORKERS))
+        self.stale_seconds = float(
+            app.config.get("IMPORT_STALE_SECONDS", DEFAULT_STALE_SECONDS)
+        )
+        self.max_attempts = int(
+            app.config.get("IMPORT_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS)
+        )
+        self.chunk_size = int(app.config.get("IMPORT_CHUNK_SIZE", CHUNK_SIZE))
+        self.spool_dir = app.config.get("IMPORT_SPOOL_DIR") or os.path.join(
+            tempfile.gettempdir(), "finance-imports"
+        )
+
+        self._executor = None
+        self._lock = threading.Lock()
+        self._resumed = False
+
+    # ---------- scheduling ----------
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="import"
+                )
+            return self._executor
+
+    def submit(self, job_id: int) -> None:
+        """Runs the job inline (IMPORT_WORKERS=0) or queues it on the pool."""
+        if self.workers <= 0:
+            self.run(job_id)
+        else:
+            self._get_executor().submit(self._run_in_context, job_id)
+
+    def _run_in_context(self, job_id: int) -> None:
+        with self.app.app_context():
+            try:
+                self.run(job_id)
+            except Exception:
+                logger.exception("import job %s crashed", job_id)
+
+    def is_stale(self, job: ImportJob) -> bool:
+        return (
+            job.status in (QUEUED, RUNNING)
+            and job.heartbeat_at < time.time() - self.stale_seconds
+        )
+
+    def resume_once(self) -> None:
+        """Requeues jobs orphaned by a previous process (first call only)."""
+        if self.workers <= 0 or self._resumed:
+            return
+        with self._lock:
+            if self._resumed:
+                return
+            self._resumed = True
+
+        for job_id in self.orphaned_job_ids():
+            self.submit(job_id)
+
+    def orphaned_job_ids(self) -> list:
+        cutoff = time.time() - self.stale_seconds
+        stmt = select(ImportJob.id).where(
+            ImportJob.status.in_((QUEUED, RUNNING)),
+            ImportJob.heartbeat_at < cutoff,
+        )
+        return list(db.session.execute(stmt).scalars())
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    # ---------- spooling ----------
+    def create_job(self, user_id: int, file_storage) -> ImportJob:
+        """Spools an uploaded file to disk and records a queued job."""
+        os.makedirs(self.spool_dir, exist_ok=True)
+        fd, path = tempfile.mkstemp(suffix=".csv", dir=self.spool_dir)
+
+        newlines = 0
+        last = b""
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                block = file_storage.stream.read(SPOOL_CHUNK_BYTES)
+                if not block:
+                    break
+                out.write(block)
+                newlines += block.count(b"\n")
+                last = block[-1:]
+
+        lines = newlines + (1 if last not in (b"", b"\n") else 0)
+        job = ImportJob(
+            user_id=user_id,
+            status=QUEUED,
+            filename=file_storage.filename,
+            spool_path=path,
+            total_rows=max(0, lines - 1),  # minus header
+            heartbeat_at=time.time(),
+        )
+        db.session.add(job)
+        db.session.commit()
+        return job
+
+    # ---------- processing ----------
+    def claim(self, job_id: int) -> bool:
+        """Atomically marks the job running for this worker."""
+        now = time.time()
+        result = db.session.execute(
+            update(ImportJob)
+            .where(
+                ImportJob.id == job_id,
+                or_(
+                    ImportJob.status == QUEUED,
+                    ImportJob.heartbeat_at < now - self.stale_seconds,
+                ),
+                ImportJob.status.in_((QUEUED, RUNNING)),
+            )
+            .values(
+                status=RUNNING,
+                heartbeat_at=now,
+                attempts=ImportJob.attempts + 1,
+            )
+        )
+        db.session.commit()
+        return result.rowcount == 1
+
+    def run(self, job_id: int) -> None:
+        if not self.claim(job_id):
+            return  # finished, or another worker has it
+
+        job = db.session.get(ImportJob, job_id)
+        try:
+            with open(job.spool_path, "rb") as raw:
+                stream = open_text_stream(raw)
+                batches = iter_ingest(
+                    stream, job.user_id, self.chunk_size, skip_rows=job.rows_processed
+                )
+                for batch in batches:
+                    self._record_batch(job, batch)
+                    bump_data_version(job.user_id)
+                    db.session.commit()
+        except UnicodeDecodeError:
+            self._fail(job_id, "Could not decode file as UTF-8")
+            return
+        except csv.Error:
+            self._fail(job_id, "Could not parse file as CSV")
+            return
+        except OSError:
+            self._fail(job_id, "Uploaded file is no longer available")
+            return
+        except OperationalError:
+            if not self._requeue(job_id):
+                raise
+            logger.warning(
+                "import job %s requeued after a database error", job_id, exc_info=True
+            )
+            return
+        except Exception:
+            self._fail(job_id, "Import failed")
+            raise
+
+        job.status = DONE
+        job.heartbeat_at = time.time()
+        db.session.commit()
+        self._discard_spool(job.spool_path)
+
+    def _record_batch(self, job: ImportJob, batch: dict) -> None:
+        job.rows_processed += batch["rows"]
+        job.inserted += batch["inserted"]
+        job.duplicates += batch["duplicates"]
+        job.rejected += batch["rejected"]
+        job.heartbeat_at = time.time()
+
+        reported = json.loads(job.rejected_rows or "[]")
+        if len(reported) < MAX_REPORTED_REJECTS and batch["rejected_rows"]:
+            reported.extend(batch["rejected_rows"][: MAX_REPORTED_REJECTS - len(reported)])
+            job.rejected_rows = json.dumps(reported)
+
+        if batch["min_date"] and (job.min_date is None or batch["min_date"] < job.min_date):
+            job.min_date = batch["min_date"]
+        if batch["max_date"] and (job.max_date is None or batch["max_date"] > job.max_date):
+            job.max_date = batch["max_date"]
+
+    def _requeue(self, job_id: int) -> bool:
+        """
+        Puts the job back in the queue, or fails it once it has had
+        max_attempts. Returns whether it was requeued.
+        """
+        # the batch in flight is rolled back; a fresh heartbeat makes the
+        # retry wait until the job is stale
+        db.session.rollback()
+        job = db.session.get(ImportJob, job_id)
+        if job.attempts >= self.max_attempts:
+            self._fail(job_id, "Import failed")
+            return False
+        job.status = QUEUED
+        job.heartbeat_at = time.time()
+        db.session.commit()
+        return True
+
+    def _fail(self, job_id: int, message: str) -> None:
+        # the batch in flight is rolled back; earlier batches stay committed
+        db.session.rollback()
+        job = db.session.get(ImportJob, job_id)
+        job.status = FAILED
+        job.error = message
+        job.heartbeat_at = time.time()
+        db.session.commit()
+        self._discard_spool(job.spool_path)
+
+    @staticmethod
+    def _discard_spool(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def init_imports(app) -> None:
+    app.extensions["imports"] = ImportRunner(app)
+
+
+def get_import_runner() -> ImportRunner:
+    return current_app.extensions["imports"]
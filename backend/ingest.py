@@ -0,0 +1,198 @@
+# backend/ingest.py
+import csv
+import io
+from itertools import islice
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+
+from budgets import evaluate_alerts
+from categorizer import categorize_many
+from db import db
+from fx import get_fx_rates
+from models import Transaction, User
+from normalize import DEFAULT_CURRENCY, FingerprintCounter, parse_amount_minor, parse_date
+from rollup import apply_rollup_deltas, year_month_of
+
+# Rows parsed and inserted per round trip. Keeps memory bounded no matter
+# how large the uploaded statement is.
+CHUNK_SIZE = 2000
+
+# Only the first few rejected rows are echoed back to the client.
+MAX_REPORTED_REJECTS = 20
+
+
+def open_text_stream(binary_stream, encoding: str = "utf-8"):
+    """
+    Wraps a binary upload stream so it is decoded incrementally,
+    instead of reading the whole file into memory first.
+    """
+    return io.TextIOWrapper(binary_stream, encoding=encoding, newline="")
+
+
+def parse_row(row: dict, default_currency: str = DEFAULT_CURRENCY, currencies=None):
+    """
+    Turns one CSV row into a dict ready for insertion (minus category).
+    The date is normalized to a date and the amount to integer minor units.
+    An empty or missing currency column means `default_currency`.
+    Raises ValueError (with the reason) for an unparseable date or amount,
+    or a currency not in `currencies` (when given).
+    """
+    description = row.get("description", "") or ""
+
+    currency = (row.get("currency") or "").strip().upper() or default_currency
+    if currencies is not None and currency not in currencies:
+        raise ValueError("unknown currency")
+
+    try:
+        amount_minor = parse_amount_minor(row.get("amount") or "0")
+    except ValueError:
+        raise ValueError("invalid amount")
+
+    try:
+        date = parse_date(row.get("date"))
+    except ValueError:
+        raise ValueError("invalid date")
+
+    return {
+        "date": date,
+        "description": description,
+        "amount_minor": amount_minor,
+        "currency": currency,
+    }
+
+
+def iter_ingest(text_stream, user_id: int, chunk_size: int = CHUNK_SIZE, skip_rows: int = 0):
+    """
+    Streams a CSV (date, description, amount and an optional currency,
+    defaulting to the user's) into the transactions table for the given
+    user, one chunk at a time, using Core bulk inserts.
+    The monthly category rollup is updated alongside each chunk.
+
+    Rows whose fingerprint the user already has are skipped by the
+    unique index (INSERT ... ON CONFLICT DO NOTHING), in bulk, and do
+    not touch the rollup. Budget alerts are evaluated for the months
+    each chunk touched.
+
+    The first `skip_rows` data rows are skipped (resuming an import).
+    Yields one dict per chunk after it has been executed, before anything
+    is committed: rows consumed, inserted/duplicate/rejected counts, the
+    rejected rows (row number + reason) and the chunk's date range.
+    """
+    reader = csv.DictReader(text_stream)
+    fingerprint = FingerprintCounter(user_id)
+    default_currency = db.session.execute(
+        select(User.default_currency).where(User.id == user_id)
+    ).scalar() or DEFAULT_CURRENCY
+    currencies = get_fx_rates(db.session).currencies
+    table = Transaction.__table__
+    stmt = (
+        insert(table)
+        .on_conflict_do_nothing(index_elements=["user_id", "fingerprint"])
+        .returning(table.c.fingerprint)
+    )
+
+    for row in islice(reader, skip_rows):
+        # replay occurrence counts so resumed fingerprints match
+        try:
+            record = parse_row(row, default_currency, currencies)
+        except ValueError:
+            continue
+        fingerprint(
+            record["date"], record["amount_minor"], record["description"], record["currency"]
+        )
+    row_number = 1 + skip_rows  # header is row 1
+
+    while True:
+        chunk = list(islice(reader, chunk_size))
+        if not chunk:
+            break
+
+        records = []
+        rejected_rows = []
+        min_date = None
+        max_date = None
+        for row in chunk:
+            row_number += 1
+            try:
+                record = parse_row(row, default_currency, currencies)
+            except ValueError as e:
+                rejected_rows.append({"row": row_number, "reason": str(e)})
+                continue
+
+            record["user_id"] = user_id
+            record["fingerprint"] = fingerprint(
+                record["date"], record["amount_minor"], record["description"], record["currency"]
+            )
+            records.append(record)
+
+            date = record["date"]
+            if min_date is None or date < min_date:
+                min_date = date
+            if max_date is None or date > max_date:
+                max_date = date
+
+        new_records = []
+        if records:
+            categories = categorize_many(
+                [r["description"] for r in records],
+                [r["amount_minor"] for r in records],
+            )
+            for record, category in zip(records, categories):
+                record["category"] = category
+
+            new = set(db.session.execute(stmt, records).scalars())
+            new_records = [r for r in records if r["fingerprint"] in new]
+            apply_rollup_deltas(db.session, user_id, new_records)
+            if new_records:
+                months = {year_month_of(r["date"]) for r in new_records}
+                evaluate_alerts(db.session, user_id, months)
+
+        yield {
+            "rows": len(chunk),
+            "inserted": len(new_records),
+            "duplicates": len(records) - len(new_records),
+            "rejected": len(rejected_rows),
+            "rejected_rows": rejected_rows,
+            "min_date": min_date,
+            "max_date": max_date,
+        }
+
+
+def ingest_csv(text_stream, user_id: int, chunk_size: int = CHUNK_SIZE):
+    """
+    Ingests a whole CSV in the caller's transaction (see iter_ingest).
+
+    Does NOT commit: the caller owns the transaction so a failed upload
+    can be rolled back as a whole.
+
+    Returns a summary dict: new/duplicate/rejected counts and the date range.
+    """
+    inserted = 0
+    duplicates = 0
+    rejected = 0
+    rejected_rows = []
+    min_date = None
+    max_date = None
+
+    for batch in iter_ingest(text_stream, user_id, chunk_size):
+        inserted += batch["inserted"]
+        duplicates += batch["duplicates"]
+        rejected += batch["rejected"]
+        room = MAX_REPORTED_REJECTS - len(rejected_rows)
+        rejected_rows.extend(batch["rejected_rows"][:room])
+        if batch["min_date"] and (min_date is None or batch["min_date"] < min_date):
+            min_date = batch["min_date"]
+        if batch["max_date"] and (max_date is None or batch["max_date"] > max_date):
+            max_date = batch["max_date"]
+
+    return {
+        "count": inserted,
+        "duplicates": duplicates,
+        "rejected": rejected,
+        "rejected_rows": rejected_rows,
+        "date_range": {
+            "start": min_date.isoformat() if min_date else None,
+            "end": max_date.isoformat() if max_date else None,
+        },
+    }
@@ -0,0 +1,440 @@
+# backend/metrics.py
+"""
+Request and SQL instrumentation, exposed in Prometheus text format.
+
+Every request records, labelled by its URL rule (not the raw path):
+    finance_http_request_duration_seconds   latency histogram
+    finance_http_response_size_bytes        body size histogram
+    finance_request_sql_statements          statements executed
+    finance_request_rows                    rows hydrated: ORM instances,
+                                            plus plain rows turned into
+                                            response objects (count_rows)
+    finance_request_phase_seconds           time in auth / sql / json,
+                                            plus "other" (the remainder)
+
+SQL is timed with the engine's before/after_cursor_execute events, so
+every statement is counted, including those outside a request (background
+imports), in finance_sql_query_duration_seconds. Reads that go straight
+to a DBAPI cursor (the analytics frames) are not seen.
+
+Statements slower than SLOW_QUERY_MS are logged to the "finance.slow_query"
+logger with the shapes of their bound parameters (types and lengths, never
+values); requests slower than SLOW_REQUEST_MS are logged with their phase
+breakdown to "finance.slow_request".
+
+Streamed responses are recorded when the server closes them, so their
+latency covers the whole stream; their size is not known and not recorded.
+
+Metrics live in process memory: under gunicorn each worker reports its own.
+
+Settings (app config):
+    METRICS_ENABLED    install the hooks and serve /metrics
+    METRICS_TOKEN      if set, /metrics requires "Authorization: Bearer <token>"
+    SLOW_QUERY_MS      slow-query log threshold (None disables)
+    SLOW_REQUEST_MS    slow-request log threshold (None disables)
+"""
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.orm import Mapper
+
+from serialization import FastJSONProvider
+
+slow_query_logger = logging.getLogger("finance.slow_query")
+slow_request_logger = logging.getLogger("finance.slow_request")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+SQL_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1, 0.5, 1.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000)
+
+PHASES = ("auth", "sql", "json")
+
+# the slow-query log keeps multi-row INSERTs readable
+MAX_LOGGED_STATEMENT = 1000
+MAX_LOGGED_PARAMS = 20
+
+
+# -------------------------------------------------
+# Metric types
+# -------------------------------------------------
+
+def _format_labels(labels) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for name, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{name}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _format_value(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        """labels: values in labelnames order."""
+        key = labels
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            labels = _format_labels(zip(self.labelnames, key))
+            yield f"{self.name}{labels} {_format_value(value)}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram; one series per label combination."""
+
+    def __init__(self, name: str, help_text: str, buckets, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.labelnames = tuple(labelnames)
+        self._series = {}  # labels -> [per-bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        """labels: values in labelnames order."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        for key, series in items:
+            base = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                labels = _format_labels(base + [("le", _format_value(float(bound)))])
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(base)
+            yield f"{self.name}_sum{labels} {_format_value(series[-1])}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class Registry:
+    def __init__(self):
+        self.request_duration = Histogram(
+            "finance_http_request_duration_seconds",
+            "Request latency.",
+            LATENCY_BUCKETS,
+            ("method", "endpoint", "status"),
+        )
+        self.response_size = Histogram(
+            "finance_http_response_size_bytes",
+            "Response body size (non-streamed responses).",
+            SIZE_BUCKETS,
+            ("endpoint",),
+        )
+        self.request_statements = Histogram(
+            "finance_request_sql_statements",
+            "SQL statements executed per request.",
+            COUNT_BUCKETS,
+            ("endpoint",),
+        )
+        self.request_rows = Histogram(
+            "finance_request_rows",
+            "ORM instances and plain rows hydrated per request.",
+            ROW_BUCKETS,
+            ("endpoint",),
+        )
+        self.request_phase = Histogram(
+            "finance_request_phase_seconds",
+            "Time per request spent in auth, sql, json and everything else.",
+            LATENCY_BUCKETS,
+            ("endpoint", "phase"),
+        )
+        self.query_duration = Histogram(
+            "finance_sql_query_duration_seconds",
+            "SQL statement latency, all statements.",
+            SQL_BUCKETS,
+            ("operation",),
+        )
+        self.slow_queries = Counter(
+            "finance_sql_slow_queries_total",
+            "Statements slower than SLOW_QUERY_MS.",
+            ("operation",),
+        )
+
+    def render(self) -> str:
+        lines = []
+        for metric in (
+            self.request_duration,
+            self.response_size,
+            self.request_statements,
+            self.request_rows,
+            self.request_phase,
+            self.query_duration,
+            self.slow_queries,
+        ):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# -------------------------------------------------
+# Per-request state
+# -------------------------------------------------
+
+class RequestStats:
+    __slots__ = ("started", "statements", "rows", "phases")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.statements = 0
+        self.rows = 0
+        self.phases = dict.fromkeys(PHASES, 0.0)
+
+
+def get_registry() -> Registry:
+    return current_app.extensions["metrics"]
+
+
+def _current_stats():
+    if has_request_context():
+        return g.get("request_stats")
+    return None
+
+
+@contextmanager
+def timed(phase: str):
+    """Adds the block's wall time to the current request's phase."""
+    stats = _current_stats()
+    if stats is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.phases[phase] += time.perf_counter() - started
+
+
+def _endpoint() -> str:
+    rule = request.url_rule
+    return rule.rule if rule is not None else "unmatched"
+
+
+def _before_request():
+    g.request_stats = RequestStats()
+
+
+def _record(registry, config, stats, method, endpoint, status, size):
+    total = time.perf_counter() - stats.started
+    registry.request_duration.observe(total, method, endpoint, status)
+    if size is not None:
+        registry.response_size.observe(size, endpoint)
+    registry.request_statements.observe(stats.statements, endpoint)
+    registry.request_rows.observe(stats.rows, endpoint)
+
+    other = total
+    for phase, seconds in stats.phases.items():
+        registry.request_phase.observe(seconds, endpoint, phase)
+        other -= seconds
+    registry.request_phase.observe(max(0.0, other), endpoint, "other")
+
+    threshold = config.get("SLOW_REQUEST_MS")
+    if threshold is not None and total * 1000 >= float(threshold):
+        phases = " ".join(f"{k}={v * 1000:.1f}ms" for k, v in stats.phases.items())
+        slow_request_logger.warning(
+            "%s %s %s took %.1fms: %d statements, %d rows, %s",
+            method, endpoint, status, total * 1000, stats.statements, stats.rows, phases,
+        )
+
+
+def _after_request(response):
+    stats = g.pop("request_stats", None)
+    if stats is None:
+        return response
+
+    args = (
+        get_registry(),
+        current_app.config,
+        stats,
+        request.method,
+        _endpoint(),
+        str(response.status_code),
+    )
+    if response.is_streamed:
+        # the body is produced after this hook: record once it is sent
+        response.call_on_close(lambda: _record(*args, None))
+        # queries run while streaming still count against this request
+        g.request_stats = stats
+    else:
+        _record(*args, response.calculate_content_length())
+    return response
+
+
+# -------------------------------------------------
+# SQL and row hooks
+# -------------------------------------------------
+
+def parameter_shape(parameters, executemany: bool = False) -> str:
+    """Types and sizes of bound parameters, without their values."""
+    if executemany:
+        if not parameters:
+            return "[]"
+        return f"{len(parameters)} x {parameter_shape(parameters[0])}"
+    if parameters is None:
+        return "()"
+    if isinstance(parameters, dict):
+        shapes = [f"{k}: {_value_shape(v)}" for k, v in parameters.items()]
+        opening, closing = "{", "}"
+    else:
+        shapes = [_value_shape(v) for v in parameters]
+        opening, closing = "(", ")"
+    if len(shapes) > MAX_LOGGED_PARAMS:
+        more = len(shapes) - MAX_LOGGED_PARAMS
+        shapes = shapes[:MAX_LOGGED_PARAMS] + [f"... {more} more"]
+    return opening + ", ".join(shapes) + closing
+
+
+def _value_shape(value) -> str:
+    if isinstance(value, (str, bytes, list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def install_sql_instrumentation(engine, registry: Registry, config) -> None:
+    """Times every statement on the engine; logs the slow ones."""
+    threshold = config.get("SLOW_QUERY_MS")
+    threshold = None if threshold is None else float(threshold) / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_timer(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement else ""
+        registry.query_duration.observe(elapsed, operation)
+
+        stats = _current_stats()
+        if stats is not None:
+            stats.statements += 1
+            stats.phases["sql"] += elapsed
+
+        if threshold is not None and elapsed >= threshold:
+            registry.slow_queries.inc(operation)
+            text = " ".join(statement.split())
+            if len(text) > MAX_LOGGED_STATEMENT:
+                text = text[:MAX_LOGGED_STATEMENT] + " ..."
+            slow_query_logger.warning(
+                "%.1fms %s params=%s",
+                elapsed * 1000,
+                text,
+                parameter_shape(parameters, executemany),
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def drop_timer(exception_context):
+        started = exception_context.connection and exception_context.connection.info.get(
+            "query_started"
+        )
+        if started:
+            started.pop()
+
+
+_orm_hook_installed = False
+
+
+def _count_loaded(target, context):
+    stats = _current_stats()
+    if stats is not None:
+        stats.rows += 1
+
+
+def count_rows(count: int) -> None:
+    """
+    Adds plain rows turned into response objects (e.g. by row_to_dict) to
+    the current request's rows; call once per batch, not per row.
+    """
+    stats = _current_stats()
+    if stats is not None:
+        stats.rows += count
+
+
+def install_orm_instrumentation() -> None:
+    """Counts ORM instances hydrated (a process-wide mapper event)."""
+    global _orm_hook_installed
+    if not _orm_hook_installed:
+        event.listen(Mapper, "load", _count_loaded)
+        _orm_hook_installed = True
+
+
+# -------------------------------------------------
+# JSON serialization
+# -------------------------------------------------
+
+class InstrumentedJSONProvider(FastJSONProvider):
+    """The app's JSON provider, timing encode() as the request's json phase."""
+
+    def encode(self, obj) -> bytes:
+        with timed("json"):
+            return super().encode(obj)
+
+
+# -------------------------------------------------
+# Setup and exposition
+# -------------------------------------------------
+
+def init_metrics(app) -> None:
+    """Installs the request, SQL and ORM hooks unless METRICS_ENABLED is off."""
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+
+    registry = Registry()
+    app.extensions["metrics"] = registry
+    app.json = InstrumentedJSONProvider(app)
+
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+
+    from db import db
+
+    with app.app_context():
+        install_sql_instrumentation(db.engine, registry, app.config)
+    install_orm_instrumentation()
+
+
+def metrics_enabled() -> bool:
+    return "metrics" in current_app.extensions
+
+
+def render_metrics() -> str:
+    return get_registry().render()
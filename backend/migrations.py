@@ -0,0 +1,356 @@
+# backend/migrations.py
+"""
+Minimal schema migrations for the SQLite database.
+
+db.create_all() only creates missing tables, it never alters an existing
+finance.db. Each migration below runs once, in order, and the last applied
+version is stored in SQLite's PRAGMA user_version.
+
+A step is either a SQL string or a callable taking the connection.
+Steps should be idempotent so a fresh database (already created by
+create_all) can run them safely.
+"""
+import os
+
+from flask import current_app, has_app_context
+from sqlalchemy import text
+
+from budgets import evaluate_alerts
+from fx import CONVERTED_VIEW, create_converted_view, load_rates, normalize_user_currencies
+from models import (
+    BudgetAlert,
+    Forecast,
+    FxRate,
+    ImportJob,
+    MonthlyCategoryTotal,
+    Transaction,
+    UnparsedTransaction,
+)
+from normalize import DEFAULT_CURRENCY, FingerprintCounter, parse_amount_minor, parse_date
+from rollup import rebuild_rollups
+from search import create_search_index
+
+# Legacy rows converted per round trip in migration 4.
+CONVERT_BATCH_SIZE = 5000
+
+
+def _column_names(conn, table: str) -> set:
+    return {row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))}
+
+
+def add_users_data_version(conn) -> None:
+    if "data_version" not in _column_names(conn, "users"):
+        conn.execute(
+            text(
+                "ALTER TABLE users "
+                "ADD COLUMN data_version INTEGER NOT NULL DEFAULT 0"
+            )
+        )
+
+
+def _has_typed_transactions(conn) -> bool:
+    return "amount_minor" in _column_names(conn, "transactions")
+
+
+def _has_currencies(conn) -> bool:
+    return "currency" in _column_names(conn, "transactions") and "currency" in (
+        _column_names(conn, "monthly_category_totals")
+    )
+
+
+def _has_converted_view(conn) -> bool:
+    return conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'view' AND name = :name"),
+        {"name": CONVERTED_VIEW},
+    ).scalar() is not None
+
+
+def backfill_rollups(conn) -> None:
+    # Legacy (untyped) tables are backfilled by migration 4 after conversion,
+    # tables without currencies by migration 10.
+    if _has_typed_transactions(conn) and _has_currencies(conn):
+        rebuild_rollups(conn)
+
+
+def convert_transactions_to_typed_columns(conn) -> None:
+    """
+    Rebuilds transactions with a DATE column and integer amount_minor
+    (SQLite cannot alter column types in place). Dates and amounts are
+    normalized with the same parsers as ingest; rows that fail are moved
+    to unparsed_transactions with the reason. The rollup is rebuilt in
+    minor units afterwards.
+    """
+    if _has_typed_transactions(conn):
+        return
+
+    UnparsedTransaction.__table__.create(conn, checkfirst=True)
+
+    conn.execute(text("DROP INDEX IF EXISTS ix_transactions_user_date"))
+    conn.execute(text("DROP INDEX IF EXISTS ix_transactions_user_category_amount"))
+    conn.execute(text("DROP INDEX IF EXISTS ux_transactions_user_fingerprint"))
+    conn.execute(text("ALTER TABLE transactions RENAME TO transactions_legacy"))
+    Transaction.__table__.create(conn)
+
+    legacy = conn.execute(
+        text(
+            "SELECT id, date, description, amount, category, user_id "
+            "FROM transactions_legacy ORDER BY id"
+        )
+    )
+    counters = {}
+    while True:
+        rows = legacy.fetchmany(CONVERT_BATCH_SIZE)
+        if not rows:
+            break
+
+        converted = []
+        unparsed = []
+        for row in rows:
+            try:
+                amount_minor = parse_amount_minor(row.amount)
+                day = parse_date(row.date)
+            except ValueError as e:
+                unparsed.append(
+                    {
+                        "original_id": row.id,
+                        "user_id": row.user_id,
+                        "raw_date": None if row.date is None else str(row.date),
+                        "raw_amount": None if row.amount is None else str(row.amount),
+                        "description": row.description,
+                        "category": row.category,
+                        "reason": str(e),
+                    }
+                )
+                continue
+
+            fingerprint = counters.get(row.user_id)
+            if fingerprint is None:
+                fingerprint = counters[row.user_id] = FingerprintCounter(
+                    row.user_id, bounded=False
+                )
+
+            converted.append(
+                {
+                    "id": row.id,
+                    "date": day,
+                    "description": row.description or "",
+                    "amount_minor": amount_minor,
+                    "category": row.category,
+                    "user_id": row.user_id,
+                    "fingerprint": fingerprint(day, amount_minor, row.description),
+                }
+            )
+
+        if converted:
+            conn.execute(Transaction.__table__.insert(), converted)
+        if unparsed:
+            conn.execute(UnparsedTransaction.__table__.insert(), unparsed)
+
+    conn.execute(text("DROP TABLE transactions_legacy"))
+
+    conn.execute(text("DROP TABLE IF EXISTS monthly_category_totals"))
+    MonthlyCategoryTotal.__table__.create(conn)
+    rebuild_rollups(conn)
+
+
+def add_transaction_fingerprints(conn) -> None:
+    """
+    Adds transactions.fingerprint, backfills it in id order (so existing
+    repeats get occurrence 0, 1, ...) and creates the unique index.
+    Tables converted by migration 4 already have the column filled.
+    """
+    if "fingerprint" not in _column_names(conn, "transactions"):
+        conn.execute(text("ALTER TABLE transactions ADD COLUMN fingerprint VARCHAR(32)"))
+
+        counters = {}
+        rows = conn.execute(
+            text(
+                "SELECT id, user_id, date, amount_minor, description "
+                "FROM transactions ORDER BY id"
+            )
+        )
+        while True:
+            batch = rows.fetchmany(CONVERT_BATCH_SIZE)
+            if not batch:
+                break
+
+            updates = []
+            for row in batch:
+                fingerprint = counters.get(row.user_id)
+                if fingerprint is None:
+                    fingerprint = counters[row.user_id] = FingerprintCounter(
+                        row.user_id, bounded=False
+                    )
+                day = parse_date(row.date)
+                updates.append(
+                    {
+                        "id": row.id,
+                        "fingerprint": fingerprint(day, row.amount_minor, row.description),
+                    }
+                )
+            conn.execute(
+                text("UPDATE transactions SET fingerprint = :fingerprint WHERE id = :id"),
+                updates,
+            )
+
+    conn.execute(
+        text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ux_transactions_user_fingerprint "
+            "ON transactions (user_id, fingerprint)"
+        )
+    )
+
+
+def add_import_jobs_duplicates(conn) -> None:
+    if "duplicates" not in _column_names(conn, "import_jobs"):
+        conn.execute(
+            text(
+                "ALTER TABLE import_jobs "
+                "ADD COLUMN duplicates INTEGER NOT NULL DEFAULT 0"
+            )
+        )
+
+
+def create_budget_alerts(conn) -> None:
+    """Creates budget_alerts and records the thresholds already crossed."""
+    BudgetAlert.__table__.create(conn, checkfirst=True)
+    # before migration 10 there are no converted totals; it evaluates them
+    if _has_converted_view(conn):
+        evaluate_alerts(conn)
+
+
+def create_forecasts_table(conn) -> None:
+    Forecast.__table__.create(conn, checkfirst=True)
+
+
+def create_import_jobs_table(conn) -> None:
+    ImportJob.__table__.create(conn, checkfirst=True)
+
+
+def add_transaction_currency(conn) -> None:
+    if "currency" not in _column_names(conn, "transactions"):
+        conn.execute(
+            text(
+                "ALTER TABLE transactions ADD COLUMN "
+                f"currency VARCHAR(3) NOT NULL DEFAULT '{DEFAULT_CURRENCY}'"
+            )
+        )
+
+
+def create_fx_rates(conn) -> None:
+    """
+    Creates fx_rates, loaded from FX_RATES_PATH if the file exists. The
+    profile used to take any code, so users whose default currency is
+    unset or has no rates in the file fall back to DEFAULT_CURRENCY;
+    their totals could not be converted and their uploads would be
+    rejected. Without a file, currencies are left alone.
+    """
+    FxRate.__table__.create(conn, checkfirst=True)
+    path = current_app.config.get("FX_RATES_PATH") if has_app_context() else None
+    if path and os.path.exists(path):
+        normalize_user_currencies(conn, load_rates(conn, path))
+
+
+def add_rollup_currency(conn) -> None:
+    """
+    Recreates the rollup keyed by currency too, then the conversion view,
+    and records the budget alerts crossed by the converted totals.
+    """
+    if "currency" not in _column_names(conn, "monthly_category_totals"):
+        conn.execute(text("DROP TABLE monthly_category_totals"))
+        MonthlyCategoryTotal.__table__.create(conn)
+    rebuild_rollups(conn)
+    create_converted_view(conn)
+    evaluate_alerts(conn)
+
+
+MIGRATIONS = [
+    (
+        1,
+        "composite indexes on transactions",
+        [
+            "CREATE INDEX IF NOT EXISTS ix_transactions_user_date "
+            "ON transactions (user_id, date)",
+            "CREATE INDEX IF NOT EXISTS ix_transactions_user_category_amount "
+            "ON transactions (user_id, category, amount)",
+        ],
+    ),
+    (
+        2,
+        "backfill monthly_category_totals",
+        [backfill_rollups],
+    ),
+    (
+        3,
+        "users.data_version for cache invalidation",
+        [add_users_data_version],
+    ),
+    (
+        4,
+        "typed date and integer minor-unit amount on transactions",
+        [convert_transactions_to_typed_columns],
+    ),
+    (
+        5,
+        "forecasts table",
+        [create_forecasts_table],
+    ),
+    (
+        6,
+        "import_jobs table",
+        [create_import_jobs_table],
+    ),
+    (
+        7,
+        "transaction fingerprints for duplicate detection",
+        [add_transaction_fingerprints, add_import_jobs_duplicates],
+    ),
+    (
+        8,
+        "goal index and budget alerts",
+        [
+            "CREATE INDEX IF NOT EXISTS ix_goals_user_category "
+            "ON goals (user_id, category)",
+            create_budget_alerts,
+        ],
+    ),
+    (
+        9,
+        "full-text search index on transaction descriptions",
+        [create_search_index],
+    ),
+    (
+        10,
+        "transaction currencies and exchange rates",
+        [add_transaction_currency, create_fx_rates, add_rollup_currency],
+    ),
+]
+
+
+def get_schema_version(conn) -> int:
+    return conn.execute(text("PRAGMA user_version")).scalar() or 0
+
+
+def run_migrations(engine) -> list:
+    """
+    Applies every migration newer than the database's user_version.
+    Returns the list of (version, description) that were applied.
+    """
+    applied = []
+
+    for version, description, steps in MIGRATIONS:
+        with engine.begin() as conn:
+            if get_schema_version(conn) >= version:
+                continue
+
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(text(step))
+
+            conn.execute(text(f"PRAGMA user_version = {int(version)}"))
+
+        applied.append((version, description))
+
+    return applied
@@ -2,5 +2,21 @@
 from .user import User
 from .transaction import Transaction
 from .goal import Goal
+from .monthly_total import MonthlyCategoryTotal
+from .unparsed_transaction import UnparsedTransaction
+from .forecast import Forecast
+from .import_job import ImportJob
+from .budget_alert import BudgetAlert
+from .fx_rate import FxRate
 
-__all__ = ["User", "Transaction", "Goal"]
+__all__ = [
+    "User",
+    "Transaction",
+    "Goal",
+    "MonthlyCategoryTotal",
+    "UnparsedTransaction",
+    "Forecast",
+    "ImportJob",
+    "BudgetAlert",
+    "FxRate",
+]
@@ -0,0 +1,51 @@
+# backend/models/budget_alert.py
+from sqlalchemy import select
+
+from db import db
+from normalize import minor_to_amount
+
+
+class BudgetAlert(db.Model):
+    """
+    A goal's spending crossing a threshold (percent of monthly_limit) in
+    one month. Recorded once, when an import or goal change first pushes
+    the rollup past it (see budgets.evaluate_alerts).
+    """
+
+    __tablename__ = "budget_alerts"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    year_month = db.Column(db.String(7), primary_key=True)  # "YYYY-MM"
+    category = db.Column(db.String(50), primary_key=True)
+    threshold = db.Column(db.Integer, primary_key=True)  # percent
+
+    spent_minor = db.Column(db.Integer, nullable=False)  # spend when evaluated
+    monthly_limit = db.Column(db.Float, nullable=False)
+
+    def to_dict(self) -> dict:
+        return {
+            "year_month": self.year_month,
+            "category": self.category,
+            "threshold": self.threshold,
+            "spent": minor_to_amount(self.spent_minor),
+            "monthly_limit": self.monthly_limit,
+        }
+
+    # plain-row read path, as for Transaction
+    @classmethod
+    def api_select(cls):
+        return select(
+            cls.year_month, cls.category, cls.threshold, cls.spent_minor, cls.monthly_limit
+        )
+
+    @staticmethod
+    def row_to_dict(row) -> dict:
+        """to_dict() for a row of api_select()."""
+        year_month, category, threshold, spent_minor, monthly_limit = row
+        return {
+            "year_month": year_month,
+            "category": category,
+            "threshold": threshold,
+            "spent": minor_to_amount(spent_minor),
+            "monthly_limit": monthly_limit,
+        }
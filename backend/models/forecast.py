@@ -0,0 +1,24 @@
+# backend/models/forecast.py
+from db import db
+
+
+class Forecast(db.Model):
+    """
+    Precomputed next-month forecast, one row per (user, basis month,
+    category). Written by `flask compute-forecasts` and memoized by
+    /api/forecast; a row only counts while data_version matches the
+    user's current one. Amounts are integer minor units.
+    """
+
+    __tablename__ = "forecasts"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    # last month of history used, "YYYY-MM", or "latest" for the unfiltered view
+    basis_month = db.Column(db.String(7), primary_key=True)
+    category = db.Column(db.String(50), primary_key=True)
+
+    data_version = db.Column(db.Integer, nullable=False)
+    target_month = db.Column(db.String(7), nullable=False)
+    model = db.Column(db.String(30), nullable=False)
+    current_minor = db.Column(db.Integer, nullable=False)
+    forecast_minor = db.Column(db.Integer, nullable=False)
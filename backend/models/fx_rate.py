@@ -0,0 +1,17 @@
+# backend/models/fx_rate.py
+from db import db
+
+
+class FxRate(db.Model):
+    """
+    Exchange rate of one currency for one month: how many units of
+    normalize.DEFAULT_CURRENCY one unit of `currency` is worth (monthly
+    average). Loaded from a local file by fx.load_rates(); months without
+    a row use the latest earlier one (see fx.py).
+    """
+
+    __tablename__ = "fx_rates"
+
+    currency = db.Column(db.String(3), primary_key=True)
+    year_month = db.Column(db.String(7), primary_key=True)  # "YYYY-MM"
+    rate = db.Column(db.Float, nullable=False)
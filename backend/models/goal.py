@@ -1,9 +1,15 @@
 # backend/models/goal.py
+from sqlalchemy import select
+
 from db import db
 
 
 class Goal(db.Model):
     __tablename__ = "goals"
+    __table_args__ = (
+        # per-user goal lookups and the goals x rollup join
+        db.Index("ix_goals_user_category", "user_id", "category"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     category = db.Column(db.String(50), nullable=False)
@@ -18,3 +24,14 @@ class Goal(db.Model):
             "category": self.category,
             "monthly_limit": self.monthly_limit,
         }
+
+    # plain-row read path, as for Transaction
+    @classmethod
+    def api_select(cls):
+        return select(cls.id, cls.category, cls.monthly_limit)
+
+    @staticmethod
+    def row_to_dict(row) -> dict:
+        """to_dict() for a row of api_select()."""
+        goal_id, category, monthly_limit = row
+        return {"id": goal_id, "category": category, "monthly_limit": monthly_limit}
@@ -0,0 +1,63 @@
+# backend/models/import_job.py
+import json
+
+from db import db
+
+
+class ImportJob(db.Model):
+    """
+    A CSV upload processed in the background (see imports.py).
+
+    The file is spooled to spool_path; rows_processed counts the data rows
+    whose batch has been committed, so a restarted worker resumes there.
+    heartbeat_at (epoch seconds) is refreshed on every batch and tells a
+    live job apart from one whose worker died.
+    """
+
+    __tablename__ = "import_jobs"
+    __table_args__ = (db.Index("ix_import_jobs_status", "status"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    status = db.Column(db.String(20), nullable=False)  # queued/running/done/failed
+    filename = db.Column(db.String(255), nullable=True)
+    spool_path = db.Column(db.String(500), nullable=False)
+
+    total_rows = db.Column(db.Integer, nullable=False, default=0)  # estimate
+    rows_processed = db.Column(db.Integer, nullable=False, default=0)
+    inserted = db.Column(db.Integer, nullable=False, default=0)
+    duplicates = db.Column(db.Integer, nullable=False, default=0)
+    rejected = db.Column(db.Integer, nullable=False, default=0)
+    rejected_rows = db.Column(db.Text, nullable=False, default="[]")  # JSON
+    min_date = db.Column(db.Date, nullable=True)
+    max_date = db.Column(db.Date, nullable=True)
+
+    error = db.Column(db.String(500), nullable=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    heartbeat_at = db.Column(db.Float, nullable=False)
+
+    def to_dict(self) -> dict:
+        if self.status == "done":
+            progress = 1.0
+        elif self.total_rows:
+            progress = min(1.0, self.rows_processed / self.total_rows)
+        else:
+            progress = 0.0
+
+        return {
+            "id": self.id,
+            "status": self.status,
+            "filename": self.filename,
+            "progress": round(progress, 4),
+            "total_rows": self.total_rows,
+            "rows_processed": self.rows_processed,
+            "count": self.inserted,
+            "duplicates": self.duplicates,
+            "rejected": self.rejected,
+            "rejected_rows": json.loads(self.rejected_rows or "[]"),
+            "date_range": {
+                "start": self.min_date.isoformat() if self.min_date else None,
+                "end": self.max_date.isoformat() if self.max_date else None,
+            },
+            "error": self.error,
+        }
@@ -0,0 +1,36 @@
+# backend/models/monthly_total.py
+from db import db
+from normalize import minor_to_amount
+
+
+class MonthlyCategoryTotal(db.Model):
+    """
+    Per-user rollup of transactions by month, category and currency.
+    Maintained by the ingest and reset paths, rebuilt by `flask rebuild-rollups`.
+    Amounts are integer minor units of `currency`, like
+    transactions.amount_minor; reads convert them through the
+    monthly_totals_converted view (see fx.py).
+    """
+
+    __tablename__ = "monthly_category_totals"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    year_month = db.Column(db.String(7), primary_key=True)  # "YYYY-MM"
+    category = db.Column(db.String(50), primary_key=True)
+    currency = db.Column(db.String(3), primary_key=True)
+
+    total_minor = db.Column(db.Integer, nullable=False, default=0)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    min_minor = db.Column(db.Integer, nullable=False)
+    max_minor = db.Column(db.Integer, nullable=False)
+
+    def to_dict(self) -> dict:
+        return {
+            "year_month": self.year_month,
+            "category": self.category,
+            "currency": self.currency,
+            "total": minor_to_amount(self.total_minor),
+            "count": self.count,
+            "min_amount": minor_to_amount(self.min_minor),
+            "max_amount": minor_to_amount(self.max_minor),
+        }
@@ -1,24 +1,73 @@
 # backend/models/transaction.py
+from sqlalchemy import select
+
 from db import db
+from normalize import DEFAULT_CURRENCY, minor_to_amount
 
 
 class Transaction(db.Model):
     __tablename__ = "transactions"
+    __table_args__ = (
+        # per-user date range scans (list + month filter)
+        db.Index("ix_transactions_user_date", "user_id", "date"),
+        # covering index for per-user category totals
+        db.Index(
+            "ix_transactions_user_category_amount",
+            "user_id",
+            "category",
+            "amount_minor",
+        ),
+        # idempotent imports: a re-uploaded row hits this and is skipped
+        db.Index(
+            "ux_transactions_user_fingerprint", "user_id", "fingerprint", unique=True
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    date = db.Column(db.String(20), nullable=False)  # "YYYY-MM-DD"
+    date = db.Column(db.Date, nullable=False)
     description = db.Column(db.String(255), nullable=False)
-    amount = db.Column(db.Float, nullable=False)
+    amount_minor = db.Column(db.Integer, nullable=False)  # paise, signed
+    currency = db.Column(
+        db.String(3), nullable=False, default=DEFAULT_CURRENCY, server_default=DEFAULT_CURRENCY
+    )
     category = db.Column(db.String(50), nullable=False)
+    # see normalize.FingerprintCounter
+    fingerprint = db.Column(db.String(32), nullable=False)
 
     # link to user
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
 
+    @property
+    def amount(self) -> float:
+        return minor_to_amount(self.amount_minor)
+
     def to_dict(self) -> dict:
         return {
             "id": self.id,
-            "date": self.date,
+            "date": self.date.isoformat(),
             "description": self.description,
             "amount": self.amount,
+            "currency": self.currency,
             "category": self.category,
         }
+
+    # Read paths select these plain columns instead of hydrating
+    # instances: no identity map, no per-object state.
+    @classmethod
+    def api_select(cls):
+        return select(
+            cls.id, cls.date, cls.description, cls.amount_minor, cls.currency, cls.category
+        )
+
+    @staticmethod
+    def row_to_dict(row) -> dict:
+        """to_dict() for a row of api_select()."""
+        tx_id, day, description, amount_minor, currency, category = row
+        return {
+            "id": tx_id,
+            "date": day.isoformat(),
+            "description": description,
+            "amount": minor_to_amount(amount_minor),
+            "currency": currency,
+            "category": category,
+        }
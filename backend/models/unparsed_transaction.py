@@ -0,0 +1,33 @@
+# backend/models/unparsed_transaction.py
+from db import db
+
+
+class UnparsedTransaction(db.Model):
+    """
+    Legacy rows whose date or amount could not be normalized when the
+    transactions table moved to typed columns. Kept verbatim for review
+    (`flask unparsed-report`) instead of being dropped.
+    """
+
+    __tablename__ = "unparsed_transactions"
+
+    id = db.Column(db.Integer, primary_key=True)
+    original_id = db.Column(db.Integer, nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
+    raw_date = db.Column(db.String(50), nullable=True)
+    raw_amount = db.Column(db.String(50), nullable=True)
+    description = db.Column(db.String(255), nullable=True)
+    category = db.Column(db.String(50), nullable=True)
+    reason = db.Column(db.String(255), nullable=False)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "original_id": self.original_id,
+            "user_id": self.user_id,
+            "raw_date": self.raw_date,
+            "raw_amount": self.raw_amount,
+            "description": self.description,
+            "category": self.category,
+            "reason": self.reason,
+        }
@@ -1,6 +1,6 @@
 # backend/models/user.py
-from werkzeug.security import generate_password_hash, check_password_hash
 from db import db
+from passwords import hash_password, needs_rehash, verify_password
 
 
 class User(db.Model):
@@ -17,6 +17,9 @@ class User(db.Model):
     phone = db.Column(db.String(50), nullable=True)
     default_currency = db.Column(db.String(10), nullable=True, default="INR")
 
+    # bumped on every write to the user's data; part of every cache key
+    data_version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
     # relationships
     transactions = db.relationship(
         "Transaction", backref="user", lazy=True, cascade="all, delete-orphan"
@@ -26,11 +29,16 @@ class User(db.Model):
     )
 
     # ---------- auth helpers ----------
+    # Hashing runs in the passwords process pool and may raise
+    # PasswordHasherBusy when the queue is saturated.
     def set_password(self, password: str) -> None:
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password: str) -> bool:
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
+
+    def password_needs_rehash(self) -> bool:
+        return needs_rehash(self.password_hash)
 
     # ---------- profile serialization ----------
     def to_profile_dict(self) -> dict:
@@ -0,0 +1,168 @@
+# backend/normalize.py
+"""
+Parsing of raw statement values into the stored representation:
+dates become datetime.date, amounts become integer minor units (paise,
+cents: hundredths of the transaction's currency).
+Used once at ingest and by the migration of legacy rows.
+
+Also the transaction fingerprint that makes re-imports idempotent.
+"""
+import hashlib
+import re
+from datetime import date, datetime
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+# 1 rupee = 100 paise; every currency is stored in hundredths
+MINOR_UNITS = 100
+
+# Largest amount stored, in minor units: well inside SQLite's 64-bit
+# INTEGER, with room for the rollup's sums, and exact as a float.
+MAX_AMOUNT_MINOR = 2**53 - 1
+
+# Currency of rows that do not name one (every row before multi-currency).
+DEFAULT_CURRENCY = "INR"
+
+# Tried in order. Day-first before month-first, as in Indian bank exports.
+DATE_FORMATS = [
+    "%Y-%m-%d",
+    "%d/%m/%Y",
+    "%d-%m-%Y",
+    "%d.%m.%Y",
+    "%Y/%m/%d",
+    "%d/%m/%y",
+    "%d-%m-%y",
+    "%d %b %Y",
+    "%d-%b-%Y",
+    "%d %B %Y",
+    "%b %d, %Y",
+]
+
+
+def parse_date(value) -> date:
+    """Raises ValueError when the value matches none of DATE_FORMATS."""
+    if isinstance(value, date):
+        return value
+
+    text = (value or "").strip()
+    if not text:
+        raise ValueError("missing date")
+
+    # fast path for the common ISO case
+    try:
+        return date.fromisoformat(text[:10])
+    except ValueError:
+        pass
+
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+
+    raise ValueError(f"unrecognised date {text!r}")
+
+
+def parse_amount_minor(value) -> int:
+    """
+    "1,200.50" -> 120050. Rounds half-up to the nearest minor unit.
+    Raises ValueError for missing or non-numeric amounts, and for amounts
+    beyond MAX_AMOUNT_MINOR.
+    """
+    if isinstance(value, int):
+        return _checked_minor(value * MINOR_UNITS, value)
+
+    text = str(value if value is not None else "").strip().replace(",", "")
+    if not text:
+        raise ValueError("missing amount")
+
+    try:
+        amount = Decimal(text)
+    except InvalidOperation:
+        raise ValueError(f"invalid amount {text!r}")
+
+    if not amount.is_finite():
+        raise ValueError(f"invalid amount {text!r}")
+
+    # "1e999999" would overflow the Decimal context or take a while as an int
+    if amount.adjusted() > len(str(MAX_AMOUNT_MINOR)):
+        raise ValueError(f"amount out of range {text!r}")
+
+    return _checked_minor(
+        int((amount * MINOR_UNITS).to_integral_value(rounding=ROUND_HALF_UP)), text
+    )
+
+
+def _checked_minor(minor: int, value) -> int:
+    if abs(minor) > MAX_AMOUNT_MINOR:
+        raise ValueError(f"amount out of range {value!r}")
+    return minor
+
+
+def minor_to_amount(minor) -> float:
+    """Integer minor units -> float major units for JSON responses."""
+    return (minor or 0) / MINOR_UNITS
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_description(value) -> str:
+    """Case- and whitespace-insensitive form used for fingerprints."""
+    return _WHITESPACE_RE.sub(" ", (value or "").strip().lower())
+
+
+class FingerprintCounter:
+    """
+    Fingerprints for a stream of transactions of one user.
+
+    Identical (date, amount, description) rows are legitimate (two coffees
+    on one day), so the n-th repeat within the stream gets occurrence n.
+    Re-importing the same or an overlapping statement then yields the
+    same fingerprints, and the unique index drops them.
+
+    Counts are kept per date. Statements are sorted by date (either way),
+    so once the stream has moved past a date its counts are dropped and
+    memory stays bounded by one day's rows. A dropped date that comes
+    back (an unsorted file) is counted afresh as a new segment, tagged in
+    its fingerprints, so its repeats never collide with the earlier ones.
+    bounded=False keeps every count instead (rows in id order, not date
+    order, as the migrations walk them).
+    """
+
+    def __init__(self, user_id: int, bounded: bool = True):
+        self.user_id = user_id
+        self.bounded = bounded
+        self._seen = {}  # date -> {key: count}
+        self._direction = 0  # +1 ascending, -1 descending once known
+        self._last = None
+        self._segments = {}  # date -> segment of its counts, once dropped
+
+    def _advance(self, day: date) -> None:
+        if self._last is not None and day != self._last:
+            step = 1 if day > self._last else -1
+            if not self._direction:
+                self._direction = step
+            if step == self._direction:
+                for passed in [d for d in self._seen if (day - d).days * step > 0]:
+                    del self._seen[passed]
+                    self._segments[passed] = self._segments.get(passed, 0) + 1
+        self._last = day
+
+    def __call__(
+        self, day: date, amount_minor: int, description, currency: str = DEFAULT_CURRENCY
+    ) -> str:
+        if self.bounded:
+            self._advance(day)
+        key = (amount_minor, normalize_description(description), currency)
+        seen = self._seen.setdefault(day, {})
+        occurrence = seen.get(key, 0)
+        seen[key] = occurrence + 1
+
+        segment = self._segments.get(day)
+        if segment:
+            occurrence = f"{occurrence}/{segment}"
+        raw = f"{self.user_id}|{day.isoformat()}|{amount_minor}|{key[1]}|{occurrence}"
+        if currency != DEFAULT_CURRENCY:
+            # INR rows keep the fingerprints they had before currencies
+            raw += f"|{currency}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
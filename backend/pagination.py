@@ -0,0 +1,76 @@
+# backend/pagination.py
+"""
+Keyset (cursor) pagination over transactions ordered by (date, id).
+
+Cursors are opaque to clients: a urlsafe base64 of the last row's
+(date, id). The next page is everything strictly after that pair, which
+the (user_id, date) index serves directly without OFFSET scans.
+"""
+import base64
+import json
+from datetime import date
+
+from sqlalchemy import tuple_
+
+from db import db
+from models import Transaction
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(day: date, tx_id: int) -> str:
+    raw = json.dumps([day.isoformat(), tx_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        day, tx_id = json.loads(base64.urlsafe_b64decode(padded))
+        day = date.fromisoformat(day)
+    except (ValueError, TypeError):
+        raise InvalidCursor("Invalid cursor")
+
+    if not isinstance(tx_id, int):
+        raise InvalidCursor("Invalid cursor")
+    return day, tx_id
+
+
+def parse_limit(value) -> int:
+    """Raises ValueError for non-numeric or out-of-range limits."""
+    if value in (None, ""):
+        return DEFAULT_PAGE_SIZE
+
+    limit = int(value)
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return limit
+
+
+def apply_keyset(query, cursor):
+    """Orders a Transaction select by (date, id) and skips past the cursor."""
+    if cursor:
+        day, tx_id = decode_cursor(cursor)
+        query = query.filter(tuple_(Transaction.date, Transaction.id) > (day, tx_id))
+    return query.order_by(Transaction.date, Transaction.id)
+
+
+def fetch_page(query, cursor, limit: int):
+    """
+    Runs the select and returns (rows, next_cursor). Fetches one extra
+    row to know whether another page exists, so no COUNT query is needed.
+    """
+    rows = db.session.execute(apply_keyset(query, cursor).limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.date, last.id)
+
+    return rows, next_cursor
@@ -0,0 +1,103 @@
+# backend/passwords.py
+"""
+Password hashing off the request thread.
+
+Hashes are computed in a small process pool so a login burst cannot pin
+every web worker. The number of hashes queued or running is bounded;
+past that, callers get PasswordHasherBusy immediately and the route
+answers 503 instead of piling up requests.
+
+Settings (app config, applied through configure()):
+    PASSWORD_HASH_METHOD   werkzeug method string, e.g. "scrypt:32768:8:1"
+                           or "pbkdf2:sha256:600000"
+    PASSWORD_HASH_WORKERS  pool size; 0 hashes inline (CLI, tests)
+    PASSWORD_HASH_QUEUE    max hashes queued or running per web worker
+"""
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+PASSWORD_HASH_METHOD = "scrypt:32768:8:1"
+PASSWORD_HASH_WORKERS = 1
+PASSWORD_HASH_QUEUE = 4
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Raised when the hashing queue is full."""
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(PASSWORD_HASH_QUEUE)
+
+
+def configure(method: str, workers: int, queue: int) -> None:
+    """Applies settings; an already running pool is restarted lazily."""
+    global PASSWORD_HASH_METHOD, PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE, _slots
+
+    if (method, workers, queue) == (
+        PASSWORD_HASH_METHOD,
+        PASSWORD_HASH_WORKERS,
+        PASSWORD_HASH_QUEUE,
+    ):
+        return
+
+    shutdown()
+    PASSWORD_HASH_METHOD = method
+    PASSWORD_HASH_WORKERS = workers
+    PASSWORD_HASH_QUEUE = queue
+    _slots = threading.BoundedSemaphore(max(1, queue))
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn: never fork a web worker's threads and open DB handles
+            _executor = ProcessPoolExecutor(
+                max_workers=PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def shutdown() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+
+
+def _run(fn, *args):
+    if PASSWORD_HASH_WORKERS <= 0:
+        return fn(*args)
+
+    slots = _slots
+    if not slots.acquire(blocking=False):
+        raise PasswordHasherBusy("Password hashing queue is full")
+
+    try:
+        future = _get_executor().submit(fn, *args)
+    except Exception:
+        slots.release()
+        raise
+
+    future.add_done_callback(lambda _: slots.release())
+    return future.result()
+
+
+def hash_password(password: str) -> str:
+    return _run(generate_password_hash, password, PASSWORD_HASH_METHOD)
+
+
+def verify_password(password_hash: str, password: str) -> bool:
+    return _run(check_password_hash, password_hash, password)
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """True when the stored hash was made with other parameters than the current ones."""
+    method = (password_hash or "").split("$", 1)[0]
+    return method != PASSWORD_HASH_METHOD
@@ -0,0 +1,170 @@
+# backend/rollup.py
+"""
+Helpers for the monthly_category_totals rollup table.
+
+Every function takes whatever executes SQL (db.session or a Connection)
+so the rollup is always updated inside the caller's transaction.
+"""
+from sqlalchemy import Integer, cast, delete, func, select, text
+from sqlalchemy.dialects.sqlite import insert
+
+from fx import converted_totals
+from models import MonthlyCategoryTotal
+from normalize import DEFAULT_CURRENCY, minor_to_amount
+
+
+def year_month_of(day) -> str:
+    """date(2025, 11, 3) -> '2025-11'."""
+    return f"{day.year:04d}-{day.month:02d}"
+
+
+def month_key(month, year):
+    """
+    month, year are strings like "11", "2025" or None.
+    Returns "YYYY-MM", or None when no (valid) month filter was given.
+    """
+    if not (month and year):
+        return None
+
+    try:
+        month_i = int(month)
+        year_i = int(year)
+    except ValueError:
+        return None
+
+    if not 1 <= month_i <= 12:
+        return None
+
+    return f"{year_i:04d}-{month_i:02d}"
+
+
+def apply_rollup_deltas(executor, user_id: int, records) -> None:
+    """
+    Folds freshly inserted transaction records (dicts with date,
+    amount_minor, category and optionally currency) into the rollup with
+    one upsert per (month, category, currency).
+    """
+    deltas = {}
+    for record in records:
+        key = (
+            year_month_of(record["date"]),
+            record["category"],
+            record.get("currency", DEFAULT_CURRENCY),
+        )
+        amount = record["amount_minor"]
+        entry = deltas.get(key)
+        if entry is None:
+            deltas[key] = [amount, 1, amount, amount]
+        else:
+            entry[0] += amount
+            entry[1] += 1
+            if amount < entry[2]:
+                entry[2] = amount
+            if amount > entry[3]:
+                entry[3] = amount
+
+    if not deltas:
+        return
+
+    rows = [
+        {
+            "user_id": user_id,
+            "year_month": year_month,
+            "category": category,
+            "currency": currency,
+            "total_minor": total,
+            "count": count,
+            "min_minor": min_minor,
+            "max_minor": max_minor,
+        }
+        for (year_month, category, currency), (total, count, min_minor, max_minor)
+        in deltas.items()
+    ]
+
+    table = MonthlyCategoryTotal.__table__
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[
+            table.c.user_id, table.c.year_month, table.c.category, table.c.currency
+        ],
+        set_={
+            "total_minor": table.c.total_minor + stmt.excluded.total_minor,
+            "count": table.c.count + stmt.excluded.count,
+            "min_minor": func.min(table.c.min_minor, stmt.excluded.min_minor),
+            "max_minor": func.max(table.c.max_minor, stmt.excluded.max_minor),
+        },
+    )
+    executor.execute(stmt, rows)
+
+
+def delete_user_rollups(executor, user_id: int) -> None:
+    executor.execute(
+        delete(MonthlyCategoryTotal).where(MonthlyCategoryTotal.user_id == user_id)
+    )
+
+
+def rebuild_rollups(executor, user_id=None) -> None:
+    """
+    Recomputes the rollup from raw transactions, for one user or everyone.
+    Used to backfill existing databases.
+    """
+    params = {}
+    where = ""
+    if user_id is not None:
+        where = "WHERE user_id = :user_id"
+        params["user_id"] = user_id
+
+    executor.execute(text(f"DELETE FROM monthly_category_totals {where}"), params)
+    executor.execute(
+        text(
+            f"""
+            INSERT INTO monthly_category_totals
+                (user_id, year_month, category, currency,
+                 total_minor, count, min_minor, max_minor)
+            SELECT
+                user_id,
+                substr(date, 1, 7) AS year_month,
+                category,
+                currency,
+                SUM(amount_minor), COUNT(*), MIN(amount_minor), MAX(amount_minor)
+            FROM transactions
+            {where}
+            GROUP BY user_id, year_month, category, currency
+            """
+        ),
+        params,
+    )
+
+
+def category_totals(executor, user_id: int, month=None, year=None) -> dict:
+    """{category: total_amount} for the user, optionally for one month."""
+    key = month_key(month, year)
+    return category_totals_between(executor, user_id, key, key)
+
+
+def category_totals_select(user_id: int, start=None, end=None):
+    """
+    (category, total_minor) per category for months start..end inclusive
+    ("YYYY-MM"), in the user's default currency (see fx.py).
+    Either bound may be None; with both None this covers all history.
+    """
+    rollup = converted_totals
+    q = select(
+        rollup.c.category,
+        cast(func.round(func.total(rollup.c.total)), Integer).label("total_minor"),
+    ).where(rollup.c.user_id == user_id)
+
+    if start is not None and start == end:
+        q = q.where(rollup.c.year_month == start)
+    else:
+        if start is not None:
+            q = q.where(rollup.c.year_month >= start)
+        if end is not None:
+            q = q.where(rollup.c.year_month <= end)
+    return q.group_by(rollup.c.category)
+
+
+def category_totals_between(executor, user_id: int, start=None, end=None) -> dict:
+    """{category: total_amount} for category_totals_select's rows."""
+    rows = executor.execute(category_totals_select(user_id, start, end)).all()
+    return {row.category: minor_to_amount(row.total_minor) for row in rows}
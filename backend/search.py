@@ -0,0 +1,112 @@
+# backend/search.py
+"""
+Full-text search over transaction descriptions (SQLite FTS5).
+
+transactions_fts is an external-content FTS5 index on
+transactions.description, keyed by rowid = transactions.id. It stores
+only the index; triggers on transactions keep it in step with every
+insert, update and delete, whichever code path writes them.
+
+user_id is indexed too, so a search walks only the searching user's
+postings rather than every user's matches.
+
+to_match() turns user input into an FTS5 query: words are ANDed and
+quoted, so punctuation and FTS operators are taken literally, and a word
+ending in * matches as a prefix ("zom*"). Results come newest first by
+rowid (transaction id, i.e. import order) by default, which FTS5 reads
+straight off its postings: a page stops after `limit` matches. The
+"rank" sort orders by bm25 over the description (the table's rank
+function) instead, newest first among equal scores; it has to score and
+sort every match before returning the first page.
+"""
+import re
+
+from sqlalchemy import column, literal_column, table, text
+
+from models import Transaction
+
+FTS_TABLE = "transactions_fts"
+
+# Words of the query; a trailing * marks a prefix.
+_WORD_RE = re.compile(r"\w+\*?")
+
+fts = table(FTS_TABLE, column("rowid"), column("rank"))
+
+SORTS = ("newest", "rank")
+
+# Unary + keeps SQLite from handing the join's rowid to the FTS table, so
+# the MATCH runs once as the outer loop and transactions are probed by
+# primary key. Without it, a per-user index scan may run the MATCH again
+# for every row of the user.
+_fts_rowid = literal_column(f"+{FTS_TABLE}.rowid")
+
+
+def to_match(query: str):
+    """FTS5 MATCH expression for user input, or None if it has no words."""
+    terms = []
+    for word in _WORD_RE.findall(query or ""):
+        if word.endswith("*"):
+            terms.append(f'"{word[:-1]}"*')
+        else:
+            terms.append(f'"{word}"')
+    return " ".join(terms) or None
+
+
+def search_select(user_id: int, match: str, sort: str = "newest"):
+    """
+    Transaction.api_select() rows of one user matching a to_match()
+    expression, in one of SORTS: newest first, or best bm25 match first.
+    Further .where() filters apply to transactions.
+    """
+    expression = f'user_id : "{int(user_id)}" AND description : ({match})'
+    stmt = (
+        Transaction.api_select()
+        .join(fts, Transaction.id == _fts_rowid)
+        .where(
+            text(f"{FTS_TABLE} MATCH :match").bindparams(match=expression),
+            Transaction.user_id == user_id,
+        )
+    )
+    if sort == "rank":
+        stmt = stmt.order_by(fts.c.rank)
+    return stmt.order_by(fts.c.rowid.desc())
+
+
+def create_search_index(conn) -> None:
+    """Creates the FTS5 table and its sync triggers, and indexes existing rows."""
+    conn.execute(
+        text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            "description, user_id, content='transactions', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+    )
+
+    # the 'delete' command needs the old values of an external-content row
+    triggers = {
+        "transactions_fts_insert": (
+            "AFTER INSERT ON transactions BEGIN "
+            f"INSERT INTO {FTS_TABLE} (rowid, description, user_id) "
+            "VALUES (new.id, new.description, new.user_id); END"
+        ),
+        "transactions_fts_delete": (
+            "AFTER DELETE ON transactions BEGIN "
+            f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, description, user_id) "
+            "VALUES ('delete', old.id, old.description, old.user_id); END"
+        ),
+        "transactions_fts_update": (
+            "AFTER UPDATE OF description, user_id ON transactions BEGIN "
+            f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, description, user_id) "
+            "VALUES ('delete', old.id, old.description, old.user_id); "
+            f"INSERT INTO {FTS_TABLE} (rowid, description, user_id) "
+            "VALUES (new.id, new.description, new.user_id); END"
+        ),
+    }
+    for name, body in triggers.items():
+        conn.execute(text(f"CREATE TRIGGER IF NOT EXISTS {name} {body}"))
+
+    conn.execute(text(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')"))
+    # rank (the "rank" sort) = bm25 over description only
+    conn.execute(
+        text(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rank) VALUES ('rank', 'bm25(1.0, 0.0)')")
+    )
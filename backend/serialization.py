@@ -0,0 +1,66 @@
+# backend/serialization.py
+"""
+JSON encoding for responses.
+
+FastJSONProvider is the app's JSON provider: it encodes with orjson when
+the package is installed and falls back to the stdlib json module
+otherwise. Either way the output is the same JSON as Flask's default
+provider (dates as HTTP dates, sorted keys), except that orjson writes
+non-ASCII characters as UTF-8 instead of \\u escapes.
+
+encode() is the same encoder for code that writes JSON itself (the
+NDJSON transaction stream).
+"""
+import json
+
+from flask import current_app
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json
+    orjson = None
+
+if orjson is not None:
+    # dates/datetimes go through Flask's default so they stay HTTP dates
+    _ORJSON_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_SERIALIZE_NUMPY
+        | orjson.OPT_PASSTHROUGH_DATETIME
+    )
+
+
+def encode(obj, sort_keys: bool = False, default=DefaultJSONProvider.default) -> bytes:
+    """obj as compact UTF-8 JSON."""
+    if orjson is not None:
+        option = _ORJSON_OPTIONS | orjson.OPT_SORT_KEYS if sort_keys else _ORJSON_OPTIONS
+        return orjson.dumps(obj, default=default, option=option)
+    return json.dumps(
+        obj, default=default, sort_keys=sort_keys, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider with encode() doing the work."""
+
+    def encode(self, obj) -> bytes:
+        return encode(obj, self.sort_keys, self.default)
+
+    def dumps(self, obj, **kwargs) -> str:
+        if kwargs:
+            # indent, separators etc. are stdlib json options
+            return super().dumps(obj, **kwargs)
+        return self.encode(obj).decode("utf-8")
+
+    def response(self, *args, **kwargs):
+        if (self.compact is None and current_app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)  # indented, for debugging
+
+        # jsonify()'s arguments: one value, several as a list, or keywords
+        if args and kwargs:
+            raise TypeError("app.json.response() takes either args or kwargs, not both")
+        if len(args) == 1:
+            obj = args[0]
+        else:
+            obj = args or kwargs or None
+        return current_app.response_class(self.encode(obj) + b"\n", mimetype=self.mimetype)
@@ -0,0 +1,52 @@
+"""
+Fixtures: an initialised app on a throwaway SQLite file with one user,
+its test client and that user's auth headers.
+"""
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+@pytest.fixture
+def app(tmp_path):
+    from app import create_app, init_db
+    from db import db
+    from models import User
+
+    app = create_app(
+        {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": "sqlite:///" + str(tmp_path / "test.db"),
+            "PASSWORD_HASH_WORKERS": 0,
+            "IMPORT_WORKERS": 0,
+            "IMPORT_SPOOL_DIR": str(tmp_path / "spool"),
+            "SLOW_QUERY_MS": None,
+            "SLOW_REQUEST_MS": None,
+        }
+    )
+    with app.app_context():
+        init_db()
+        user = User(email="test@example.com")
+        user.set_password("test")
+        db.session.add(user)
+        db.session.commit()
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_headers(app):
+    from app import generate_token
+
+    with app.app_context():
+        token = generate_token(1)
+    return {"Authorization": f"Bearer {token}"}
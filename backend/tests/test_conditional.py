@@ -0,0 +1,188 @@
+"""
+Conditional GET and compression on the read endpoints: bodies are
+compressed when the client accepts it, and a matching If-None-Match
+gets 304 with an empty body after only the data_version lookup, in
+less server time than sending the body.
+"""
+import gzip
+import io
+import statistics
+import time
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+
+ENDPOINTS = [
+    "/api/transactions?limit=100",
+    "/api/summary/categories",
+    "/api/goals/progress?month=11&year=2025",
+    "/api/forecast",
+    "/api/insights",
+    "/api/dashboard?month=11&year=2025",
+]
+
+IDENTITY = {"Accept-Encoding": "identity"}
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+def statement_csv(rows: int) -> bytes:
+    lines = ["date,description,amount"]
+    for i in range(rows):
+        month = 9 + i % 3
+        day = 1 + i % 28
+        if i % 10 == 0:
+            lines.append(f"2025-{month:02d}-{day:02d},Salary credit {i},50000")
+        else:
+            lines.append(f"2025-{month:02d}-{day:02d},Zomato order {i},-{100 + i}")
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+@pytest.fixture
+def seeded(app, client, auth_headers):
+    # a few categories make summaries smaller than the default threshold
+    app.config["COMPRESS_MIN_SIZE"] = 64
+    res = client.post(
+        "/upload-csv",
+        data={"file": (io.BytesIO(statement_csv(120)), "statement.csv")},
+        headers=auth_headers,
+        content_type="multipart/form-data",
+    )
+    assert res.status_code == 200, res.get_json()
+    client.post(
+        "/api/goals",
+        json={"category": "Food & Dining", "monthly_limit": 500},
+        headers=auth_headers,
+    )
+    return auth_headers
+
+
+@pytest.mark.parametrize("url", ENDPOINTS)
+def test_body_is_gzipped_when_accepted(client, seeded, url):
+    plain = client.get(url, headers={**seeded, **IDENTITY})
+    assert plain.status_code == 200
+    assert "Content-Encoding" not in plain.headers
+
+    res = client.get(url, headers={**seeded, **GZIP})
+    assert res.status_code == 200
+    assert res.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in res.headers["Vary"]
+    assert len(res.data) < len(plain.data)
+    assert gzip.decompress(res.data) == plain.data
+    assert res.headers["ETag"].strip('"').endswith("-gzip")
+
+
+def test_body_is_brotli_encoded_when_accepted(client, seeded):
+    brotli = pytest.importorskip("brotli")
+    url = ENDPOINTS[0]
+    plain = client.get(url, headers={**seeded, **IDENTITY})
+
+    res = client.get(url, headers={**seeded, "Accept-Encoding": "gzip, br"})
+    assert res.headers["Content-Encoding"] == "br"
+    assert brotli.decompress(res.data) == plain.data
+
+
+def test_body_under_the_threshold_is_not_compressed(app, client, seeded):
+    app.config["COMPRESS_MIN_SIZE"] = 1024
+    res = client.get("/api/summary/categories", headers={**seeded, **GZIP})
+    assert res.status_code == 200
+    assert len(res.data) < 1024
+    assert "Content-Encoding" not in res.headers
+
+
+@pytest.mark.parametrize("url", ENDPOINTS)
+@pytest.mark.parametrize("encoding", [IDENTITY, GZIP])
+def test_if_none_match_returns_304_with_empty_body(app, client, seeded, url, encoding):
+    first = client.get(url, headers={**seeded, **encoding})
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    from db import db
+
+    statements = []
+    with app.app_context():
+        engine = db.engine
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        res = client.get(url, headers={**seeded, **encoding, "If-None-Match": etag})
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert res.status_code == 304
+    assert res.data == b""
+    assert res.headers["ETag"] == etag.replace("-gzip", "")
+    # only the data_version lookup behind the ETag
+    assert len(statements) == 1, statements
+
+
+def test_etag_changes_when_the_data_does(client, seeded):
+    url = ENDPOINTS[0]
+    etag = client.get(url, headers=seeded).headers["ETag"]
+
+    client.post(
+        "/upload-csv",
+        data={"file": (io.BytesIO(b"date,description,amount\n2025-12-01,Uber ride,-230\n"), "more.csv")},
+        headers=seeded,
+        content_type="multipart/form-data",
+    )
+
+    res = client.get(url, headers={**seeded, "If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.headers["ETag"] != etag
+
+
+def test_revalidation_saves_server_time(client, seeded):
+    url = "/api/dashboard?month=11&year=2025"
+    headers = {**seeded, **GZIP}
+    etag = client.get(url, headers=headers).headers["ETag"]
+
+    def median_ms(extra, status):
+        times = []
+        for _ in range(15):
+            start = time.perf_counter()
+            res = client.get(url, headers={**headers, **extra})
+            times.append(time.perf_counter() - start)
+            assert res.status_code == status
+        return statistics.median(times) * 1000
+
+    # both served from the result cache; the 304 skips the transactions
+    # page, encoding and compression
+    full = median_ms({}, 200)
+    revalidated = median_ms({"If-None-Match": etag}, 304)
+    assert revalidated < full * 0.75, (revalidated, full)
+
+
+class FakeDate(date):
+    today_value = None
+
+    @classmethod
+    def today(cls):
+        return cls.today_value
+
+
+@pytest.mark.parametrize(
+    "url, section",
+    [
+        ("/api/goals/progress?month=11&year=2025", None),
+        ("/api/dashboard?month=11&year=2025&fields=goals", "goals"),
+    ],
+)
+def test_goal_projection_is_not_cached_across_days(client, seeded, monkeypatch, url, section):
+    import app as app_module
+    import http_cache
+
+    monkeypatch.setattr(app_module, "date", FakeDate)
+    monkeypatch.setattr(http_cache, "date", FakeDate)
+
+    def projected(day):
+        FakeDate.today_value = day
+        res = client.get(url, headers=seeded)
+        progress = res.get_json()[section] if section else res.get_json()
+        return res.headers["ETag"], progress["goals"][0]["projected_spend"]
+
+    etag_10, spend_10 = projected(date(2025, 11, 10))
+    etag_20, spend_20 = projected(date(2025, 11, 20))
+    assert etag_10 != etag_20
+    # spend to date is the same; the straight-line projection shrinks
+    assert spend_20 < spend_10
@@ -0,0 +1,73 @@
+"""
+Fingerprints: repeats within a statement get distinct fingerprints,
+re-imports get the same ones, and the counter forgets the dates a
+date-sorted stream has moved past.
+"""
+import io
+from datetime import date, timedelta
+
+import pytest
+
+from normalize import FingerprintCounter
+
+
+def rows(days: int, per_day: int = 3):
+    start = date(2025, 1, 1)
+    return [
+        (start + timedelta(days=d), -450, "Zomato order")
+        for d in range(days)
+        for _ in range(per_day)
+    ]
+
+
+def fingerprints(counter, stream):
+    return [counter(day, amount, description) for day, amount, description in stream]
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_sorted_stream_keeps_one_day_of_counts(reverse):
+    stream = sorted(rows(200), reverse=reverse)
+    counter = FingerprintCounter(1)
+
+    bounded = fingerprints(counter, stream)
+
+    assert len(counter._seen) == 1
+    # same fingerprints as counting every row
+    assert bounded == fingerprints(FingerprintCounter(1, bounded=False), stream)
+    assert len(set(bounded)) == len(stream)
+
+
+def test_unsorted_stream_never_reuses_a_fingerprint():
+    # the first day comes back after the stream moved past it
+    stream = rows(3) + rows(1)
+    first = fingerprints(FingerprintCounter(1), stream)
+
+    assert len(set(first)) == len(stream)
+    assert fingerprints(FingerprintCounter(1), stream) == first
+
+
+def upload(client, headers, body):
+    res = client.post(
+        "/upload-csv",
+        data={"file": (io.BytesIO(body), "statement.csv")},
+        headers=headers,
+        content_type="multipart/form-data",
+    )
+    assert res.status_code == 200
+    return res.get_json()
+
+
+def test_reimporting_an_unsorted_statement_adds_nothing(client, auth_headers):
+    statement = (
+        b"date,description,amount\n"
+        b"2025-11-02,Coffee,-120\n"
+        b"2025-11-01,Coffee,-120\n"
+        b"2025-11-02,Coffee,-120\n"
+        b"2025-11-03,Coffee,-120\n"
+        b"2025-11-02,Coffee,-120\n"
+    )
+    first = upload(client, auth_headers, statement)
+    assert (first["count"], first["duplicates"]) == (5, 0)
+
+    again = upload(client, auth_headers, statement)
+    assert (again["count"], again["duplicates"]) == (0, 5)
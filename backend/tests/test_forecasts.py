@@ -0,0 +1,96 @@
+"""
+Stored forecasts: `compute-forecasts` stores the bases the dashboard
+asks for, /api/dashboard and /api/forecast serve them from the
+forecasts table, and a miss is computed without writing.
+"""
+import io
+
+import pytest
+from sqlalchemy import event, text
+
+STATEMENT = b"""date,description,amount
+2025-09-01,Salary,50000
+2025-09-05,Rent,-15000
+2025-10-01,Salary,50000
+2025-10-05,Rent,-15000
+2025-11-01,Salary,50000
+2025-11-05,Rent,-16000
+"""
+
+# marks rows read from the table rather than fitted
+STORED_MINOR = -123400
+
+
+@pytest.fixture
+def seeded(client, auth_headers):
+    res = client.post(
+        "/upload-csv",
+        data={"file": (io.BytesIO(STATEMENT), "statement.csv")},
+        headers=auth_headers,
+        content_type="multipart/form-data",
+    )
+    assert res.status_code == 200
+    return auth_headers
+
+
+def compute_and_mark(app):
+    from db import db
+    from forecasting import compute_all_forecasts
+
+    with app.app_context():
+        assert compute_all_forecasts() == 1
+        db.session.execute(
+            text("UPDATE forecasts SET forecast_minor = :minor WHERE category = 'Housing'"),
+            {"minor": STORED_MINOR},
+        )
+        db.session.commit()
+        return sorted(
+            db.session.execute(text("SELECT DISTINCT basis_month FROM forecasts")).scalars()
+        )
+
+
+def housing(forecast):
+    return {c["category"]: c["forecast_spend"] for c in forecast["categories"]}["Housing"]
+
+
+def test_batch_stores_latest_and_each_month(app, seeded):
+    assert compute_and_mark(app) == ["2025-09", "2025-10", "2025-11", "latest"]
+
+
+@pytest.mark.parametrize("query", ["", "month=10&year=2025", "month=11&year=2025"])
+def test_dashboard_serves_the_stored_forecast(app, client, seeded, query):
+    compute_and_mark(app)
+
+    res = client.get(f"/api/dashboard?fields=forecast&{query}", headers=seeded)
+    assert housing(res.get_json()["forecast"]) == -STORED_MINOR / 100
+
+    res = client.get(f"/api/forecast?{query}", headers=seeded)
+    assert housing(res.get_json()) == -STORED_MINOR / 100
+
+
+def test_stale_forecast_is_computed_without_writing(app, client, seeded):
+    compute_and_mark(app)
+    client.post(
+        "/upload-csv",
+        data={"file": (io.BytesIO(b"date,description,amount\n2025-11-20,Uber ride,-230\n"), "more.csv")},
+        headers=seeded,
+        content_type="multipart/form-data",
+    )
+
+    from db import db
+
+    statements = []
+    with app.app_context():
+        engine = db.engine
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        dashboard = client.get("/api/dashboard?month=11&year=2025", headers=seeded).get_json()
+        forecast = client.get("/api/forecast?month=11&year=2025", headers=seeded).get_json()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert housing(dashboard["forecast"]) != -STORED_MINOR / 100
+    assert forecast == dashboard["forecast"]
+    writes = [s for s in statements if not s.lstrip().upper().startswith(("SELECT", "WITH"))]
+    assert writes == []
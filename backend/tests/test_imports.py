@@ -0,0 +1,87 @@
+"""
+Background imports: a transient database error requeues the job, and
+the next attempt resumes after the last committed batch.
+"""
+import io
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+import imports
+
+STATEMENT = b"""date,description,amount
+2025-11-01,Zomato order,-450
+2025-11-02,Uber ride,-230
+2025-11-03,Salary,25000
+2025-11-04,Amazon purchase,-1200
+2025-11-05,Rent,-8000
+"""
+
+
+@pytest.fixture
+def runner(app):
+    runner = app.extensions["imports"]
+    runner.chunk_size = 2
+    runner.stale_seconds = 0
+    return runner
+
+
+@pytest.fixture
+def locked_after(monkeypatch):
+    """iter_ingest that raises "database is locked" after `batches` batches."""
+    calls = []
+
+    def install(batches, times=1):
+        real = imports.iter_ingest
+
+        def flaky(*args, **kwargs):
+            attempt = len(calls)
+            calls.append(kwargs.get("skip_rows"))
+            for done, batch in enumerate(real(*args, **kwargs)):
+                if attempt < times and done == batches:
+                    raise OperationalError("INSERT", {}, Exception("database is locked"))
+                yield batch
+
+        monkeypatch.setattr(imports, "iter_ingest", flaky)
+        return calls
+
+    return install
+
+
+def upload(client, headers):
+    return client.post(
+        "/upload-csv",
+        data={"file": (io.BytesIO(STATEMENT), "statement.csv")},
+        headers=headers,
+        content_type="multipart/form-data",
+    )
+
+
+def test_locked_database_requeues_and_resumes(client, auth_headers, runner, locked_after):
+    calls = locked_after(1)
+
+    res = upload(client, auth_headers)
+    assert res.status_code == 202
+    job = res.get_json()
+    assert (job["status"], job["rows_processed"], job["count"]) == ("queued", 2, 2)
+
+    # a poll finds it stale and resumes it after the committed batch
+    job = client.get(f"/api/imports/{job['id']}", headers=auth_headers).get_json()
+    assert (job["status"], job["count"], job["duplicates"]) == ("done", 5, 0)
+    assert calls == [0, 2]
+
+    summary = client.get("/api/summary/categories", headers=auth_headers).get_json()
+    assert len(summary["summary"]) == 5
+
+
+def test_job_fails_after_max_attempts(client, auth_headers, runner, locked_after):
+    runner.max_attempts = 2
+    locked_after(0, times=2)
+
+    job = upload(client, auth_headers).get_json()
+    assert job["status"] == "queued"
+
+    with pytest.raises(OperationalError):
+        client.get(f"/api/imports/{job['id']}", headers=auth_headers)
+    job = client.get(f"/api/imports/{job['id']}", headers=auth_headers).get_json()
+    assert (job["status"], job["error"]) == ("failed", "Import failed")
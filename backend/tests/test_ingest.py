@@ -0,0 +1,39 @@
+"""
+Amount parsing at ingest: a value that cannot be stored rejects its
+row, not the import.
+"""
+import io
+
+import pytest
+
+from normalize import MAX_AMOUNT_MINOR, parse_amount_minor
+
+
+@pytest.mark.parametrize(
+    "value, minor",
+    [("1,200.50", 120050), ("-0.005", -1), (12, 1200), ("90071992547409.91", MAX_AMOUNT_MINOR)],
+)
+def test_parse_amount_minor(value, minor):
+    assert parse_amount_minor(value) == minor
+
+
+@pytest.mark.parametrize(
+    "value", ["1e30", "-1e30", "1e999999999", "90071992547409.92", 10**20, "abc", ""]
+)
+def test_unstorable_amount_is_a_value_error(value):
+    with pytest.raises(ValueError):
+        parse_amount_minor(value)
+
+
+def test_amount_out_of_range_rejects_only_its_row(client, auth_headers):
+    statement = b"date,description,amount\n2025-11-01,Rent,-15000\n2025-11-02,Typo,1e30\n"
+    res = client.post(
+        "/upload-csv",
+        data={"file": (io.BytesIO(statement), "statement.csv")},
+        headers=auth_headers,
+        content_type="multipart/form-data",
+    )
+    assert res.status_code == 200
+    result = res.get_json()
+    assert (result["count"], result["rejected"]) == (1, 1)
+    assert result["rejected_rows"] == [{"row": 3, "reason": "invalid amount"}]
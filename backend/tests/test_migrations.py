@@ -0,0 +1,91 @@
+"""
+Migrations on an existing database: migration 10 (currencies and
+exchange rates) moves users whose free-text default currency has no
+rates back to INR.
+"""
+import io
+
+import pytest
+from sqlalchemy import text
+
+STATEMENT = b"date,description,amount\n2025-11-01,Rent,-15000\n2025-11-03,Salary,25000\n"
+
+
+def upload(client, headers, body):
+    return client.post(
+        "/upload-csv",
+        data={"file": (io.BytesIO(body), "statement.csv")},
+        headers=headers,
+        content_type="multipart/form-data",
+    )
+
+
+def rerun_migration_10(app, currency):
+    from db import db
+    from migrations import run_migrations
+
+    with app.app_context():
+        db.session.execute(
+            text("UPDATE users SET default_currency = :currency"), {"currency": currency}
+        )
+        db.session.commit()
+        with db.engine.begin() as conn:
+            conn.execute(text("PRAGMA user_version = 9"))
+        assert [version for version, _ in run_migrations(db.engine)] == [10]
+        return db.session.execute(text("SELECT default_currency FROM users")).scalar()
+
+
+@pytest.mark.parametrize("currency", ["JPY", None])
+def test_currency_without_rates_falls_back_to_inr(app, client, auth_headers, currency):
+    assert upload(client, auth_headers, STATEMENT).status_code == 200
+
+    assert rerun_migration_10(app, currency) == "INR"
+
+    summary = client.get("/api/summary/categories", headers=auth_headers).get_json()
+    totals = {row["category"]: row["total"] for row in summary["summary"]}
+    assert totals == {"Housing": -15000.0, "Income": 25000.0}
+
+    forecast = client.get("/api/forecast", headers=auth_headers).get_json()
+    assert forecast["categories"]
+
+    res = upload(client, auth_headers, b"date,description,amount\n2025-11-05,Uber ride,-230\n")
+    assert res.status_code == 200
+    assert res.get_json()["count"] == 1
+    assert res.get_json()["rejected"] == 0
+
+
+def test_supported_currency_is_kept(app, client, auth_headers):
+    assert rerun_migration_10(app, "USD") == "USD"
+
+
+def test_legacy_amount_out_of_range_is_unparsed(app, client, auth_headers):
+    from db import db
+    from migrations import run_migrations
+
+    with app.app_context():
+        with db.engine.begin() as conn:
+            conn.execute(text("DROP TABLE transactions"))
+            conn.execute(
+                text(
+                    "CREATE TABLE transactions (id INTEGER PRIMARY KEY, date VARCHAR, "
+                    "description VARCHAR, amount FLOAT, category VARCHAR, user_id INTEGER)"
+                )
+            )
+            conn.execute(
+                text(
+                    "INSERT INTO transactions (date, description, amount, category, user_id) "
+                    "VALUES ('2025-11-01', 'Rent', -15000, 'Housing', 1), "
+                    "('2025-11-02', 'Typo', 1e30, 'Income', 1)"
+                )
+            )
+            conn.execute(text("PRAGMA user_version = 3"))
+        run_migrations(db.engine)
+
+        unparsed = db.session.execute(
+            text("SELECT description, reason FROM unparsed_transactions")
+        ).all()
+    assert [row.description for row in unparsed] == ["Typo"]
+    assert "out of range" in unparsed[0].reason
+
+    summary = client.get("/api/summary/categories", headers=auth_headers).get_json()
+    assert summary["summary"] == [{"category": "Housing", "id": 1, "total": -15000.0}]
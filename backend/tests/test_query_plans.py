@@ -0,0 +1,128 @@
+"""
+The hot per-user queries are served from an index: EXPLAIN QUERY PLAN
+shows no full table scan for any of them.
+"""
+from datetime import date
+
+import pytest
+from sqlalchemy import func, text
+
+QUERIES = [
+    "transactions (all)",
+    "transactions (month)",
+    "transactions (next page)",
+    "category totals (all)",
+    "category totals (month)",
+    "rollup totals (all)",
+    "rollup totals (month)",
+    "converted totals (all)",
+    "converted totals (month)",
+    "forecast lookup",
+    "goals progress",
+    "dashboard aggregates",
+    "search",
+    "search (ranked)",
+    "reset",
+]
+
+
+def build_queries(user_id: int) -> dict:
+    from app import apply_month_year_filter
+    from budgets import goal_progress_query
+    from dashboard import dashboard_select
+    from db import db
+    from forecasting import stored_forecast_query
+    from fx import converted_totals
+    from models import MonthlyCategoryTotal, Transaction
+    from pagination import apply_keyset, encode_cursor
+    from search import search_select
+
+    totals = db.session.query(
+        Transaction.category,
+        func.sum(Transaction.amount_minor).label("total_amount"),
+    ).filter(Transaction.user_id == user_id)
+    rollup = db.session.query(
+        MonthlyCategoryTotal.category,
+        func.sum(MonthlyCategoryTotal.total_minor).label("total_amount"),
+    ).filter(MonthlyCategoryTotal.user_id == user_id)
+    converted = db.session.query(
+        converted_totals.c.category,
+        func.total(converted_totals.c.total).label("total_amount"),
+    ).filter(converted_totals.c.user_id == user_id)
+    listing = Transaction.api_select().where(Transaction.user_id == user_id)
+
+    return {
+        "transactions (all)": apply_keyset(listing, None),
+        "transactions (month)": apply_keyset(
+            apply_month_year_filter(listing, "11", "2025"), None
+        ),
+        "transactions (next page)": apply_keyset(
+            listing, encode_cursor(date(2025, 11, 3), 42)
+        ).limit(101),
+        "category totals (all)": totals.group_by(Transaction.category),
+        "category totals (month)": apply_month_year_filter(
+            totals, "11", "2025"
+        ).group_by(Transaction.category),
+        "rollup totals (all)": rollup.group_by(MonthlyCategoryTotal.category),
+        "rollup totals (month)": rollup.filter(
+            MonthlyCategoryTotal.year_month == "2025-11"
+        ).group_by(MonthlyCategoryTotal.category),
+        "converted totals (all)": converted.group_by(converted_totals.c.category),
+        "converted totals (month)": converted.filter(
+            converted_totals.c.year_month == "2025-11"
+        ).group_by(converted_totals.c.category),
+        "forecast lookup": stored_forecast_query(user_id, "latest"),
+        "goals progress": goal_progress_query(user_id, "2025-11"),
+        "dashboard aggregates": dashboard_select(user_id, "2025-11"),
+        "search": search_select(user_id, '"zomato"').limit(100),
+        "search (ranked)": search_select(user_id, '"zomato"', "rank").limit(100),
+        "reset": db.session.query(Transaction.id).filter_by(user_id=user_id),
+    }
+
+
+def query_plan(query) -> list:
+    from db import db
+
+    statement = getattr(query, "statement", query)
+    sql = str(statement.compile(db.engine, compile_kwargs={"literal_binds": True}))
+    return [row[-1] for row in db.session.execute(text("EXPLAIN QUERY PLAN " + sql))]
+
+
+def full_scans(plan) -> list:
+    # scanning a subquery's own result (or the constant row of a SELECT
+    # without FROM) reads no table
+    subqueries = {
+        step.split()[-1]
+        for step in plan
+        if step.startswith(("CO-ROUTINE ", "MATERIALIZE "))
+    } | {"CONSTANT"}
+    return [
+        step
+        for step in plan
+        if step.startswith("SCAN ")
+        and "INDEX" not in step
+        and step.split()[1] not in subqueries
+    ]
+
+
+def test_every_query_is_checked(app):
+    with app.app_context():
+        assert sorted(build_queries(1)) == sorted(QUERIES)
+
+
+@pytest.mark.parametrize("label", QUERIES)
+def test_query_uses_an_index(app, label):
+    with app.app_context():
+        plan = query_plan(build_queries(1)[label])
+    assert plan
+    assert full_scans(plan) == [], "\n".join(plan)
+
+
+def test_full_scan_is_detected(app):
+    from models import Transaction
+
+    with app.app_context():
+        plan = query_plan(
+            Transaction.api_select().where(Transaction.description == "x")
+        )
+    assert full_scans(plan)
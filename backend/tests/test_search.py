@@ -0,0 +1,58 @@
+"""
+/api/transactions/search: newest match first by default, best bm25
+match first with ?sort=rank.
+"""
+import io
+
+import pytest
+
+# imported in this order, so ids (and "newest") follow the lines
+STATEMENT = b"""date,description,amount
+2025-11-01,Zomato,-450
+2025-11-02,Zomato order from Swiggy partner restaurant via app,-230
+2025-11-03,Uber ride,-120
+2025-11-04,Zomato order,-300
+"""
+
+
+@pytest.fixture
+def seeded(client, auth_headers):
+    res = client.post(
+        "/upload-csv",
+        data={"file": (io.BytesIO(STATEMENT), "statement.csv")},
+        headers=auth_headers,
+        content_type="multipart/form-data",
+    )
+    assert res.status_code == 200
+    return auth_headers
+
+
+def descriptions(res):
+    assert res.status_code == 200, res.get_json()
+    return [row["description"] for row in res.get_json()["transactions"]]
+
+
+def test_newest_first_by_default(client, seeded):
+    res = client.get("/api/transactions/search?q=zomato", headers=seeded)
+    assert descriptions(res) == [
+        "Zomato order",
+        "Zomato order from Swiggy partner restaurant via app",
+        "Zomato",
+    ]
+
+
+def test_sort_rank_puts_the_best_match_first(client, seeded):
+    res = client.get("/api/transactions/search?q=zomato&sort=rank", headers=seeded)
+    assert descriptions(res) == [
+        "Zomato",
+        "Zomato order",
+        "Zomato order from Swiggy partner restaurant via app",
+    ]
+
+    res = client.get("/api/transactions/search?q=zomato&sort=rank&limit=1", headers=seeded)
+    assert descriptions(res) == ["Zomato"]
+
+
+def test_unknown_sort_is_rejected(client, seeded):
+    res = client.get("/api/transactions/search?q=zomato&sort=amount", headers=seeded)
+    assert res.status_code == 400
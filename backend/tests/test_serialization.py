@@ -0,0 +1,31 @@
+"""
+FastJSONProvider answers jsonify() with the same JSON as Flask's
+default provider.
+"""
+from datetime import date
+
+import pytest
+from flask import json, jsonify
+from flask.json.provider import DefaultJSONProvider
+
+
+@pytest.mark.parametrize(
+    "args, kwargs",
+    [
+        ((), {}),
+        (({"b": 1, "a": [1.5, None]},), {}),
+        ((1, "two"), {}),
+        ((), {"day": date(2025, 11, 3), "total": -450.0}),
+    ],
+)
+def test_jsonify_matches_the_default_provider(app, args, kwargs):
+    with app.test_request_context():
+        res = jsonify(*args, **kwargs)
+        expected = DefaultJSONProvider(app).response(*args, **kwargs)
+    assert res.mimetype == "application/json"
+    assert json.loads(res.get_data()) == json.loads(expected.get_data())
+
+
+def test_jsonify_rejects_args_and_kwargs(app):
+    with app.test_request_context(), pytest.raises(TypeError):
+        jsonify(1, total=2)
@@ -0,0 +1,63 @@
+"""
+The worker boot budget: importing the app module and calling
+create_app() stays fast, imports no heavy optional dependency and does
+not touch the database. Each run is a fresh interpreter.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BUDGET_MS = 1500
+RUNS = 3
+LAZY_MODULES = ["pandas", "numpy", "pyarrow"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from app import create_app
+create_app({"SQLALCHEMY_DATABASE_URI": sys.argv[1]})
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "ms": elapsed * 1000,
+    "eager": [m for m in %r if m in sys.modules],
+}))
+""" % (LAZY_MODULES,)
+
+
+@pytest.fixture(scope="module")
+def startup(tmp_path_factory):
+    """(db_path, [probe results]) for RUNS fresh interpreters."""
+    db_path = tmp_path_factory.mktemp("startup") / "startup.db"
+    results = []
+    for _ in range(RUNS):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE, "sqlite:///" + str(db_path)],
+            cwd=BACKEND_DIR,
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return db_path, results
+
+
+def test_create_app_within_budget(startup):
+    _db_path, results = startup
+    timings = [result["ms"] for result in results]
+    assert statistics.median(timings) <= BUDGET_MS, timings
+
+
+def test_heavy_dependencies_are_imported_lazily(startup):
+    _db_path, results = startup
+    assert [result["eager"] for result in results] == [[]] * RUNS
+
+
+def test_create_app_does_not_touch_the_database(startup):
+    db_path, _results = startup
+    assert not db_path.exists()
@@ -0,0 +1,5 @@
+# backend/wsgi.py
+# Entry point for gunicorn: `gunicorn wsgi:app`
+from app import create_app
+
+app = create_app()
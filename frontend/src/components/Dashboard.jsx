@@ -16,13 +16,21 @@ import ProfileSection from "./ProfileSection";
 
 import { API_BASE } from "../config";
 
+const TRANSACTIONS_PAGE_SIZE = 200;
+const IMPORT_POLL_MS = 1000;
+
 function Dashboard({ token, onLogout }) {
   const [activeTab, setActiveTab] = useState("overview"); // "overview" | "profile"
 
   const [transactions, setTransactions] = useState([]);
+  const [transactionsCursor, setTransactionsCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [categorySummary, setCategorySummary] = useState([]);
   const [goals, setGoals] = useState([]);
+  const [budgetAlerts, setBudgetAlerts] = useState([]);
   const [forecast, setForecast] = useState(null);
+  // every amount from the backend is in the profile's currency
+  const [currency, setCurrency] = useState("INR");
 
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState("");
@@ -61,30 +69,24 @@ function Dashboard({ token, onLogout }) {
       const params = new URLSearchParams();
       if (filterMonth) params.set("month", filterMonth);
       if (filterYear) params.set("year", filterYear);
-      const qs = params.toString() ? `?${params.toString()}` : "";
-
-      const [txRes, sumRes, goalsRes, forecastRes] = await Promise.all([
-        fetch(`${API_BASE}/api/transactions${qs}`, { headers: commonHeaders }),
-        fetch(`${API_BASE}/api/summary/categories${qs}`, { headers: commonHeaders }),
-        fetch(`${API_BASE}/api/goals`, { headers: commonHeaders }),
-        fetch(`${API_BASE}/api/forecast${qs}`, { headers: commonHeaders }),
-      ]);
 
-      if (!txRes.ok) throw new Error(`Transactions HTTP error: ${txRes.status}`);
-      if (!sumRes.ok) throw new Error(`Summary HTTP error: ${sumRes.status}`);
-      if (!goalsRes.ok) throw new Error(`Goals HTTP error: ${goalsRes.status}`);
-      if (!forecastRes.ok)
-        throw new Error(`Forecast HTTP error: ${forecastRes.status}`);
+      // one round trip for the transactions page, summary, goals and forecast
+      params.set("limit", TRANSACTIONS_PAGE_SIZE);
+      const res = await fetch(`${API_BASE}/api/dashboard?${params.toString()}`, {
+        headers: commonHeaders,
+      });
+      if (!res.ok) throw new Error(`Dashboard HTTP error: ${res.status}`);
 
-      const txData = await txRes.json();
-      const sumData = await sumRes.json();
-      const goalsData = await goalsRes.json();
-      const forecastData = await forecastRes.json();
+      const data = await res.json();
+      const txPage = data.transactions || {};
+      const goalsData = data.goals || {};
 
-      setTransactions(txData.transactions || []);
-      setCategorySummary(sumData.summary || []);
+      setTransactions(txPage.transactions || []);
+      setTransactionsCursor(txPage.next_cursor || null);
+      setCategorySummary(data.summary || []);
       setGoals(goalsData.goals || []);
-      setForecast(forecastData || null);
+      setBudgetAlerts(goalsData.alerts || []);
+      setForecast(data.forecast || null);
     } catch (err) {
       console.error(err);
       setError("Failed to load data from backend.");
@@ -98,6 +100,52 @@ function Dashboard({ token, onLogout }) {
     // reload when token changes (user login) or filter changes
   }, [token, filterMonth, filterYear]);
 
+  useEffect(() => {
+    if (!token) return;
+
+    fetch(`${API_BASE}/api/profile`, {
+      headers: { Authorization: `Bearer ${token}` },
+    })
+      .then((res) => (res.ok ? res.json() : null))
+      .then((data) => setCurrency(data?.profile?.default_currency || "INR"))
+      .catch((err) => console.error(err));
+  }, [token]);
+
+  // totals are converted to the new currency on the backend
+  function handleCurrencyChange(newCurrency) {
+    setCurrency(newCurrency);
+    reloadData();
+  }
+
+  // ---------- Next page of transactions ----------
+  async function loadMoreTransactions() {
+    if (!transactionsCursor) return;
+
+    try {
+      setLoadingMore(true);
+
+      const params = new URLSearchParams();
+      if (filterMonth) params.set("month", filterMonth);
+      if (filterYear) params.set("year", filterYear);
+      params.set("limit", TRANSACTIONS_PAGE_SIZE);
+      params.set("cursor", transactionsCursor);
+
+      const res = await fetch(`${API_BASE}/api/transactions?${params.toString()}`, {
+        headers: { Authorization: `Bearer ${token}` },
+      });
+      if (!res.ok) throw new Error(`Transactions HTTP error: ${res.status}`);
+
+      const data = await res.json();
+      setTransactions((prev) => [...prev, ...(data.transactions || [])]);
+      setTransactionsCursor(data.next_cursor || null);
+    } catch (err) {
+      console.error(err);
+      setError("Failed to load more transactions.");
+    } finally {
+      setLoadingMore(false);
+    }
+  }
+
   // ---------- Derived data ----------
   const expenseSummary = categorySummary.filter((item) => item.total < 0);
 
@@ -105,7 +153,7 @@ function Dashboard({ token, onLogout }) {
     labels: expenseSummary.map((item) => item.category),
     datasets: [
       {
-        label: "Total Spending (₹, absolute)",
+        label: `Total Spending (${currency}, absolute)`,
         data: expenseSummary.map((item) => Math.abs(item.total)),
       },
     ],
@@ -119,19 +167,6 @@ function Dashboard({ token, onLogout }) {
     },
   };
 
-  const expenseByCategory = {};
-  categorySummary.forEach((item) => {
-    const amount = item.total < 0 ? Math.abs(item.total) : 0;
-    expenseByCategory[item.category] = amount;
-  });
-
-  const goalsWithUsage = goals.map((g) => {
-    const spent = expenseByCategory[g.category] || 0;
-    const remaining = g.monthly_limit - spent;
-    const status = remaining >= 0 ? "OK" : "Over limit";
-    return { ...g, spent, remaining, status };
-  });
-
   // ---------- Goals ----------
   async function handleAddGoal(e) {
     e.preventDefault();
@@ -163,11 +198,7 @@ function Dashboard({ token, onLogout }) {
         return;
       }
 
-      const goalsRes = await fetch(`${API_BASE}/api/goals`, {
-        headers: { Authorization: `Bearer ${token}` },
-      });
-      const goalsData = await goalsRes.json();
-      setGoals(goalsData.goals || []);
+      await reloadData();
 
       setGoalMessage("Goal saved.");
       setGoalCategory("");
@@ -206,9 +237,23 @@ function Dashboard({ token, onLogout }) {
         body: formData,
       });
 
-      const data = await res.json();
+      let data = await res.json();
+
+      // large files are imported in the background: poll the job
+      while (res.ok && (data.status === "queued" || data.status === "running")) {
+        setUploadMessage(
+          `Importing… ${Math.round((data.progress || 0) * 100)}% ` +
+            `(${data.rows_processed} of ~${data.total_rows} rows)`
+        );
+        await new Promise((resolve) => setTimeout(resolve, IMPORT_POLL_MS));
+        const jobRes = await fetch(`${API_BASE}/api/imports/${data.id}`, {
+          headers: { Authorization: `Bearer ${token}` },
+        });
+        if (!jobRes.ok) throw new Error(`Import HTTP error: ${jobRes.status}`);
+        data = await jobRes.json();
+      }
 
-      if (!res.ok) {
+      if (!res.ok || data.status === "failed") {
         setUploadMessage(data.error || "Upload failed.");
       } else {
         setUploadMessage(`Uploaded ${data.count || 0} transactions.`);
@@ -311,8 +356,8 @@ function Dashboard({ token, onLogout }) {
           forecast and chat.
         </p>
         <p className="app-data-endpoints">
-          APIs: <code>/api/transactions</code>, <code>/api/summary/categories</code>,{" "}
-          <code>/api/goals</code>, <code>/api/forecast</code>, <code>/api/chat</code>
+          APIs: <code>/api/dashboard</code>, <code>/api/transactions</code>,{" "}
+          <code>/api/goals</code>, <code>/api/chat</code>
         </p>
       </header>
 
@@ -419,7 +464,12 @@ function Dashboard({ token, onLogout }) {
           />
 
           <section className="grid-2">
-            <TransactionsTable transactions={transactions} />
+            <TransactionsTable
+              transactions={transactions}
+              hasMore={Boolean(transactionsCursor)}
+              loadingMore={loadingMore}
+              onLoadMore={loadMoreTransactions}
+            />
             <CategorySummary categorySummary={categorySummary} />
           </section>
 
@@ -436,7 +486,9 @@ function Dashboard({ token, onLogout }) {
               setGoalLimit={setGoalLimit}
               goalMessage={goalMessage}
               onSubmit={handleAddGoal}
-              goalsWithUsage={goalsWithUsage}
+              goalsWithUsage={goals}
+              budgetAlerts={budgetAlerts}
+              currency={currency}
             />
           </section>
 
@@ -455,7 +507,7 @@ function Dashboard({ token, onLogout }) {
 
       {activeTab === "profile" && (
         <main className="app-content">
-          <ProfileSection token={token} />
+          <ProfileSection token={token} onCurrencyChange={handleCurrencyChange} />
         </main>
       )}
 
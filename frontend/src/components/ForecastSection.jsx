@@ -5,7 +5,7 @@ function ForecastSection({ forecast }) {
   return (
     <SectionCard
       title="Forecast (Next Month)"
-      subtitle="Simple baseline: assumes next month’s spending is 5% higher than current."
+      subtitle="Damped-trend exponential smoothing over your monthly history, per category."
     >
       {!forecast || !forecast.categories || forecast.categories.length === 0 ? (
         <p className="helper-text">No forecast yet — upload some data first.</p>
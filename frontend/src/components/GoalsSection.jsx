@@ -1,5 +1,6 @@
 import React from "react";
 import SectionCard from "./SectionCard";
+import { formatAmount } from "../format";
 
 function GoalsSection({
   goalCategory,
@@ -9,6 +10,8 @@ function GoalsSection({
   goalMessage,
   onSubmit,
   goalsWithUsage,
+  budgetAlerts = [],
+  currency = "INR",
 }) {
   return (
     <SectionCard
@@ -26,7 +29,7 @@ function GoalsSection({
           />
         </label>
         <label className="form-field">
-          <span>Monthly Limit (₹)</span>
+          <span>Monthly Limit ({currency})</span>
           <input
             type="number"
             value={goalLimit}
@@ -51,6 +54,7 @@ function GoalsSection({
                   <th>Limit</th>
                   <th>Spent</th>
                   <th>Remaining</th>
+                  <th>Projected</th>
                   <th>Status</th>
                 </tr>
               </thead>
@@ -58,10 +62,11 @@ function GoalsSection({
                 {goalsWithUsage.map((g) => (
                   <tr key={g.id}>
                     <td>{g.category}</td>
-                    <td>{g.monthly_limit}</td>
-                    <td>{g.spent}</td>
-                    <td>{g.remaining}</td>
-                    <td className={g.status === "Over limit" ? "negative" : "positive"}>
+                    <td>{formatAmount(g.monthly_limit, currency)}</td>
+                    <td>{formatAmount(g.spent, currency)}</td>
+                    <td>{formatAmount(g.remaining, currency)}</td>
+                    <td>{formatAmount(g.projected_spend, currency)}</td>
+                    <td className={g.status === "OK" ? "positive" : "negative"}>
                       {g.status}
                     </td>
                   </tr>
@@ -71,6 +76,21 @@ function GoalsSection({
           </div>
         </>
       )}
+
+      {budgetAlerts.length > 0 && (
+        <>
+          <h3 className="card-subheading">Budget Alerts</h3>
+          <ul className="insights-list">
+            {budgetAlerts.map((a) => (
+              <li key={`${a.category}-${a.threshold}`}>
+                <strong>{a.category}:</strong> crossed {a.threshold}% of{" "}
+                {formatAmount(a.monthly_limit, currency)} in {a.year_month} (
+                {formatAmount(a.spent, currency)} spent).
+              </li>
+            ))}
+          </ul>
+        </>
+      )}
     </SectionCard>
   );
 }
@@ -1,7 +1,8 @@
 // src/components/InsightsSection.jsx
 import React from "react";
+import { formatAmount } from "../format";
 
-function InsightsSection({ categorySummary, forecast }) {
+function InsightsSection({ categorySummary, forecast, currency = "INR" }) {
   if (!categorySummary || categorySummary.length === 0) {
     return (
       <div className="card">
@@ -39,24 +40,24 @@ function InsightsSection({ categorySummary, forecast }) {
         {biggestCategory && (
           <li>
             <strong>Biggest expense:</strong>{" "}
-            {biggestCategory.name} (₹{biggestCategory.amount.toFixed(2)})
+            {biggestCategory.name} ({formatAmount(biggestCategory.amount, currency)})
           </li>
         )}
         <li>
           <strong>Income vs Expense:</strong>{" "}
-          You earned ₹{totalIncome.toFixed(2)} and spent ₹
-          {totalExpense.toFixed(2)} in this period.
+          You earned {formatAmount(totalIncome, currency)} and spent{" "}
+          {formatAmount(totalExpense, currency)} in this period.
         </li>
         <li>
           <strong>Savings rate:</strong>{" "}
           {saving >= 0 ? (
             <>
-              You saved ₹{saving.toFixed(2)} (~
+              You saved {formatAmount(saving, currency)} (~
               {savingRate.toFixed(1)}% of income).
             </>
           ) : (
             <>
-              You overspent by ₹{Math.abs(saving).toFixed(2)}. Try reducing one
+              You overspent by {formatAmount(Math.abs(saving), currency)}. Try reducing one
               or two big categories this month.
             </>
           )}
@@ -64,8 +65,8 @@ function InsightsSection({ categorySummary, forecast }) {
         {forecastSaving !== null && (
           <li>
             <strong>Next month outlook:</strong>{" "}
-            Based on this pattern, we estimate savings of ₹
-            {forecastSaving.toFixed(2)} next month (simple +5% expense model).
+            Based on this pattern, we estimate savings of{" "}
+            {formatAmount(forecastSaving, currency)} next month (trend model over your monthly history).
           </li>
         )}
       </ul>
@@ -2,7 +2,7 @@
 import React, { useEffect, useState } from "react";
 import { API_BASE } from "../config";
 
-function ProfileSection({ token }) {
+function ProfileSection({ token, onCurrencyChange }) {
   const [loading, setLoading] = useState(true);
   const [saving, setSaving] = useState(false);
   const [error, setError] = useState("");
@@ -82,6 +82,7 @@ function ProfileSection({ token }) {
       }
 
       setMessage(data.message || "Profile updated.");
+      if (onCurrencyChange) onCurrencyChange(defaultCurrency || "INR");
     } catch (err) {
       console.error(err);
       setError("Network error while updating profile.");
@@ -148,8 +149,8 @@ function ProfileSection({ token }) {
               placeholder="INR"
             />
             <small className="hint">
-              3-letter currency code like INR, USD, EUR. Currently only label, not a
-              full converter.
+              3-letter currency code like INR, USD, EUR. Summaries, goals, forecasts
+              and chat are converted to it.
             </small>
           </div>
 
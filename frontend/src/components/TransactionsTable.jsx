@@ -1,7 +1,7 @@
 import React from "react";
 import SectionCard from "./SectionCard";
 
-function TransactionsTable({ transactions }) {
+function TransactionsTable({ transactions, hasMore, loadingMore, onLoadMore }) {
   return (
     <SectionCard
       title="All Transactions"
@@ -35,6 +35,16 @@ function TransactionsTable({ transactions }) {
               ))}
             </tbody>
           </table>
+          {hasMore && (
+            <button
+              type="button"
+              className="btn subtle"
+              onClick={onLoadMore}
+              disabled={loadingMore}
+            >
+              {loadingMore ? "Loading..." : "Load more"}
+            </button>
+          )}
         </div>
       )}
     </SectionCard>
@@ -0,0 +1,11 @@
+// src/format.js
+
+// Same symbols as the chat answers (backend/chat.py); other currencies
+// are shown by code.
+const CURRENCY_SYMBOLS = { INR: "₹", USD: "$", EUR: "€", GBP: "£" };
+
+export function formatAmount(amount, currency = "INR") {
+  const value = Number(amount).toFixed(2);
+  const symbol = CURRENCY_SYMBOLS[currency];
+  return symbol ? `${symbol}${value}` : `${currency} ${value}`;
+}